@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Commodity and Port Catalog
+Data-driven goods and ports with integer-indexed market arrays
+"""
+
+import json
+import os
+import random
+from array import array
+
+CATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "catalog.json")
+
+class Catalog:
+    """Static commodity and port definitions loaded from a data file
+    
+    Everything is stored in parallel lists indexed by commodity or port
+    index; names are only used to build the indexes at load time.
+    """
+    
+    def __init__(self, commodities, ports):
+        """Initialize catalog from parsed catalog data"""
+        # Commodities
+        self.commodity_names = [c["name"] for c in commodities]
+        self.base_prices = array('d', [c["base_price"] for c in commodities])
+        self.price_variations = array('d', [c.get("price_variation", 0.3) for c in commodities])
+        self.commodity_index = {name: i for i, name in enumerate(self.commodity_names)}
+        
+        # Ports
+        self.port_names = [p["name"] for p in ports]
+        self.port_positions = [(p["x"], p["y"]) for p in ports]
+        self.port_index = {name: i for i, name in enumerate(self.port_names)}
+        
+        # Per-port availability (commodity indexes) and price modifiers
+        self.port_commodities = []
+        self.price_modifiers = []
+        for port in ports:
+            names = port.get("commodities", self.commodity_names)
+            self.port_commodities.append([self.commodity_index[name] for name in names])
+            
+            modifiers = array('d', [1.0] * len(self.commodity_names))
+            for name, modifier in port.get("price_modifiers", {}).items():
+                modifiers[self.commodity_index[name]] = modifier
+            self.price_modifiers.append(modifiers)
+        
+        # Reverse availability: ports that trade each commodity
+        self.commodity_ports = [[] for _ in self.commodity_names]
+        for port, available in enumerate(self.port_commodities):
+            for commodity in available:
+                self.commodity_ports[commodity].append(port)
+    
+    @property
+    def commodity_count(self):
+        return len(self.commodity_names)
+    
+    @property
+    def port_count(self):
+        return len(self.port_names)
+    
+    @classmethod
+    def load(cls, filename=CATALOG_FILE):
+        """Load catalog from a JSON data file"""
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        return cls(data["commodities"], data["ports"])
+
+class Market:
+    """Current prices and stock at every port
+    
+    Prices and stock are one array per port, indexed by commodity (0 where
+    the port does not trade it). Prices are kept unrounded, so the supply
+    curve moves the same however a trade is split; they are rounded only
+    for display and when gold changes hands. The best selling price for each
+    commodity is maintained incrementally so best-trade queries never scan
+    every port.
+    """
+    
+    def __init__(self, catalog, rng=None):
+        """Initialize market and roll opening prices at every port"""
+        self.catalog = catalog
+        self.rng = rng or random.Random()
+        commodity_count = catalog.commodity_count
+        
+        self.prices = [array('d', [0.0] * commodity_count) for _ in range(catalog.port_count)]
+        self.stock = [array('i', [0] * commodity_count) for _ in range(catalog.port_count)]
+        
+        # Best selling price for each commodity across all ports
+        self.best_price = array('d', [0.0] * commodity_count)
+        self.best_port = array('i', [-1] * commodity_count)
+        
+        for port in range(catalog.port_count):
+            self.refresh_port(port)
+    
+    def generate_price(self, port, commodity):
+        """Generate a market price with the port's modifier and random variation"""
+        catalog = self.catalog
+        variation = catalog.price_variations[commodity]
+        base = catalog.base_prices[commodity] * catalog.price_modifiers[port][commodity]
+        return max(1, int(base * (1 + self.rng.uniform(-variation, variation))))
+    
+    def refresh_port(self, port):
+        """Roll new prices and stock for everything a port trades (called when docking)"""
+        for commodity in self.catalog.port_commodities[port]:
+            self.set_price(port, commodity, self.generate_price(port, commodity))
+            self.stock[port][commodity] = self.rng.randint(10, 50)
+    
+    def set_price(self, port, commodity, price):
+        """Change one price and keep the best-price index up to date"""
+        old_price = self.prices[port][commodity]
+        self.prices[port][commodity] = price
+        
+        if price > self.best_price[commodity]:
+            self.best_price[commodity] = price
+            self.best_port[commodity] = port
+        elif self.best_port[commodity] == port and price < old_price:
+            # The best port got cheaper; rescan only the ports trading this good
+            self.rebuild_best(commodity)
+    
+    def rebuild_best(self, commodity):
+        """Recompute the best selling port for one commodity"""
+        best_price = 0
+        best_port = -1
+        for port in self.catalog.commodity_ports[commodity]:
+            if self.prices[port][commodity] > best_price:
+                best_price = self.prices[port][commodity]
+                best_port = port
+        self.best_price[commodity] = best_price
+        self.best_port[commodity] = best_port
+    
+    def best_sell_where(self, commodity):
+        """Get (port, price) paying the most for a commodity"""
+        return self.best_port[commodity], self.best_price[commodity]
+    
+    def best_buy_here(self, port):
+        """Get the most profitable good to buy at a port
+        
+        Returns (commodity, profit per unit, sell port), or None when nothing
+        bought here sells for more anywhere else.
+        """
+        best = None
+        best_profit = 0
+        prices = self.prices[port]
+        for commodity in self.catalog.port_commodities[port]:
+            profit = self.best_price[commodity] - prices[commodity]
+            if profit > best_profit and self.stock[port][commodity] > 0:
+                best_profit = profit
+                best = (commodity, profit, self.best_port[commodity])
+        return best
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Combat Engine
+Deterministic ship-to-ship combat: broadsides, reloads and hull, sail and crew damage
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+SIDE_PORT = 0
+SIDE_STARBOARD = 1
+
+# Gunnery
+BROADSIDE_ARC = 40.0       # Half-angle (degrees) around each beam that the guns can bear on
+RELOAD_TIME = 4.0          # Seconds per broadside for a fully manned, average crew
+CREW_PER_GUN = 2           # Sailors needed to work each gun
+SHOT_SPEED = 300.0         # World units per second
+SHOT_RANGE = 300.0         # World units before a ball falls into the sea
+SHOT_SPREAD = 4.0          # Standard deviation of aim (degrees) at gunnery 1.0
+
+# Damage model: each hit lands on the hull, the rigging or the crew
+SHOT_DAMAGE = 8.0          # Hull or sail points per hit
+HIT_HULL = 0.55            # Chance a hit holes the hull
+HIT_SAILS = 0.30           # Chance a hit tears the rigging (the rest strike the crew)
+CREW_PER_HIT = (1, 3)      # Sailors lost to a hit on deck
+SAIL_SPEED_FLOOR = 0.3     # Fraction of speed left with the rigging shot away
+
+# Headless AI
+TURN_RATE = 30.0           # Degrees per second
+ENGAGE_RANGE = 220.0       # Range at which ships turn to bring a broadside to bear
+
+class ProjectilePool:
+    """Every cannonball in flight as preallocated parallel arrays
+    
+    Slots are reused when balls hit or expire. Hit tests go through a
+    uniform grid built over the live balls each step: balls are sorted by
+    cell key, so a query is a binary search per overlapped cell. Hits are
+    swept along each ball's path over the step, so large headless time
+    steps can't tunnel through a hull.
+    """
+    
+    def __init__(self, capacity=1024):
+        """Initialize an empty pool"""
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.last_x = np.zeros(capacity)  # Position before the last step
+        self.last_y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.ttl = np.zeros(capacity)
+        self.owner = np.zeros(capacity, dtype=np.int32)
+        self.team = np.zeros(capacity, dtype=np.int8)
+        self.active = np.zeros(capacity, dtype=bool)
+        
+        # Grid index (rebuilt by build_index)
+        self.cell_size = 64.0
+        self.travel = 0.0  # Furthest any ball moved in the last step
+        self.sorted_keys = np.zeros(0, dtype=np.int64)
+        self.sorted_slots = np.zeros(0, dtype=np.int64)
+    
+    def _columns(self):
+        return ('x', 'y', 'last_x', 'last_y', 'vx', 'vy', 'ttl', 'owner', 'team', 'active')
+    
+    @property
+    def live_count(self):
+        return int(np.count_nonzero(self.active))
+    
+    def _grow(self, needed):
+        """Double the pool until needed more balls fit"""
+        capacity = len(self.active)
+        new_capacity = capacity
+        while new_capacity - self.live_count < needed:
+            new_capacity *= 2
+        for name in self._columns():
+            old = getattr(self, name)
+            grown = np.zeros(new_capacity, dtype=old.dtype)
+            grown[:capacity] = old
+            setattr(self, name, grown)
+    
+    def spawn(self, x, y, vx, vy, ttl, owner, team):
+        """Launch a batch of balls (array arguments of equal length)"""
+        count = len(x)
+        free = np.flatnonzero(~self.active)
+        if len(free) < count:
+            self._grow(count)
+            free = np.flatnonzero(~self.active)
+        slots = free[:count]
+        self.x[slots] = self.last_x[slots] = x
+        self.y[slots] = self.last_y[slots] = y
+        self.vx[slots] = vx
+        self.vy[slots] = vy
+        self.ttl[slots] = ttl
+        self.owner[slots] = owner
+        self.team[slots] = team
+        self.active[slots] = True
+        return slots
+    
+    def step(self, dt):
+        """Move every ball and retire the ones that ran out of range"""
+        live = self.active
+        self.last_x[live] = self.x[live]
+        self.last_y[live] = self.y[live]
+        self.x[live] += self.vx[live] * dt
+        self.y[live] += self.vy[live] * dt
+        self.ttl[live] -= dt
+        self.active &= self.ttl > 0
+        
+        speeds = np.hypot(self.vx[live], self.vy[live])
+        self.travel = float(speeds.max()) * dt if len(speeds) else 0.0
+    
+    def _cell_keys(self, cx, cy):
+        """Combine integer cell coordinates into one sortable key"""
+        return (cx + (1 << 20)) * (1 << 21) + (cy + (1 << 20))
+    
+    def build_index(self, cell_size=64.0):
+        """Sort the live balls by grid cell for query_circle()"""
+        self.cell_size = cell_size
+        live = np.flatnonzero(self.active)
+        cx = np.floor(self.x[live] / cell_size).astype(np.int64)
+        cy = np.floor(self.y[live] / cell_size).astype(np.int64)
+        keys = self._cell_keys(cx, cy)
+        order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[order]
+        self.sorted_slots = live[order]
+    
+    def query_circle(self, x, y, radius):
+        """Get the slots of live balls whose last step passed within radius of a point
+        
+        Uses the index from the last build_index().
+        """
+        size = self.cell_size
+        reach = radius + self.travel  # A ball that crossed the circle ended at most this far away
+        cx = np.arange(math.floor((x - reach) / size), math.floor((x + reach) / size) + 1, dtype=np.int64)
+        cy = np.arange(math.floor((y - reach) / size), math.floor((y + reach) / size) + 1, dtype=np.int64)
+        keys = self._cell_keys(cx[:, None], cy[None, :]).ravel()
+        starts = np.searchsorted(self.sorted_keys, keys, 'left')
+        ends = np.searchsorted(self.sorted_keys, keys, 'right')
+        
+        found = [self.sorted_slots[start:end] for start, end in zip(starts, ends) if end > start]
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        slots = np.concatenate(found)
+        
+        # Closest approach of each ball's path segment to the point
+        start_x, start_y = self.last_x[slots], self.last_y[slots]
+        path_x, path_y = self.x[slots] - start_x, self.y[slots] - start_y
+        length = np.maximum(path_x * path_x + path_y * path_y, 1e-9)
+        t = np.clip(((x - start_x) * path_x + (y - start_y) * path_y) / length, 0.0, 1.0)
+        near_x = start_x + path_x * t - x
+        near_y = start_y + path_y * t - y
+        close = near_x * near_x + near_y * near_y <= radius * radius
+        return slots[close & self.active[slots]]
+
+class CombatEngine:
+    """Ships, broadsides and hit resolution for any number of ships
+    
+    Ship state lives in parallel arrays indexed by ship id. Headings are in
+    degrees with 0 = north, like the sailing engine. All randomness comes
+    from one seeded generator, so a battle replays exactly from its seed
+    and the same sequence of calls.
+    """
+    
+    def __init__(self, seed=None, capacity=16, cell_size=64.0):
+        """Initialize an empty battle"""
+        self.rng = np.random.default_rng(seed)
+        self.shots = ProjectilePool()
+        self.cell_size = cell_size
+        self.count = 0
+        self.move_ships = True  # False when the game moves the ships itself
+        
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.heading = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.radius = np.zeros(capacity)
+        self.team = np.zeros(capacity, dtype=np.int8)
+        self.hull = np.zeros(capacity)
+        self.sails = np.zeros(capacity)
+        self.crew = np.zeros(capacity, dtype=np.int32)
+        self.guns = np.zeros(capacity, dtype=np.int32)
+        self.gunnery = np.ones(capacity)                   # Crew quality multiplier (PlayerState.combat_factor for captains)
+        self.reload = np.zeros((capacity, 2))              # Seconds until each side can fire again
+        self.alive = np.zeros(capacity, dtype=bool)
+        
+        self.hits = []  # (ship, hits) taken during the last step
+    
+    def _columns(self):
+        return ('x', 'y', 'heading', 'speed', 'radius', 'team', 'hull', 'sails',
+                'crew', 'guns', 'gunnery', 'reload', 'alive')
+    
+    def add_ship(self, x, y, heading=0.0, team=0, speed=0.0, radius=15.0,
+                 hull=100.0, sails=100.0, crew=30, guns=12, gunnery=1.0):
+        """Add a ship to the battle; returns its ship id"""
+        if self.count == len(self.alive):
+            for name in self._columns():
+                old = getattr(self, name)
+                grown = np.zeros((self.count * 2,) + old.shape[1:], dtype=old.dtype)
+                grown[:self.count] = old
+                setattr(self, name, grown)
+        
+        ship = self.count
+        self.x[ship], self.y[ship], self.heading[ship] = x, y, heading
+        self.speed[ship], self.radius[ship], self.team[ship] = speed, radius, team
+        self.hull[ship], self.sails[ship] = hull, sails
+        self.crew[ship], self.guns[ship], self.gunnery[ship] = crew, guns, gunnery
+        self.reload[ship] = 0.0
+        self.alive[ship] = True
+        self.count += 1
+        return ship
+    
+    def manning(self, ship):
+        """Fraction of the guns the crew can work"""
+        return min(1.0, self.crew[ship] / max(1, self.guns[ship] * CREW_PER_GUN))
+    
+    def fire(self, ship, side):
+        """Fire one broadside if it is loaded; returns True if it fired"""
+        if not self.alive[ship] or self.reload[ship, side] > 0:
+            return False
+        
+        manning = self.manning(ship)
+        guns = int(self.guns[ship] // 2 * manning)
+        if guns <= 0:
+            return False
+        
+        # Balls leave along the beam from points spread down the hull
+        heading = self.heading[ship]
+        bearing = heading + (-90.0 if side == SIDE_PORT else 90.0)
+        spread = SHOT_SPREAD / max(self.gunnery[ship], 0.25)
+        angles = np.radians(bearing + self.rng.normal(0.0, spread, guns))
+        along = np.linspace(-self.radius[ship], self.radius[ship], guns)
+        heading_rad = math.radians(heading)
+        ship_vx = math.sin(heading_rad) * self.speed[ship]
+        ship_vy = -math.cos(heading_rad) * self.speed[ship]
+        
+        self.shots.spawn(self.x[ship] + along * math.sin(heading_rad),
+                         self.y[ship] - along * math.cos(heading_rad),
+                         np.sin(angles) * SHOT_SPEED + ship_vx,
+                         -np.cos(angles) * SHOT_SPEED + ship_vy,
+                         np.full(guns, SHOT_RANGE / SHOT_SPEED), ship, self.team[ship])
+        
+        self.reload[ship, side] = RELOAD_TIME / max(0.25, self.gunnery[ship] * manning)
+        return True
+    
+    def targets_in_arc(self):
+        """Get an (ships, 2) mask: does each side of each ship bear on an enemy in range?"""
+        n = self.count
+        dx = self.x[None, :n] - self.x[:n, None]
+        dy = self.y[None, :n] - self.y[:n, None]
+        enemy = (self.team[None, :n] != self.team[:n, None]) & self.alive[None, :n]
+        in_range = enemy & (dx * dx + dy * dy <= SHOT_RANGE * SHOT_RANGE)
+        
+        # Bearing of every other ship relative to each ship's bow
+        relative = (np.degrees(np.arctan2(dx, -dy)) - self.heading[:n, None] + 180.0) % 360.0 - 180.0
+        bears = np.zeros((n, 2), dtype=bool)
+        bears[:, SIDE_PORT] = (in_range & (np.abs(relative + 90.0) <= BROADSIDE_ARC)).any(axis=1)
+        bears[:, SIDE_STARBOARD] = (in_range & (np.abs(relative - 90.0) <= BROADSIDE_ARC)).any(axis=1)
+        return bears & self.alive[:n, None]
+    
+    def auto_fire(self, ships=None):
+        """Fire every loaded broadside that bears on an enemy (optionally only for some ships)"""
+        ready = self.targets_in_arc() & (self.reload[:self.count] <= 0)
+        if ships is not None:
+            mask = np.zeros(self.count, dtype=bool)
+            mask[ships] = True
+            ready &= mask[:, None]
+        for ship, side in zip(*np.nonzero(ready)):
+            self.fire(ship, side)
+    
+    def steer(self, dt, ships=None):
+        """Simple AI: close on the nearest enemy, then turn to bring a broadside to bear
+        
+        Only the steering ships' rows of the distance matrix are built, so
+        steering the few ships near the players stays cheap in a big world.
+        """
+        n = self.count
+        rows = np.arange(n) if ships is None else np.asarray(ships, dtype=np.int64)
+        if not len(rows):
+            return
+        dx = self.x[None, :n] - self.x[rows, None]
+        dy = self.y[None, :n] - self.y[rows, None]
+        distance = np.hypot(dx, dy)
+        enemy = (self.team[None, :n] != self.team[rows, None]) & self.alive[None, :n]
+        distance = np.where(enemy, distance, np.inf)
+        nearest = np.argmin(distance, axis=1)
+        columns = np.arange(len(rows))
+        has_target = np.isfinite(distance[columns, nearest])
+        
+        heading = self.heading[rows]
+        bearing = np.degrees(np.arctan2(dx[columns, nearest], -dy[columns, nearest]))
+        relative = (bearing - heading + 180.0) % 360.0 - 180.0
+        # In range, turn the nearer beam toward the target
+        beam = np.where(relative >= 0, bearing - 90.0, bearing + 90.0)
+        desired = np.where(distance[columns, nearest] <= ENGAGE_RANGE, beam, bearing)
+        
+        turn = (desired - heading + 180.0) % 360.0 - 180.0
+        turn = np.clip(turn, -TURN_RATE * dt, TURN_RATE * dt)
+        steering = has_target & self.alive[rows]
+        self.heading[rows] = np.where(steering, (heading + turn) % 360.0, heading)
+    
+    def step(self, dt):
+        """Advance reloads, ships and cannonballs, then resolve hits"""
+        n = self.count
+        np.maximum(self.reload[:n] - dt, 0.0, out=self.reload[:n])
+        
+        if self.move_ships:
+            live = self.alive[:n]
+            speed = self.speed[:n] * (SAIL_SPEED_FLOOR + (1 - SAIL_SPEED_FLOOR) * self.sails[:n] / 100.0)
+            radians = np.radians(self.heading[:n])
+            self.x[:n] += np.where(live, np.sin(radians) * speed * dt, 0.0)
+            self.y[:n] -= np.where(live, np.cos(radians) * speed * dt, 0.0)
+        
+        self.shots.step(dt)
+        self.resolve_hits()
+    
+    def resolve_hits(self):
+        """Apply every cannonball that reached an enemy hull this step"""
+        self.hits = []
+        if not self.shots.active.any():
+            return
+        
+        shots = self.shots
+        shots.build_index(self.cell_size)
+        for ship in np.flatnonzero(self.alive[:self.count]):
+            slots = shots.query_circle(self.x[ship], self.y[ship], self.radius[ship])
+            slots = slots[shots.team[slots] != self.team[ship]]
+            if len(slots):
+                shots.active[slots] = False
+                self.apply_hits(ship, len(slots))
+    
+    def apply_hits(self, ship, count):
+        """Spread count hits over hull, rigging and crew"""
+        rolls = self.rng.random(count)
+        hull_hits = int(np.count_nonzero(rolls < HIT_HULL))
+        sail_hits = int(np.count_nonzero((rolls >= HIT_HULL) & (rolls < HIT_HULL + HIT_SAILS)))
+        crew_hits = count - hull_hits - sail_hits
+        
+        self.damage(ship, hull_hits * SHOT_DAMAGE, sail_hits * SHOT_DAMAGE,
+                    int(self.rng.integers(CREW_PER_HIT[0], CREW_PER_HIT[1] + 1, crew_hits).sum()))
+        self.hits.append((ship, count))
+    
+    def damage(self, ship, hull=0.0, sails=0.0, crew=0):
+        """Apply damage directly (collisions, boarding); sinks or strikes the ship as needed"""
+        self.hull[ship] = max(0.0, self.hull[ship] - hull)
+        self.sails[ship] = max(0.0, self.sails[ship] - sails)
+        self.crew[ship] = max(0, self.crew[ship] - crew)
+        if self.hull[ship] <= 0 or self.crew[ship] <= 0:
+            self.alive[ship] = False
+    
+    def teams_afloat(self):
+        """Get the set of teams that still have a ship in the fight"""
+        return set(self.team[:self.count][self.alive[:self.count]].tolist())
+
+class BattleResult:
+    """Outcome of a headless battle"""
+    
+    __slots__ = ('winner', 'duration', 'survivors', 'hull')
+    
+    def __init__(self, winner, duration, survivors, hull):
+        self.winner = winner        # Winning team, or None for a draw
+        self.duration = duration    # Seconds of battle time
+        self.survivors = survivors  # Ships afloat per team
+        self.hull = hull            # Total hull left per team
+
+def simulate_battle(sides=(3, 3), seed=0, dt=0.2, max_time=600.0, ship_kwargs=None):
+    """Fight one battle with no graphics and return a BattleResult
+    
+    sides gives the number of ships per team; ship_kwargs can give each team
+    its own add_ship() arguments (guns, crew, gunnery, ...) for balancing.
+    """
+    engine = CombatEngine(seed)
+    ship_kwargs = ship_kwargs or [{} for _ in sides]
+    for team, ships in enumerate(sides):
+        # Teams start in line abreast facing each other across the field
+        x = 0.0 if team % 2 == 0 else 900.0
+        heading = 90.0 if team % 2 == 0 else 270.0
+        for i in range(ships):
+            kwargs = dict(speed=40.0)
+            kwargs.update(ship_kwargs[team])
+            engine.add_ship(x, i * 80.0 + team * 20.0, heading, team, **kwargs)
+    
+    elapsed = 0.0
+    while elapsed < max_time and len(engine.teams_afloat()) > 1:
+        engine.steer(dt)
+        engine.auto_fire()
+        engine.step(dt)
+        elapsed += dt
+    
+    afloat = engine.teams_afloat()
+    winner = afloat.pop() if len(afloat) == 1 else None
+    n = engine.count
+    survivors = [int(np.count_nonzero(engine.alive[:n] & (engine.team[:n] == team))) for team in range(len(sides))]
+    hull = [float(engine.hull[:n][engine.alive[:n] & (engine.team[:n] == team)].sum()) for team in range(len(sides))]
+    return BattleResult(winner, elapsed, survivors, hull)
+
+def main():
+    """Batch tool: simulate many battles for balancing and time a large one"""
+    parser = argparse.ArgumentParser(description="Simulate ship-to-ship battles")
+    parser.add_argument("--battles", type=int, default=200, help="number of battles to simulate")
+    parser.add_argument("--sides", type=int, nargs=2, default=[3, 3], metavar=("A", "B"),
+                        help="ships per team")
+    parser.add_argument("--guns", type=int, nargs=2, default=[12, 12], metavar=("A", "B"),
+                        help="guns per ship for each team")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first battle")
+    parser.add_argument("--benchmark-ships", type=int, default=40,
+                        help="ships per side in the frame-time benchmark (0 to skip)")
+    args = parser.parse_args()
+    
+    kwargs = [{"guns": args.guns[0]}, {"guns": args.guns[1]}]
+    wins = [0, 0]
+    draws = 0
+    total_time = 0.0
+    started = time.perf_counter()
+    for battle in range(args.battles):
+        result = simulate_battle(tuple(args.sides), args.seed + battle, ship_kwargs=kwargs)
+        total_time += result.duration
+        if result.winner is None:
+            draws += 1
+        else:
+            wins[result.winner] += 1
+    elapsed = time.perf_counter() - started
+    
+    print(f"{args.battles} battles ({args.sides[0]} vs {args.sides[1]}) in {elapsed:.1f}s")
+    print(f"Team A wins: {wins[0]}  Team B wins: {wins[1]}  Draws: {draws}")
+    print(f"Average battle length: {total_time / max(1, args.battles):.0f}s of battle time")
+    
+    if args.benchmark_ships:
+        engine = CombatEngine(args.seed)
+        for team in range(2):
+            for i in range(args.benchmark_ships):
+                engine.add_ship(300.0 + team * 250.0, i * 40.0, 0.0, team, speed=20.0)
+        steps = 300
+        peak_balls = 0
+        started = time.perf_counter()
+        for _ in range(steps):
+            engine.steer(1.0 / 60)
+            engine.auto_fire()
+            engine.step(1.0 / 60)
+            peak_balls = max(peak_balls, engine.shots.live_count)
+        per_step = (time.perf_counter() - started) / steps * 1000
+        print(f"{args.benchmark_ships * 2} ships, up to {peak_balls} balls in flight: "
+              f"{per_step:.2f} ms per 60 Hz step")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Crew Roster
+Per-sailor morale, skill, wages and health stored as parallel numpy arrays
+"""
+
+import numpy as np
+
+# Recruits
+DEFAULT_WAGE = 1              # Gold per sailor per day
+RECRUIT_SKILL = (0.2, 0.6)    # Skill range of harbour recruits (0-1)
+RECRUIT_MORALE = 60.0         # Morale of a fresh recruit (0-100)
+
+# Daily update
+MORALE_PAID = 1.0             # Morale gained on payday
+MORALE_UNPAID = 10.0          # Morale lost when wages can't be paid
+MORALE_INJURED = 5.0          # Morale lost when injured
+DESERTION_MORALE = 30.0       # Sailors below this morale may desert
+DESERTION_RATE = 0.5          # Daily desertion chance at zero morale
+INJURY_CHANCE = 0.01          # Daily chance of an injury at sea
+INJURY_DAMAGE = (10.0, 50.0)  # Health lost per injury
+HEAL_PER_DAY = 10.0           # Health regained by uninjured sailors
+SKILL_GAIN = 0.005            # Fraction of the remaining skill gap learned per day at sea
+
+class CrewReport:
+    """What happened to the crew in one daily update"""
+    
+    __slots__ = ('paid', 'unpaid', 'deserted', 'injured', 'died')
+    
+    def __init__(self, paid=0, unpaid=0, deserted=0, injured=0, died=0):
+        self.paid = paid          # Gold paid out in wages
+        self.unpaid = unpaid      # Sailors who went unpaid
+        self.deserted = deserted
+        self.injured = injured
+        self.died = died
+
+class CrewRoster:
+    """Every sailor in a fleet as a struct of arrays
+    
+    Row i of each array describes one sailor; ship holds the index of the
+    ship they serve on. Departed sailors are only flagged in alive and the
+    rows are reclaimed by compact(), so updates never reallocate.
+    """
+    
+    def __init__(self, capacity=32, rng=None):
+        """Initialize an empty roster"""
+        self.rng = rng or np.random.default_rng()
+        self.count = 0  # Rows in use (alive or not)
+        self.morale = np.zeros(capacity, dtype=np.float32)
+        self.skill = np.zeros(capacity, dtype=np.float32)
+        self.health = np.zeros(capacity, dtype=np.float32)
+        self.wage = np.zeros(capacity, dtype=np.int16)
+        self.ship = np.zeros(capacity, dtype=np.int16)
+        self.alive = np.zeros(capacity, dtype=bool)
+    
+    def _columns(self):
+        return ('morale', 'skill', 'health', 'wage', 'ship', 'alive')
+    
+    def _reserve(self, needed):
+        """Grow the arrays (doubling) so needed more rows fit"""
+        capacity = len(self.alive)
+        if self.count + needed <= capacity:
+            return
+        
+        new_capacity = max(capacity * 2, self.count + needed)
+        for name in self._columns():
+            old = getattr(self, name)
+            grown = np.zeros(new_capacity, dtype=old.dtype)
+            grown[:self.count] = old[:self.count]
+            setattr(self, name, grown)
+    
+    def hire(self, count, ship=0, skill=RECRUIT_SKILL, morale=RECRUIT_MORALE, wage=DEFAULT_WAGE):
+        """Add count sailors to a ship; returns their row slice"""
+        self._reserve(count)
+        rows = slice(self.count, self.count + count)
+        self.morale[rows] = morale
+        self.skill[rows] = self.rng.uniform(skill[0], skill[1], count)
+        self.health[rows] = 100.0
+        self.wage[rows] = wage
+        self.ship[rows] = ship
+        self.alive[rows] = True
+        self.count += count
+        return rows
+    
+    def _active(self, ship=None):
+        """Get a mask of living sailors (optionally on one ship) over the used rows"""
+        mask = self.alive[:self.count]
+        if ship is not None:
+            mask = mask & (self.ship[:self.count] == ship)
+        return mask
+    
+    def size(self, ship=None):
+        """Number of living sailors (on one ship, or in the whole fleet)"""
+        return int(np.count_nonzero(self._active(ship)))
+    
+    def payroll(self, ship=None):
+        """Total daily wages"""
+        return int(self.wage[:self.count][self._active(ship)].sum())
+    
+    def mean(self, attribute, ship=None):
+        """Average of one attribute ('morale', 'skill' or 'health') over living sailors"""
+        values = getattr(self, attribute)[:self.count][self._active(ship)]
+        return float(values.mean()) if len(values) else 0.0
+    
+    def transfer(self, count, from_ship, to_ship):
+        """Move up to count sailors between ships; returns how many moved"""
+        rows = np.flatnonzero(self._active(from_ship))[:count]
+        self.ship[rows] = to_ship
+        return len(rows)
+    
+    def dismiss(self, count, ship=None):
+        """Discharge up to count sailors, least skilled first; returns how many left"""
+        rows = np.flatnonzero(self._active(ship))
+        rows = rows[np.argsort(self.skill[rows])][:count]
+        self.alive[rows] = False
+        return len(rows)
+    
+    def daily_update(self, gold, at_sea=True):
+        """Advance the whole roster one day: wages, desertion, injuries and healing
+        
+        Wages are paid in roster order for as long as the gold lasts. Returns
+        a CrewReport; the caller deducts report.paid from its gold.
+        """
+        n = self.count
+        alive = self.alive[:n]
+        morale = self.morale[:n]
+        health = self.health[:n]
+        report = CrewReport()
+        
+        # Pay wages
+        wages = np.where(alive, self.wage[:n], 0)
+        paid = alive & (np.cumsum(wages) <= gold)
+        unpaid = alive & ~paid
+        report.paid = int(wages[paid].sum())
+        report.unpaid = int(np.count_nonzero(unpaid))
+        morale[paid] += MORALE_PAID
+        morale[unpaid] -= MORALE_UNPAID
+        
+        # Injuries and healing
+        rolls = self.rng.random(n)
+        injured = alive & (rolls < INJURY_CHANCE) if at_sea else np.zeros(n, dtype=bool)
+        report.injured = int(np.count_nonzero(injured))
+        health[injured] -= self.rng.uniform(INJURY_DAMAGE[0], INJURY_DAMAGE[1], report.injured)
+        health[alive & ~injured] += HEAL_PER_DAY
+        np.minimum(health, 100.0, out=health)
+        morale[injured] -= MORALE_INJURED
+        np.clip(morale, 0.0, 100.0, out=morale)
+        
+        died = alive & (health <= 0)
+        report.died = int(np.count_nonzero(died))
+        alive &= ~died
+        
+        # Unhappy sailors desert
+        chance = np.maximum(0.0, DESERTION_MORALE - morale) * (DESERTION_RATE / DESERTION_MORALE)
+        deserted = alive & (self.rng.random(n) < chance)
+        report.deserted = int(np.count_nonzero(deserted))
+        alive &= ~deserted
+        
+        # Experience at sea
+        if at_sea:
+            skill = self.skill[:n]
+            skill[alive] += (1.0 - skill[alive]) * SKILL_GAIN
+        
+        if n - self.size() > n // 2:
+            self.compact()
+        return report
+    
+    def compact(self):
+        """Drop departed sailors' rows in place"""
+        keep = np.flatnonzero(self.alive[:self.count])
+        for name in self._columns():
+            column = getattr(self, name)
+            column[:len(keep)] = column[keep]
+            column[len(keep):self.count] = 0
+        self.count = len(keep)
+    
+    def ship_stats(self, ship_count):
+        """Per-ship (sailors, mean skill, mean morale, mean health) arrays for a fleet"""
+        alive = self.alive[:self.count]
+        ships = self.ship[:self.count][alive]
+        sailors = np.bincount(ships, minlength=ship_count)[:ship_count]
+        divisor = np.maximum(sailors, 1)
+        
+        def average(values):
+            return np.bincount(ships, weights=values[:self.count][alive], minlength=ship_count)[:ship_count] / divisor
+        
+        return sailors, average(self.skill), average(self.morale), average(self.health)
+    
+    def speed_factors(self, ship_count, sailing_crew):
+        """Per-ship multiplier on sailing speed
+        
+        An average crew (skill 0.5, morale 50) with at least sailing_crew
+        hands gives 1.0; short-handed, green or unhappy crews sail slower.
+        sailing_crew may be a scalar or a per-ship array.
+        """
+        sailors, skill, morale, _ = self.ship_stats(ship_count)
+        manning = 0.5 + 0.5 * np.minimum(1.0, sailors / np.maximum(sailing_crew, 1))
+        return manning * (0.8 + 0.4 * skill) * (0.9 + 0.2 * morale / 100.0)
+    
+    def combat_factors(self, ship_count, gun_crew):
+        """Per-ship multiplier on reload speed and accuracy (1.0 for an average full crew)"""
+        sailors, skill, morale, health = self.ship_stats(ship_count)
+        manning = np.minimum(1.0, sailors / np.maximum(gun_crew, 1))
+        return manning * (0.6 + 0.8 * skill) * (0.8 + 0.4 * morale / 100.0) * (0.5 + 0.5 * health / 100.0)
+    
+    def speed_factor(self, sailing_crew, ship=0):
+        """Speed multiplier for a single ship"""
+        return float(self.speed_factors(ship + 1, sailing_crew)[ship])
+    
+    def combat_factor(self, gun_crew, ship=0):
+        """Combat multiplier for a single ship"""
+        return float(self.combat_factors(ship + 1, gun_crew)[ship])
+    
+    def to_dict(self):
+        """Get a JSON-serializable snapshot of the living sailors"""
+        alive = self.alive[:self.count]
+        return {name: [round(float(value), 3) for value in getattr(self, name)[:self.count][alive]]
+                for name in ('morale', 'skill', 'health', 'wage', 'ship')}
+    
+    @classmethod
+    def from_dict(cls, data, rng=None):
+        """Rebuild a roster from to_dict() output"""
+        count = len(data["morale"])
+        roster = cls(max(count, 1), rng)
+        for name in ('morale', 'skill', 'health', 'wage', 'ship'):
+            column = getattr(roster, name)
+            column[:count] = data[name]
+        roster.alive[:count] = True
+        roster.count = count
+        return roster
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Display
+Logical screen size and a window that scales it to any display resolution
+"""
+
+import pygame
+
+SCREEN_WIDTH = 800   # Logical resolution: every layout and effect is drawn at this size
+SCREEN_HEIGHT = 600
+
+def create_window(caption, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, scaled=True):
+    """Open the game window and return its logical-resolution screen surface
+    
+    With scaled on, the window uses pygame.SCALED: the game draws into a
+    width x height back buffer and SDL scales it to the window once per
+    flip (on the GPU where available, integer multiples when they fit),
+    so a 1080p or 4K window costs the per-pixel effects nothing extra.
+    Falls back to an unscaled window where the video driver cannot scale.
+    """
+    pygame.display.set_caption(caption)
+    if scaled:
+        try:
+            return pygame.display.set_mode((width, height), pygame.SCALED | pygame.RESIZABLE)
+        except pygame.error:
+            pass
+    return pygame.display.set_mode((width, height))
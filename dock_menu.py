@@ -8,41 +8,50 @@ import pygame
 import random
 import math
 
-class Commodity:
-    """Represents a tradeable commodity"""
-    
-    def __init__(self, name, base_price, price_variation=0.3):
-        """Initialize commodity with name and price range"""
-        self.name = name
-        self.base_price = base_price
-        self.price_variation = price_variation
-        self.current_price = self.generate_price()
-        self.quantity_available = random.randint(10, 50)
-    
-    def generate_price(self):
-        """Generate current market price with variation"""
-        variation = random.uniform(-self.price_variation, self.price_variation)
-        return int(self.base_price * (1 + variation))
-    
-    def refresh_price(self):
-        """Refresh commodity price (called when docking)"""
-        self.current_price = self.generate_price()
-        self.quantity_available = random.randint(10, 50)
+from input_bindings import InputMap, CommandDispatcher
+from catalog import Catalog, Market
+from trade_routes import TradeRouteOptimizer
+from fleet import SHIP_PRICE
+from player_state import RECRUIT_COST, REPAIR_COST
+import trading
+from fonts import LazyFont
+
+class MarketListing:
+    """A commodity as traded at one port, backed by the shared Market arrays"""
+    
+    def __init__(self, market, port, index):
+        """Initialize listing for a commodity index at a port"""
+        self.market = market
+        self.port = port
+        self.index = index
+        self.name = market.catalog.commodity_names[index]
+    
+    @property
+    def current_price(self):
+        return self.market.prices[self.port][self.index]
+    
+    @property
+    def quantity_available(self):
+        return self.market.stock[self.port][self.index]
+    
+    @quantity_available.setter
+    def quantity_available(self, quantity):
+        self.market.stock[self.port][self.index] = quantity
 
 class DockMenu:
     """Enhanced dock menu with trading, repairs, and crew recruitment"""
     
-    def __init__(self):
+    def __init__(self, dispatcher=None, catalog=None, market=None, fleet=None):
         """Initialize dock menu system"""
         self.active = False
-        self.current_menu = "main"  # main, trade, repair, crew
+        self.current_menu = "main"  # main, trade, repair, crew, ledger, fleet
         self.selected_option = 0
         
         # Fonts
-        self.title_font = pygame.font.Font(None, 48)
-        self.menu_font = pygame.font.Font(None, 32)
-        self.info_font = pygame.font.Font(None, 24)
-        self.small_font = pygame.font.Font(None, 20)
+        self.title_font = LazyFont(48)
+        self.menu_font = LazyFont(32)
+        self.info_font = LazyFont(24)
+        self.small_font = LazyFont(20)
         
         # Colors
         self.colors = {
@@ -57,22 +66,17 @@ class DockMenu:
             'gold': (255, 215, 0)
         }
         
-        # Available commodities
-        self.commodities = [
-            Commodity("Sugar", 15, 0.4),
-            Commodity("Rum", 25, 0.3),
-            Commodity("Tobacco", 20, 0.5),
-            Commodity("Cotton", 12, 0.3),
-            Commodity("Spices", 35, 0.6),
-            Commodity("Coffee", 18, 0.4),
-            Commodity("Cocoa", 22, 0.5),
-            Commodity("Indigo", 30, 0.4)
-        ]
+        # Commodity/port catalog and live market prices
+        self.catalog = catalog or Catalog.load()
+        self.market = market or Market(self.catalog)
+        self.port = 0
         
-        # Current trading commodities (3 random ones)
+        # Merchant's ledger: best trade route from the current port
+        self.route_optimizer = TradeRouteOptimizer(self.catalog, self.market)
+        self.ledger_route = None
+        
+        # Current trading commodities (3 random ones from the port's goods)
         self.current_commodities = []
-        self.player_cargo = {}  # Player's cargo hold
-        self.max_cargo = 100
         
         # Menu state
         self.message = ""
@@ -83,224 +87,331 @@ class DockMenu:
         self.selected_commodity = 0
         self.trade_quantity = 1
         
-    def activate(self, ship_crew_system, player_gold):
+        # Fleet state: the escort exchanging crew and cargo with the flagship
+        self.fleet = fleet
+        self.fleet_ship = 1
+        self.fleet_commodity = 0
+        self.fleet_transfer = 10  # Cargo units moved per keypress
+        
+        # Render cache: the whole menu is drawn once into this surface and
+        # only rebuilt when input changes something or a message expires
+        self.cache_surface = None
+        self.dirty = True
+        
+        # Menu actions, in display order
+        self.main_menu_actions = [
+            lambda player: self.open_trade_menu(),     # Trade Goods
+            lambda player: self.open_menu("repair"),   # Repair Ship
+            lambda player: self.open_menu("crew"),     # Recruit Crew
+            self.open_ledger,                          # Merchant's Ledger
+            lambda player: self.open_fleet_menu(),     # Fleet
+            lambda player: self.leave_port()           # Leave Port
+        ]
+        self.crew_options = [1, 3, 5]
+        
+        # Input commands (shares the game's dispatcher when one is given)
+        if dispatcher is None:
+            dispatcher = CommandDispatcher(InputMap(pygame.key.key_code))
+        self.dispatcher = dispatcher
+        self.register_commands()
+    
+    def activate(self, player, port=0):
         """Activate dock menu and refresh market"""
         self.active = True
         self.current_menu = "main"
         self.selected_option = 0
+        self.port = port
         
-        # Refresh market with 3 random commodities
-        self.current_commodities = random.sample(self.commodities, 3)
-        for commodity in self.current_commodities:
-            commodity.refresh_price()
+        # Refresh the port's market and offer 3 random commodities it trades
+        self.market.refresh_port(port)
+        available = self.catalog.port_commodities[port]
+        self.current_commodities = [MarketListing(self.market, port, index) 
+                                    for index in random.sample(available, min(3, len(available)))]
         
-        # Initialize cargo if empty
-        if not self.player_cargo:
-            for commodity in self.commodities:
-                self.player_cargo[commodity.name] = 0
+        self.mark_dirty()
     
     def deactivate(self):
         """Deactivate dock menu"""
         self.active = False
         self.current_menu = "main"
         self.message = ""
+        self.cache_surface = None
+    
+    def mark_dirty(self):
+        """Force the cached menu surface to be rebuilt on the next draw"""
+        self.dirty = True
+    
+    @property
+    def needs_redraw(self):
+        """True when the menu is showing and its cached surface is stale"""
+        return self.active and self.dirty
     
-    def handle_input(self, event, ship_crew_system, player_stats):
+    def get_view_state(self, player):
+        """Get a snapshot of everything the menu displays"""
+        return (self.current_menu, self.selected_option, self.selected_commodity,
+                self.trade_quantity, self.message, self.message_color,
+                player.gold, player.health, player.crew, player.cargo_total,
+                self.fleet_ship, self.fleet_commodity, self.fleet.count if self.fleet else 0,
+                tuple(commodity.quantity_available for commodity in self.current_commodities))
+    
+    def handle_input(self, event, player):
         """Handle keyboard input for dock menu"""
         if not self.active:
             return None
         
+        result = None
         if event.type == pygame.KEYDOWN:
-            if self.current_menu == "main":
-                return self.handle_main_menu_input(event, ship_crew_system, player_stats)
-            elif self.current_menu == "trade":
-                return self.handle_trade_menu_input(event, player_stats)
-            elif self.current_menu == "repair":
-                return self.handle_repair_menu_input(event, ship_crew_system, player_stats)
-            elif self.current_menu == "crew":
-                return self.handle_crew_menu_input(event, ship_crew_system, player_stats)
+            view_before = self.get_view_state(player)
+            
+            result = self.dispatcher.handle_key(self.input_state, event.key, 
+                                                player)
+            
+            # Only rebuild the cached menu if the keypress changed what is shown
+            if result is not None or self.get_view_state(player) != view_before:
+                self.mark_dirty()
         
-        return None
+        return result
     
-    def handle_main_menu_input(self, event, ship_crew_system, player_stats):
-        """Handle main menu input"""
-        if event.key == pygame.K_UP:
-            self.selected_option = (self.selected_option - 1) % 4
-        elif event.key == pygame.K_DOWN:
-            self.selected_option = (self.selected_option + 1) % 4
-        elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-            if self.selected_option == 0:  # Trade Goods
-                self.current_menu = "trade"
-                self.selected_commodity = 0
-                self.trade_quantity = 1
-            elif self.selected_option == 1:  # Repair Ship
-                self.current_menu = "repair"
-            elif self.selected_option == 2:  # Recruit Crew
-                self.current_menu = "crew"
-            elif self.selected_option == 3:  # Leave Port
-                self.deactivate()
-                return "leave_port"
-        elif event.key == pygame.K_ESCAPE:
-            self.deactivate()
-            return "leave_port"
-        
-        return None
+    @property
+    def input_state(self):
+        """Input binding state for the current submenu"""
+        return "dock_" + self.current_menu
     
-    def handle_trade_menu_input(self, event, player_stats):
-        """Handle trade menu input"""
-        if event.key == pygame.K_UP:
-            self.selected_commodity = (self.selected_commodity - 1) % len(self.current_commodities)
-        elif event.key == pygame.K_DOWN:
-            self.selected_commodity = (self.selected_commodity + 1) % len(self.current_commodities)
-        elif event.key == pygame.K_LEFT:
-            self.trade_quantity = max(1, self.trade_quantity - 1)
-        elif event.key == pygame.K_RIGHT:
-            self.trade_quantity = min(10, self.trade_quantity + 1)
-        elif event.key == pygame.K_b:  # Buy
-            return self.buy_commodity(player_stats)
-        elif event.key == pygame.K_s:  # Sell
-            return self.sell_commodity(player_stats)
-        elif event.key == pygame.K_ESCAPE:
-            self.current_menu = "main"
-        
-        return None
+    def register_commands(self):
+        """Register dock commands with the dispatcher"""
+        self.dispatcher.register_all("dock_main", {
+            "menu_up": lambda player: self.move_selection(-1, len(self.main_menu_actions)),
+            "menu_down": lambda player: self.move_selection(1, len(self.main_menu_actions)),
+            "select": lambda player: self.main_menu_actions[self.selected_option](player),
+            "leave_port": lambda player: self.leave_port()
+        })
+        self.dispatcher.register_all("dock_trade", {
+            "menu_up": lambda player: self.move_commodity_selection(-1),
+            "menu_down": lambda player: self.move_commodity_selection(1),
+            "quantity_down": lambda player: self.change_trade_quantity(-1),
+            "quantity_up": lambda player: self.change_trade_quantity(1, player.max_cargo),
+            "quantity_down_10": lambda player: self.change_trade_quantity(-10),
+            "quantity_up_10": lambda player: self.change_trade_quantity(10, player.max_cargo),
+            "buy": lambda player: self.buy_commodity(player),
+            "sell": lambda player: self.sell_commodity(player),
+            "buy_max": lambda player: self.buy_max(player),
+            "sell_all": lambda player: self.sell_all(player),
+            "back": lambda player: self.open_menu("main")
+        })
+        self.dispatcher.register_all("dock_repair", {
+            "repair": lambda player: self.repair_ship(player),
+            "back": lambda player: self.open_menu("main")
+        })
+        self.dispatcher.register_all("dock_crew", {
+            "menu_up": lambda player: self.move_selection(-1, len(self.crew_options)),
+            "menu_down": lambda player: self.move_selection(1, len(self.crew_options)),
+            "select": lambda player: self.recruit_crew(player, self.crew_options[self.selected_option]),
+            "back": lambda player: self.open_menu("main")
+        })
+        self.dispatcher.register_all("dock_ledger", {
+            "back": lambda player: self.open_menu("main")
+        })
+        self.dispatcher.register_all("dock_fleet", {
+            "menu_up": lambda player: self.move_fleet_selection(-1),
+            "menu_down": lambda player: self.move_fleet_selection(1),
+            "commodity_prev": lambda player: self.move_fleet_commodity(-1),
+            "commodity_next": lambda player: self.move_fleet_commodity(1),
+            "send_crew": lambda player: self.transfer_crew(0, self.fleet_ship),
+            "recall_crew": lambda player: self.transfer_crew(self.fleet_ship, 0),
+            "send_cargo": lambda player: self.transfer_cargo(0, self.fleet_ship),
+            "fetch_cargo": lambda player: self.transfer_cargo(self.fleet_ship, 0),
+            "buy_ship": lambda player: self.buy_ship(player),
+            "back": lambda player: self.open_menu("main")
+        })
     
-    def handle_repair_menu_input(self, event, ship_crew_system, player_stats):
-        """Handle repair menu input"""
-        if event.key == pygame.K_r:  # Repair
-            return self.repair_ship(player_stats)
-        elif event.key == pygame.K_ESCAPE:
-            self.current_menu = "main"
-        
-        return None
+    def move_selection(self, step, option_count):
+        """Move the menu cursor, wrapping around"""
+        self.selected_option = (self.selected_option + step) % option_count
     
-    def handle_crew_menu_input(self, event, ship_crew_system, player_stats):
-        """Handle crew menu input"""
-        if event.key == pygame.K_UP:
-            self.selected_option = (self.selected_option - 1) % 3
-        elif event.key == pygame.K_DOWN:
-            self.selected_option = (self.selected_option + 1) % 3
-        elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-            if self.selected_option == 0:  # Recruit 1 crew
-                return self.recruit_crew(ship_crew_system, player_stats, 1)
-            elif self.selected_option == 1:  # Recruit 3 crew
-                return self.recruit_crew(ship_crew_system, player_stats, 3)
-            elif self.selected_option == 2:  # Recruit 5 crew
-                return self.recruit_crew(ship_crew_system, player_stats, 5)
-        elif event.key == pygame.K_ESCAPE:
-            self.current_menu = "main"
-        
-        return None
+    def move_commodity_selection(self, step):
+        """Move the trade cursor, wrapping around"""
+        if not self.current_commodities:
+            return
+        self.selected_commodity = (self.selected_commodity + step) % len(self.current_commodities)
     
-    def buy_commodity(self, player_stats):
-        """Buy selected commodity"""
-        commodity = self.current_commodities[self.selected_commodity]
-        total_cost = commodity.current_price * self.trade_quantity
-        
-        # Check if player has enough gold
-        if player_stats['gold'] < total_cost:
-            self.show_message("Not enough gold!", self.colors['error'])
+    def change_trade_quantity(self, step, limit=None):
+        """Change trade quantity, keeping it at least 1 (and at most limit)"""
+        quantity = self.trade_quantity + step
+        if limit is not None:
+            quantity = min(limit, quantity)
+        self.trade_quantity = max(1, quantity)
+    
+    def open_menu(self, menu):
+        """Switch to a submenu"""
+        self.current_menu = menu
+    
+    def open_trade_menu(self):
+        """Switch to the trade menu with a fresh selection (not at ports with nothing to trade)"""
+        if not self.current_commodities:
+            self.show_message("Nothing to trade in this port!", self.colors['error'])
+            return
+        self.current_menu = "trade"
+        self.selected_commodity = 0
+        self.trade_quantity = 1
+    
+    def open_ledger(self, player):
+        """Plan the most profitable route from this port and show it"""
+        self.route_optimizer.invalidate()  # Prices were rerolled on docking
+        self.ledger_route = self.route_optimizer.best_route(self.port, player.max_cargo, player.gold)
+        self.current_menu = "ledger"
+    
+    def open_fleet_menu(self):
+        """Switch to the fleet menu"""
+        if self.fleet is None:
+            self.show_message("You have no fleet!", self.colors['error'])
             return None
-        
-        # Check cargo space
-        current_cargo = sum(self.player_cargo.values())
-        if current_cargo + self.trade_quantity > self.max_cargo:
-            self.show_message("Not enough cargo space!", self.colors['error'])
+        self.current_menu = "fleet"
+        self.fleet_ship = min(max(1, self.fleet_ship), max(1, self.fleet.count - 1))
+    
+    def move_fleet_selection(self, step):
+        """Move the escort cursor, wrapping around (the flagship is not selectable)"""
+        escorts = self.fleet.count - 1
+        if escorts > 0:
+            self.fleet_ship = (self.fleet_ship - 1 + step) % escorts + 1
+    
+    def move_fleet_commodity(self, step):
+        """Cycle the commodity to transfer"""
+        self.fleet_commodity = (self.fleet_commodity + step) % self.catalog.commodity_count
+    
+    def transfer_crew(self, from_ship, to_ship):
+        """Move one sailor between the flagship and the selected escort"""
+        if self.fleet.count < 2:
+            self.show_message("Buy a ship first!", self.colors['error'])
             return None
-        
-        # Check commodity availability
-        if commodity.quantity_available < self.trade_quantity:
-            self.show_message("Not enough in stock!", self.colors['error'])
+        if self.fleet.transfer_crew(1, from_ship, to_ship):
+            self.show_message(f"A sailor rows over to the {self.fleet.names[to_ship]}", self.colors['success'])
+        else:
+            self.show_message("No one to send, or no room aboard!", self.colors['error'])
+        return None
+    
+    def transfer_cargo(self, from_ship, to_ship):
+        """Move cargo of the selected commodity between the flagship and the selected escort"""
+        if self.fleet.count < 2:
+            self.show_message("Buy a ship first!", self.colors['error'])
+            return None
+        name = self.catalog.commodity_names[self.fleet_commodity]
+        moved = self.fleet.transfer_cargo(self.fleet_commodity, self.fleet_transfer, from_ship, to_ship)
+        if moved:
+            self.show_message(f"Moved {moved} {name} to the {self.fleet.names[to_ship]}", self.colors['success'])
+        else:
+            self.show_message(f"No {name} to move, or no room aboard!", self.colors['error'])
+        return None
+    
+    def buy_ship(self, player):
+        """Buy a new escort; it joins the fleet with an empty hold and no crew"""
+        if player.gold < SHIP_PRICE:
+            self.show_message("Not enough gold for a ship!", self.colors['error'])
             return None
         
-        # Execute trade
-        player_stats['gold'] -= total_cost
-        self.player_cargo[commodity.name] += self.trade_quantity
-        commodity.quantity_available -= self.trade_quantity
-        
-        self.show_message(f"Bought {self.trade_quantity} {commodity.name} for {total_cost} gold", 
-                         self.colors['success'])
-        
-        return {'action': 'buy', 'commodity': commodity.name, 'quantity': self.trade_quantity, 'cost': total_cost}
+        player.gold -= SHIP_PRICE
+        name = f"Sloop {self.fleet.count}"
+        self.fleet_ship = self.fleet.add_ship(name, self.fleet.x[0], self.fleet.y[0], self.fleet.heading[0])
+        self.show_message(f"Bought the {name} for {SHIP_PRICE} gold - send her some crew!", self.colors['success'])
+        return {'action': 'buy_ship', 'name': name, 'cost': SHIP_PRICE}
+    
+    def leave_port(self):
+        """Close the dock menu and tell the game to set sail"""
+        self.deactivate()
+        return "leave_port"
     
-    def sell_commodity(self, player_stats):
-        """Sell selected commodity"""
+    def buy_commodity(self, player):
+        """Buy the selected quantity of the selected commodity"""
         commodity = self.current_commodities[self.selected_commodity]
-        
-        # Check if player has commodity
-        if self.player_cargo.get(commodity.name, 0) < self.trade_quantity:
-            self.show_message("You don't have enough to sell!", self.colors['error'])
+        result = trading.execute_trades(self.market, self.port, player,
+                                        buys=[(commodity.index, self.trade_quantity)])
+        return self.report_trade(result)
+    
+    def sell_commodity(self, player):
+        """Sell the selected quantity of the selected commodity"""
+        commodity = self.current_commodities[self.selected_commodity]
+        result = trading.execute_trades(self.market, self.port, player,
+                                        sells=[(commodity.index, self.trade_quantity)])
+        return self.report_trade(result)
+    
+    def buy_max(self, player):
+        """Buy as much of the selected commodity as gold, cargo space and stock allow"""
+        commodity = self.current_commodities[self.selected_commodity]
+        return self.report_trade(trading.buy_max(self.market, self.port, player, commodity.index))
+    
+    def sell_all(self, player):
+        """Sell every listed good in the hold in one transaction"""
+        listed = [commodity.index for commodity in self.current_commodities]
+        return self.report_trade(trading.sell_all(self.market, self.port, player, listed))
+    
+    def report_trade(self, result):
+        """Show the outcome of a trade batch and build the result for the game"""
+        if not result.ok:
+            self.show_message(result.error, self.colors['error'])
             return None
         
-        # Execute trade
-        total_value = commodity.current_price * self.trade_quantity
-        player_stats['gold'] += total_value
-        self.player_cargo[commodity.name] -= self.trade_quantity
-        commodity.quantity_available += self.trade_quantity
-        
-        self.show_message(f"Sold {self.trade_quantity} {commodity.name} for {total_value} gold", 
-                         self.colors['success'])
+        names = self.catalog.commodity_names
+        if result.bought:
+            commodity, quantity, cost = result.bought[0]
+            self.show_message(f"Bought {quantity} {names[commodity]} for {cost} gold", self.colors['success'])
+            return {'action': 'buy', 'commodity': names[commodity], 'quantity': quantity, 'cost': cost}
         
-        return {'action': 'sell', 'commodity': commodity.name, 'quantity': self.trade_quantity, 'value': total_value}
+        quantity = sum(quantity for _, quantity, _ in result.sold)
+        if len(result.sold) == 1:
+            goods = names[result.sold[0][0]]
+        else:
+            goods = "goods"
+        self.show_message(f"Sold {quantity} {goods} for {result.value} gold", self.colors['success'])
+        return {'action': 'sell', 'commodity': goods, 'quantity': quantity, 'value': result.value}
     
-    def repair_ship(self, player_stats):
+    def repair_ship(self, player):
         """Repair ship health"""
-        max_health = 100
-        current_health = player_stats['health']
+        max_health = player.max_health
+        current_health = player.health
         
         if current_health >= max_health:
             self.show_message("Ship is already at full health!", self.colors['info'])
             return None
         
-        # Calculate repair cost (10 gold per 10 health points)
+        # Calculate repair cost (REPAIR_COST gold per 10 health points)
         health_to_repair = max_health - current_health
-        repair_cost = (health_to_repair // 10) * 10 + (10 if health_to_repair % 10 > 0 else 0)
+        repair_cost = player.repair_cost
         
-        if player_stats['gold'] < repair_cost:
+        if player.gold < repair_cost:
             self.show_message("Not enough gold for repairs!", self.colors['error'])
             return None
         
         # Execute repair
-        player_stats['gold'] -= repair_cost
-        player_stats['health'] = max_health
+        player.gold -= repair_cost
+        player.health = max_health
         
         self.show_message(f"Ship repaired for {repair_cost} gold!", self.colors['success'])
         
         return {'action': 'repair', 'cost': repair_cost, 'health_restored': health_to_repair}
     
-    def recruit_crew(self, ship_crew_system, player_stats, count):
+    def recruit_crew(self, player, count):
         """Recruit crew members"""
-        cost_per_crew = 25
-        total_cost = cost_per_crew * count
+        total_cost = RECRUIT_COST * count
         
         # Check if player has enough gold
-        if player_stats['gold'] < total_cost:
+        if player.gold < total_cost:
             self.show_message("Not enough gold to recruit crew!", self.colors['error'])
             return None
         
         # Check crew capacity
-        current_crew = ship_crew_system.get_crew_count()
-        max_crew = ship_crew_system.max_crew
-        
-        if current_crew + count > max_crew:
-            available_slots = max_crew - current_crew
+        if not player.can_recruit(count):
+            available_slots = player.max_crew - player.crew
             self.show_message(f"Only {available_slots} crew slots available!", self.colors['error'])
             return None
         
         # Execute recruitment
-        player_stats['gold'] -= total_cost
+        player.gold -= total_cost
         
-        # Add crew members (simplified - you might want to integrate with your crew system)
-        recruited = 0
-        for _ in range(count):
-            if ship_crew_system.get_crew_count() < ship_crew_system.max_crew:
-                # This would need to integrate with your actual crew system
-                recruited += 1
+        player.recruit(count)
         
-        self.show_message(f"Recruited {recruited} crew members for {total_cost} gold!", 
+        self.show_message(f"Recruited {count} crew members for {total_cost} gold!", 
                          self.colors['success'])
         
-        return {'action': 'recruit', 'count': recruited, 'cost': total_cost}
+        return {'action': 'recruit', 'count': count, 'cost': total_cost}
     
     def show_message(self, text, color):
         """Show a temporary message"""
@@ -314,18 +425,34 @@ class DockMenu:
             self.message_timer -= dt
             if self.message_timer <= 0:
                 self.message = ""
+                self.mark_dirty()
     
-    def draw(self, screen, ship_crew_system, player_stats):
-        """Draw the dock menu"""
+    def draw(self, screen, player):
+        """Draw the dock menu
+        
+        Returns True if the cached menu surface had to be rebuilt, so the
+        caller knows whether the frame changed at all.
+        """
         if not self.active:
-            return
+            return False
         
-        screen_width, screen_height = screen.get_size()
+        redrawn = False
+        if self.dirty or self.cache_surface is None or self.cache_surface.get_size() != screen.get_size():
+            self.render_menu(screen.get_size(), player)
+            redrawn = True
+        
+        screen.blit(self.cache_surface, (0, 0))
+        return redrawn
+    
+    def render_menu(self, size, player):
+        """Render the current submenu into the cached surface"""
+        if self.cache_surface is None or self.cache_surface.get_size() != size:
+            self.cache_surface = pygame.Surface(size, pygame.SRCALPHA)
+        screen = self.cache_surface
+        screen_width, screen_height = size
         
         # Semi-transparent overlay
-        overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
-        overlay.fill(self.colors['background'])
-        screen.blit(overlay, (0, 0))
+        screen.fill(self.colors['background'])
         
         # Main menu panel
         panel_width = 600
@@ -341,26 +468,30 @@ class DockMenu:
         screen.blit(panel_surface, (panel_x, panel_y))
         
         if self.current_menu == "main":
-            self.draw_main_menu(screen, panel_x, panel_y, panel_width, panel_height, 
-                              ship_crew_system, player_stats)
+            self.draw_main_menu(screen, panel_x, panel_y, panel_width, panel_height, player)
         elif self.current_menu == "trade":
-            self.draw_trade_menu(screen, panel_x, panel_y, panel_width, panel_height, player_stats)
+            self.draw_trade_menu(screen, panel_x, panel_y, panel_width, panel_height, player)
         elif self.current_menu == "repair":
-            self.draw_repair_menu(screen, panel_x, panel_y, panel_width, panel_height, player_stats)
+            self.draw_repair_menu(screen, panel_x, panel_y, panel_width, panel_height, player)
         elif self.current_menu == "crew":
-            self.draw_crew_menu(screen, panel_x, panel_y, panel_width, panel_height, 
-                              ship_crew_system, player_stats)
+            self.draw_crew_menu(screen, panel_x, panel_y, panel_width, panel_height, player)
+        elif self.current_menu == "ledger":
+            self.draw_ledger_menu(screen, panel_x, panel_y, panel_width, panel_height)
+        elif self.current_menu == "fleet":
+            self.draw_fleet_menu(screen, panel_x, panel_y, panel_width, panel_height, player)
         
         # Draw message if active
         if self.message and self.message_timer > 0:
             message_surface = self.info_font.render(self.message, True, self.message_color)
             message_rect = message_surface.get_rect(center=(screen_width // 2, screen_height - 50))
             screen.blit(message_surface, message_rect)
+        
+        self.dirty = False
     
-    def draw_main_menu(self, screen, x, y, width, height, ship_crew_system, player_stats):
+    def draw_main_menu(self, screen, x, y, width, height, player):
         """Draw main dock menu"""
         # Title
-        title = self.title_font.render("PORT OF CALL", True, self.colors['title'])
+        title = self.title_font.render(self.catalog.port_names[self.port].upper(), True, self.colors['title'])
         title_rect = title.get_rect(center=(x + width // 2, y + 50))
         screen.blit(title, title_rect)
         
@@ -369,21 +500,23 @@ class DockMenu:
             "1. Trade Goods",
             "2. Repair Ship",
             "3. Recruit Crew",
-            "4. Leave Port"
+            "4. Merchant's Ledger",
+            "5. Fleet",
+            "6. Leave Port"
         ]
         
         for i, option in enumerate(options):
             color = self.colors['selected'] if i == self.selected_option else self.colors['normal']
             option_surface = self.menu_font.render(option, True, color)
-            screen.blit(option_surface, (x + 50, y + 120 + i * 40))
+            screen.blit(option_surface, (x + 50, y + 110 + i * 36))
         
         # Player stats
-        stats_y = y + 300
+        stats_y = y + 340
         stats = [
-            f"Gold: {player_stats['gold']}",
-            f"Health: {player_stats['health']}/100",
-            f"Crew: {ship_crew_system.get_crew_count()}/{ship_crew_system.max_crew}",
-            f"Cargo: {sum(self.player_cargo.values())}/{self.max_cargo}"
+            f"Gold: {player.gold}",
+            f"Health: {player.health}/{player.max_health}",
+            f"Crew: {player.crew}/{player.max_crew}",
+            f"Cargo: {player.cargo_total}/{player.max_cargo}"
         ]
         
         for i, stat in enumerate(stats):
@@ -399,9 +532,9 @@ class DockMenu:
         
         for i, instruction in enumerate(instructions):
             inst_surface = self.small_font.render(instruction, True, self.colors['info'])
-            screen.blit(inst_surface, (x + 300, y + 350 + i * 20))
+            screen.blit(inst_surface, (x + 300, y + 390 + i * 20))
     
-    def draw_trade_menu(self, screen, x, y, width, height, player_stats):
+    def draw_trade_menu(self, screen, x, y, width, height, player):
         """Draw trading menu"""
         # Title
         title = self.title_font.render("TRADING POST", True, self.colors['title'])
@@ -413,27 +546,29 @@ class DockMenu:
             color = self.colors['selected'] if i == self.selected_commodity else self.colors['normal']
             
             # Commodity info
-            commodity_text = f"{commodity.name}: {commodity.current_price}g each (Stock: {commodity.quantity_available})"
+            commodity_text = f"{commodity.name}: {commodity.current_price:.0f}g each (Stock: {commodity.quantity_available})"
             commodity_surface = self.menu_font.render(commodity_text, True, color)
             screen.blit(commodity_surface, (x + 30, y + 80 + i * 60))
             
             # Player's cargo
-            player_amount = self.player_cargo.get(commodity.name, 0)
+            player_amount = player.cargo[commodity.index]
             cargo_text = f"You have: {player_amount}"
             cargo_surface = self.info_font.render(cargo_text, True, self.colors['info'])
             screen.blit(cargo_surface, (x + 50, y + 105 + i * 60))
         
         # Trade controls
         controls_y = y + 280
-        trade_text = f"Quantity: {self.trade_quantity}"
+        selected = self.current_commodities[self.selected_commodity]
+        quote = trading.buy_cost(selected.current_price, self.trade_quantity)
+        trade_text = f"Quantity: {self.trade_quantity} (cost {quote}g)"
         trade_surface = self.menu_font.render(trade_text, True, self.colors['normal'])
         screen.blit(trade_surface, (x + 30, controls_y))
         
         # Instructions
         instructions = [
             "UP/DOWN: Select commodity",
-            "LEFT/RIGHT: Change quantity",
-            "B: Buy   S: Sell",
+            "LEFT/RIGHT: Change quantity (PGUP/PGDN: by 10)",
+            "B: Buy   S: Sell   M: Buy max   A: Sell all",
             "ESC: Back to main menu"
         ]
         
@@ -442,11 +577,11 @@ class DockMenu:
             screen.blit(inst_surface, (x + 30, y + 320 + i * 20))
         
         # Player gold
-        gold_text = f"Gold: {player_stats['gold']}"
+        gold_text = f"Gold: {player.gold}"
         gold_surface = self.info_font.render(gold_text, True, self.colors['gold'])
         screen.blit(gold_surface, (x + 400, controls_y))
     
-    def draw_repair_menu(self, screen, x, y, width, height, player_stats):
+    def draw_repair_menu(self, screen, x, y, width, height, player):
         """Draw repair menu"""
         # Title
         title = self.title_font.render("SHIP REPAIRS", True, self.colors['title'])
@@ -454,8 +589,8 @@ class DockMenu:
         screen.blit(title, title_rect)
         
         # Ship status
-        current_health = player_stats['health']
-        max_health = 100
+        current_health = player.health
+        max_health = player.max_health
         health_text = f"Current Health: {current_health}/{max_health}"
         health_surface = self.menu_font.render(health_text, True, self.colors['normal'])
         screen.blit(health_surface, (x + 50, y + 120))
@@ -477,16 +612,15 @@ class DockMenu:
         
         # Repair info
         if current_health < max_health:
-            health_to_repair = max_health - current_health
-            repair_cost = (health_to_repair // 10) * 10 + (10 if health_to_repair % 10 > 0 else 0)
+            repair_cost = player.repair_cost
             
-            cost_text = f"Repair Cost: {repair_cost} gold (10 gold per 10 health)"
+            cost_text = f"Repair Cost: {repair_cost} gold ({REPAIR_COST} gold per 10 health)"
             cost_surface = self.info_font.render(cost_text, True, self.colors['info'])
             screen.blit(cost_surface, (x + 50, y + 220))
             
             # Repair button
             repair_text = "Press R to repair ship"
-            repair_color = self.colors['success'] if player_stats['gold'] >= repair_cost else self.colors['error']
+            repair_color = self.colors['success'] if player.gold >= repair_cost else self.colors['error']
             repair_surface = self.menu_font.render(repair_text, True, repair_color)
             screen.blit(repair_surface, (x + 50, y + 260))
         else:
@@ -495,7 +629,7 @@ class DockMenu:
             screen.blit(full_surface, (x + 50, y + 220))
         
         # Player gold
-        gold_text = f"Gold: {player_stats['gold']}"
+        gold_text = f"Gold: {player.gold}"
         gold_surface = self.info_font.render(gold_text, True, self.colors['gold'])
         screen.blit(gold_surface, (x + 50, y + 320))
         
@@ -504,7 +638,7 @@ class DockMenu:
         inst_surface = self.small_font.render(inst_text, True, self.colors['info'])
         screen.blit(inst_surface, (x + 50, y + 400))
     
-    def draw_crew_menu(self, screen, x, y, width, height, ship_crew_system, player_stats):
+    def draw_crew_menu(self, screen, x, y, width, height, player):
         """Draw crew recruitment menu"""
         # Title
         title = self.title_font.render("CREW RECRUITMENT", True, self.colors['title'])
@@ -512,17 +646,23 @@ class DockMenu:
         screen.blit(title, title_rect)
         
         # Current crew status
-        current_crew = ship_crew_system.get_crew_count()
-        max_crew = ship_crew_system.max_crew
+        current_crew = player.crew
+        max_crew = player.max_crew
         crew_text = f"Current Crew: {current_crew}/{max_crew}"
         crew_surface = self.menu_font.render(crew_text, True, self.colors['normal'])
         screen.blit(crew_surface, (x + 50, y + 100))
         
+        roster = player.roster
+        roster_text = (f"Morale: {roster.mean('morale'):.0f}   Skill: {roster.mean('skill') * 100:.0f}%   "
+                       f"Wages: {roster.payroll()} gold/day")
+        roster_surface = self.small_font.render(roster_text, True, self.colors['info'])
+        screen.blit(roster_surface, (x + 50, y + 128))
+        
         # Recruitment options
         options = [
-            "1. Recruit 1 crew member (25 gold)",
-            "2. Recruit 3 crew members (75 gold)",
-            "3. Recruit 5 crew members (125 gold)"
+            f"1. Recruit 1 crew member ({RECRUIT_COST} gold)",
+            f"2. Recruit 3 crew members ({RECRUIT_COST * 3} gold)",
+            f"3. Recruit 5 crew members ({RECRUIT_COST * 5} gold)"
         ]
         
         for i, option in enumerate(options):
@@ -537,7 +677,7 @@ class DockMenu:
         screen.blit(slots_surface, (x + 50, y + 280))
         
         # Player gold
-        gold_text = f"Gold: {player_stats['gold']}"
+        gold_text = f"Gold: {player.gold}"
         gold_surface = self.info_font.render(gold_text, True, self.colors['gold'])
         screen.blit(gold_surface, (x + 50, y + 320))
         
@@ -552,6 +692,79 @@ class DockMenu:
             inst_surface = self.small_font.render(instruction, True, self.colors['info'])
             screen.blit(inst_surface, (x + 50, y + 370 + i * 20))
     
-    def get_cargo_summary(self):
+    def draw_ledger_menu(self, screen, x, y, width, height):
+        """Draw the merchant's ledger (best trade route from this port)"""
+        # Title
+        title = self.title_font.render("MERCHANT'S LEDGER", True, self.colors['title'])
+        title_rect = title.get_rect(center=(x + width // 2, y + 50))
+        screen.blit(title, title_rect)
+        
+        route = self.ledger_route
+        if route is None or not route.legs:
+            none_text = "No profitable route from this port"
+            none_surface = self.menu_font.render(none_text, True, self.colors['info'])
+            screen.blit(none_surface, (x + 30, y + 120))
+        else:
+            # Route legs (as many as fit in the panel)
+            for i, line in enumerate(route.describe(self.catalog)[:8]):
+                leg_surface = self.info_font.render(line, True, self.colors['normal'])
+                screen.blit(leg_surface, (x + 30, y + 100 + i * 28))
+            
+            # Totals
+            total_text = f"Expected profit: {route.profit} gold in {route.travel_time:.1f} hours"
+            total_surface = self.info_font.render(total_text, True, self.colors['gold'])
+            screen.blit(total_surface, (x + 30, y + 340))
+        
+        # Instructions
+        inst_text = "Prices are today's and may move before you arrive. ESC: Back to main menu"
+        inst_surface = self.small_font.render(inst_text, True, self.colors['info'])
+        screen.blit(inst_surface, (x + 30, y + 400))
+    
+    def draw_fleet_menu(self, screen, x, y, width, height, player):
+        """Draw the fleet menu (ships, crew and cargo transfers)"""
+        # Title
+        title = self.title_font.render("FLEET", True, self.colors['title'])
+        title_rect = title.get_rect(center=(x + width // 2, y + 40))
+        screen.blit(title, title_rect)
+        
+        # Ships, scrolled so the selected escort stays in view
+        fleet = self.fleet
+        visible_rows = 8
+        first = max(0, min(self.fleet_ship - visible_rows // 2, fleet.count - visible_rows))
+        for row, ship in enumerate(range(first, min(fleet.count, first + visible_rows))):
+            if ship == 0:
+                color = self.colors['gold']
+            else:
+                color = self.colors['selected'] if ship == self.fleet_ship else self.colors['normal']
+            ship_text = (f"{fleet.names[ship]}: crew {fleet.crew(ship)}/{fleet.max_crew[ship]}, "
+                         f"cargo {fleet.cargo_total(ship)}/{fleet.max_cargo[ship]}")
+            ship_surface = self.info_font.render(ship_text, True, color)
+            screen.blit(ship_surface, (x + 30, y + 80 + row * 26))
+        
+        # Selected commodity aboard the flagship and the selected escort
+        commodity_y = y + 300
+        name = self.catalog.commodity_names[self.fleet_commodity]
+        commodity_text = f"Goods: {name} (flagship {fleet.cargo_of(0, self.fleet_commodity)}"
+        if fleet.count > 1:
+            commodity_text += f", {fleet.names[self.fleet_ship]} {fleet.cargo_of(self.fleet_ship, self.fleet_commodity)}"
+        commodity_surface = self.menu_font.render(commodity_text + ")", True, self.colors['normal'])
+        screen.blit(commodity_surface, (x + 30, commodity_y))
+        
+        gold_surface = self.info_font.render(f"Gold: {player.gold}", True, self.colors['gold'])
+        screen.blit(gold_surface, (x + 30, commodity_y + 35))
+        
+        # Instructions
+        instructions = [
+            "UP/DOWN: Select ship   LEFT/RIGHT: Select goods",
+            f"C/R: Send/recall a sailor   G/F: Send/fetch {self.fleet_transfer} goods",
+            f"B: Buy a ship ({SHIP_PRICE} gold)   ESC: Back to main menu"
+        ]
+        
+        for i, instruction in enumerate(instructions):
+            inst_surface = self.small_font.render(instruction, True, self.colors['info'])
+            screen.blit(inst_surface, (x + 30, y + 400 + i * 20))
+    
+    def get_cargo_summary(self, player):
         """Get summary of player's cargo"""
-        return {name: quantity for name, quantity in self.player_cargo.items() if quantity > 0}
+        return {name: quantity for name, quantity in zip(self.catalog.commodity_names, player.cargo) 
+                if quantity > 0}
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Fleet
+Player-owned escort ships stored as parallel numpy arrays with batched movement
+"""
+
+import numpy as np
+
+# Orders
+ORDER_FOLLOW = 0  # Keep station in formation on the flagship
+ORDER_HOLD = 1    # Stay where you are
+ORDER_GOTO = 2    # Sail independently to a target point
+
+SHIP_PRICE = 400             # Gold for a new escort in port
+FORMATION_SPACING = 45.0     # World units between formation ranks
+TURN_RATE = 90.0             # Degrees per second
+CRUISE_SPEED = 60.0          # World units per second for an average crew
+CATCH_UP = 1.5               # Formation ships may exceed cruise speed to regain station
+ARRIVE_RADIUS = 6.0          # Close enough to a station or target
+
+class Fleet:
+    """The player's ships as a struct of arrays
+    
+    Ship 0 is the flagship: it is steered by the player through the sailing
+    engine and its cargo lives in PlayerState. Ships 1+ are escorts moved
+    together by update(); their cargo is one row each of a 2D array. Crew
+    for every ship is in the player's CrewRoster, keyed by ship index.
+    """
+    
+    def __init__(self, player, capacity=4):
+        """Initialize a fleet holding only the flagship"""
+        self.player = player
+        self.names = [player.ship_name]
+        self.count = 1
+        commodity_count = len(player.cargo)
+        
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.heading = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.order = np.zeros(capacity, dtype=np.int8)
+        self.target_x = np.zeros(capacity)
+        self.target_y = np.zeros(capacity)
+        self.max_speed = np.full(capacity, CRUISE_SPEED)
+        self.max_crew = np.zeros(capacity, dtype=np.int32)
+        self.max_cargo = np.zeros(capacity, dtype=np.int32)
+        self.cargo = np.zeros((capacity, commodity_count), dtype=np.int32)
+        
+        self.max_crew[0] = player.max_crew
+        self.max_cargo[0] = player.max_cargo
+    
+    def _columns(self):
+        return ('x', 'y', 'heading', 'speed', 'order', 'target_x', 'target_y',
+                'max_speed', 'max_crew', 'max_cargo', 'cargo')
+    
+    def _reserve(self):
+        """Double the arrays when they are full"""
+        capacity = len(self.x)
+        if self.count < capacity:
+            return
+        
+        for name in self._columns():
+            old = getattr(self, name)
+            grown = np.zeros((capacity * 2,) + old.shape[1:], dtype=old.dtype)
+            grown[:capacity] = old
+            setattr(self, name, grown)
+    
+    def add_ship(self, name, x, y, heading=0.0, max_crew=30, max_cargo=100):
+        """Add an escort following the flagship; returns its ship index"""
+        self._reserve()
+        ship = self.count
+        self.names.append(name)
+        self.x[ship] = x
+        self.y[ship] = y
+        self.heading[ship] = heading
+        self.speed[ship] = 0.0
+        self.order[ship] = ORDER_FOLLOW
+        self.max_speed[ship] = CRUISE_SPEED
+        self.max_crew[ship] = max_crew
+        self.max_cargo[ship] = max_cargo
+        self.cargo[ship] = 0
+        self.count += 1
+        return ship
+    
+    def set_order(self, ship, order, target=None):
+        """Give one escort an order (target is (x, y) for ORDER_GOTO)"""
+        self.order[ship] = order
+        if target is not None:
+            self.target_x[ship], self.target_y[ship] = target
+    
+    def order_all(self, order):
+        """Give every escort the same order"""
+        self.order[1:self.count] = order
+    
+    def refresh_speeds(self, sailing_crew):
+        """Recompute each ship's top speed from its crew (call daily and after docking)"""
+        factors = self.player.roster.speed_factors(self.count, sailing_crew)
+        self.max_speed[:self.count] = CRUISE_SPEED * factors
+    
+    def formation_slots(self, leader_x, leader_y, leader_heading):
+        """Get the world position of every escort's formation station
+        
+        Escorts form a wedge behind the flagship: slots alternate right and
+        left, one rank further back every two ships.
+        """
+        slots = np.arange(1, self.count)
+        rank = (slots + 1) // 2
+        side = np.where(slots % 2, 1.0, -1.0)
+        lateral = side * rank * FORMATION_SPACING
+        behind = rank * FORMATION_SPACING
+        
+        radians = np.radians(leader_heading)
+        forward_x, forward_y = np.sin(radians), -np.cos(radians)
+        return (leader_x + lateral * -forward_y - behind * forward_x,
+                leader_y + lateral * forward_x - behind * forward_y)
+    
+    def update(self, dt, leader_x, leader_y, leader_heading):
+        """Move every escort one step toward its station or target"""
+        self.x[0], self.y[0], self.heading[0] = leader_x, leader_y, leader_heading
+        if self.count < 2:
+            return
+        
+        escorts = slice(1, self.count)
+        x, y = self.x[escorts], self.y[escorts]
+        heading = self.heading[escorts]
+        order = self.order[escorts]
+        
+        # Where each escort wants to be
+        slot_x, slot_y = self.formation_slots(leader_x, leader_y, leader_heading)
+        want_x = np.where(order == ORDER_FOLLOW, slot_x, np.where(order == ORDER_GOTO, self.target_x[escorts], x))
+        want_y = np.where(order == ORDER_FOLLOW, slot_y, np.where(order == ORDER_GOTO, self.target_y[escorts], y))
+        dx, dy = want_x - x, want_y - y
+        distance = np.hypot(dx, dy)
+        moving = distance > ARRIVE_RADIUS
+        
+        # Turn toward the goal (0 degrees is north), or match the flagship on station
+        desired = np.where(moving, np.degrees(np.arctan2(dx, -dy)), np.where(order == ORDER_FOLLOW, leader_heading, heading))
+        turn = (desired - heading + 180.0) % 360.0 - 180.0
+        max_turn = TURN_RATE * dt
+        heading = (heading + np.clip(turn, -max_turn, max_turn)) % 360.0
+        
+        # Slow down on approach so ships settle on station instead of circling
+        top_speed = self.max_speed[escorts] * np.where(order == ORDER_FOLLOW, CATCH_UP, 1.0)
+        speed = np.where(moving, np.minimum(top_speed, distance / max(dt, 1e-6) * 0.5), 0.0)
+        radians = np.radians(heading)
+        self.x[escorts] = x + np.sin(radians) * speed * dt
+        self.y[escorts] = y - np.cos(radians) * speed * dt
+        self.heading[escorts] = heading
+        self.speed[escorts] = speed
+        
+        # Independent ships that arrived hold position
+        arrived = (order == ORDER_GOTO) & ~moving
+        self.order[escorts][arrived] = ORDER_HOLD
+    
+    def crew(self, ship):
+        """Number of sailors aboard a ship"""
+        return self.player.roster.size(ship)
+    
+    def cargo_of(self, ship, commodity):
+        """Units of a commodity aboard a ship"""
+        if ship == 0:
+            return self.player.cargo[commodity]
+        return int(self.cargo[ship, commodity])
+    
+    def cargo_total(self, ship):
+        """Total cargo aboard a ship"""
+        if ship == 0:
+            return self.player.cargo_total
+        return int(self.cargo[ship].sum())
+    
+    def free_cargo(self, ship):
+        """Cargo space left aboard a ship"""
+        return int(self.max_cargo[ship]) - self.cargo_total(ship)
+    
+    def _move_cargo(self, ship, commodity, quantity):
+        """Add (or remove, when negative) cargo aboard one ship"""
+        if ship == 0:
+            self.player.add_cargo(commodity, quantity)
+        else:
+            self.cargo[ship, commodity] += quantity
+    
+    def transfer_cargo(self, commodity, quantity, from_ship, to_ship):
+        """Move cargo between two ships; returns how much was moved"""
+        quantity = min(quantity, self.cargo_of(from_ship, commodity), self.free_cargo(to_ship))
+        if quantity <= 0 or from_ship == to_ship:
+            return 0
+        self._move_cargo(from_ship, commodity, -quantity)
+        self._move_cargo(to_ship, commodity, quantity)
+        return quantity
+    
+    def transfer_crew(self, count, from_ship, to_ship):
+        """Move sailors between two ships; returns how many were moved"""
+        room = int(self.max_crew[to_ship]) - self.crew(to_ship)
+        if room <= 0 or from_ship == to_ship:
+            return 0
+        return self.player.roster.transfer(min(count, room), from_ship, to_ship)
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Fonts
+Shared, lazily created fonts so UI objects can be built before pygame is initialized
+"""
+
+import pygame
+
+_fonts = {}
+
+def get_font(size, name=None):
+    """Get the shared font for (name, size), creating it (and pygame.font) on first use"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = _fonts[key] = pygame.font.Font(name, size)
+    return font
+
+class LazyFont:
+    """Stands in for pygame.font.Font until something is rendered or measured
+    
+    UI constructors keep their `self.font = ...` lines, but no font file is
+    opened (and SDL_ttf is not started) until the first render, so building
+    menus and HUD objects costs nothing in headless or server code. Fonts of
+    the same size are shared between every object that asks for them.
+    """
+    
+    __slots__ = ('size', 'name')
+    
+    def __init__(self, size, name=None):
+        self.size = size
+        self.name = name
+    
+    def __getattr__(self, attribute):
+        return getattr(get_font(self.size, self.name), attribute)
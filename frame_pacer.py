@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Frame Pacing
+Idle-aware frame pacing with a fixed-step simulation accumulator
+"""
+
+import pygame
+
+# Pacing modes
+PACE_ACTIVE = "active"          # Focused and sailing: full frame rate
+PACE_UNFOCUSED = "unfocused"    # Window lost focus: capped frame rate
+PACE_IDLE = "idle"              # Docked: wait for events, no fixed-step simulation
+PACE_MINIMIZED = "minimized"    # Window hidden: wait for events, no simulation or drawing
+
+class FramePacer:
+    """Chooses how long to wait between frames and how many physics steps to run
+    
+    Simulation always advances in fixed physics_step increments, so the
+    visual frame rate can drop (unfocused) without changing how the ship
+    handles.
+    """
+    
+    def __init__(self, clock, target_fps=60, unfocused_fps=15, idle_wait_ms=250,
+                 physics_hz=60, max_steps_per_frame=5):
+        """Initialize frame pacer"""
+        self.clock = clock
+        self.target_fps = target_fps
+        self.unfocused_fps = unfocused_fps
+        self.idle_wait_ms = idle_wait_ms  # Longest wait so message timers still tick
+        self.physics_step = 1.0 / physics_hz
+        self.max_steps_per_frame = max_steps_per_frame
+        
+        self.mode = PACE_ACTIVE
+        self.accumulator = 0.0
+        self.frame_time = 0.0  # Seconds spent on the last frame
+        self.work_time = 0.0   # Of which working rather than waiting for the frame cap
+    
+    @property
+    def simulating(self):
+        """True when the fixed-step simulation should run this frame"""
+        return self.mode in (PACE_ACTIVE, PACE_UNFOCUSED)
+    
+    @property
+    def alpha(self):
+        """Fraction of a physics step left in the accumulator (for interpolation)"""
+        return self.accumulator / self.physics_step
+    
+    def choose_mode(self, idle):
+        """Pick the pacing mode from window state and whether the game is idle"""
+        if not pygame.display.get_active():
+            return PACE_MINIMIZED
+        if idle:
+            return PACE_IDLE
+        if not pygame.key.get_focused():
+            return PACE_UNFOCUSED
+        return PACE_ACTIVE
+    
+    def wait_for_frame(self, idle=False):
+        """Wait until the next frame is due
+        
+        Returns (events, frame_dt). While idle or minimized this blocks in
+        pygame.event.wait() instead of spinning, so a docked game uses
+        almost no CPU.
+        """
+        was_simulating = self.simulating
+        self.mode = self.choose_mode(idle)
+        
+        if self.mode in (PACE_IDLE, PACE_MINIMIZED):
+            event = pygame.event.wait(self.idle_wait_ms)
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events.extend(pygame.event.get())
+            frame_dt = self.clock.tick() / 1000.0
+        else:
+            fps = self.target_fps if self.mode == PACE_ACTIVE else self.unfocused_fps
+            frame_dt = self.clock.tick(fps) / 1000.0
+            events = pygame.event.get()
+            
+            # Coming back from idle: don't replay the time spent waiting
+            if not was_simulating:
+                self.accumulator = 0.0
+                frame_dt = 0.0
+        
+        self.frame_time = frame_dt
+        self.work_time = self.clock.get_rawtime() / 1000.0
+        return events, frame_dt
+    
+    def physics_steps(self, frame_dt):
+        """Add frame time to the accumulator and get how many fixed steps to run"""
+        self.accumulator += frame_dt
+        steps = int(self.accumulator / self.physics_step)
+        
+        if steps > self.max_steps_per_frame:
+            # Too far behind (hitch or breakpoint): drop the backlog
+            steps = self.max_steps_per_frame
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.physics_step
+        
+        return steps
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Graphics Quality
+Effect presets from low to ultra, and an automatic mode that steps between them to hold the frame rate
+"""
+
+from collections import deque
+
+# Quality levels, cheapest first
+QUALITY_LOW = "low"
+QUALITY_MEDIUM = "medium"
+QUALITY_HIGH = "high"
+QUALITY_ULTRA = "ultra"
+QUALITY_AUTO = "auto"
+QUALITY_LEVELS = (QUALITY_LOW, QUALITY_MEDIUM, QUALITY_HIGH, QUALITY_ULTRA)
+
+# Effect settings per level; "high" is what the game looked like before presets
+QUALITY_PRESETS = {
+    QUALITY_LOW: {
+        "ocean": False,            # Heightfield ocean (False: flat fill with line waves)
+        "ocean_scale": 16,         # World units per heightfield cell
+        "ocean_rate": 8.0,         # Heightfield keyframes per second
+        "wave_spacing": 60,        # Pixels between line-wave grid points
+        "vane_spawn": (1, 1),      # Wind vanes per spawn (min, max)
+        "vane_interval": 4.0,      # Seconds between vane spawns
+        "stall_overlay": False,    # Full-screen red flash while stalled (the text always shows)
+        "rain_density": 0.25,      # Share of the rain drops that can fall
+        "wakes": False,            # Ship wakes
+        "fx_range": 200.0          # Farthest distance from the ship that effects are drawn
+    },
+    QUALITY_MEDIUM: {
+        "ocean": True,
+        "ocean_scale": 12,
+        "ocean_rate": 10.0,
+        "wave_spacing": 40,
+        "vane_spawn": (1, 3),
+        "vane_interval": 3.0,
+        "stall_overlay": True,
+        "rain_density": 0.5,
+        "wakes": True,
+        "fx_range": 300.0
+    },
+    QUALITY_HIGH: {
+        "ocean": True,
+        "ocean_scale": 8,
+        "ocean_rate": 15.0,
+        "wave_spacing": 30,
+        "vane_spawn": (2, 4),
+        "vane_interval": 2.0,
+        "stall_overlay": True,
+        "rain_density": 1.0,
+        "wakes": True,
+        "fx_range": 400.0
+    },
+    QUALITY_ULTRA: {
+        "ocean": True,
+        "ocean_scale": 6,
+        "ocean_rate": 20.0,
+        "wave_spacing": 24,
+        "vane_spawn": (3, 5),
+        "vane_interval": 1.5,
+        "stall_overlay": True,
+        "rain_density": 1.0,
+        "wakes": True,
+        "fx_range": 550.0
+    }
+}
+
+SAMPLE_WINDOW = 60        # Frames in the rolling frame-time average
+DOWNGRADE_LOAD = 0.9      # Step down when frames use more than this share of the frame budget...
+DOWNGRADE_AFTER = 1.0     # ...for this many seconds
+UPGRADE_LOAD = 0.55       # Step up when frames use less than this share...
+UPGRADE_AFTER = 5.0       # ...for this many seconds
+UPGRADE_BACKOFF = 2.0     # Multiplies UPGRADE_AFTER every time an upgrade had to be taken back
+
+def next_quality(level):
+    """Get the level after this one when cycling by key: low, medium, high, ultra, auto, low..."""
+    cycle = QUALITY_LEVELS + (QUALITY_AUTO,)
+    return cycle[(cycle.index(level) + 1) % len(cycle)]
+
+class AutoQuality:
+    """Steps the quality level up or down to hold a target frame rate
+    
+    Fed the time each frame spent working (not waiting on the frame cap),
+    it keeps a rolling average over the last SAMPLE_WINDOW frames. It
+    steps down one level quickly when that average eats most of the frame
+    budget, and steps up only after a long stretch with plenty to spare.
+    An upgrade that has to be taken back makes the next one wait longer,
+    so the level settles instead of bouncing between two presets.
+    """
+    
+    def __init__(self, target_fps=60, level=QUALITY_HIGH):
+        """Initialize at a starting level"""
+        self.budget = 1.0 / target_fps
+        self.level = level
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+        self.total = 0.0
+        self.over_time = 0.0
+        self.under_time = 0.0
+        self.upgrade_after = UPGRADE_AFTER
+        self.upgraded = False  # The last change was a step up
+    
+    @property
+    def average(self):
+        """Rolling average work time per frame in seconds"""
+        return self.total / len(self.samples) if self.samples else 0.0
+    
+    def sample(self, work_time, dt):
+        """Add one frame's work time; returns the new level if it changed, else None"""
+        if len(self.samples) == self.samples.maxlen:
+            self.total -= self.samples[0]
+        self.samples.append(work_time)
+        self.total += work_time
+        if len(self.samples) < self.samples.maxlen:
+            return None
+        
+        load = self.average / self.budget
+        self.over_time = self.over_time + dt if load > DOWNGRADE_LOAD else 0.0
+        self.under_time = self.under_time + dt if load < UPGRADE_LOAD else 0.0
+        
+        index = QUALITY_LEVELS.index(self.level)
+        if self.over_time >= DOWNGRADE_AFTER and index > 0:
+            if self.upgraded:
+                self.upgrade_after *= UPGRADE_BACKOFF
+            return self._change(QUALITY_LEVELS[index - 1], upgraded=False)
+        if self.under_time >= self.upgrade_after and index < len(QUALITY_LEVELS) - 1:
+            return self._change(QUALITY_LEVELS[index + 1], upgraded=True)
+        return None
+    
+    def _change(self, level, upgraded):
+        """Switch level and start measuring afresh"""
+        self.level = level
+        self.upgraded = upgraded
+        self.samples.clear()
+        self.total = 0.0
+        self.over_time = 0.0
+        self.under_time = 0.0
+        return level
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Input Bindings
+Declarative key bindings and command dispatch for every game state
+"""
+
+import json
+import os
+
+KEYBINDINGS_FILE = "keybindings.json"
+
+# Default bindings: game state -> {key name: command}
+# Key names are pygame key names (see pygame.key.name), so the config file
+# stays readable: {"dock_trade": {"+": "quantity_up"}}
+DEFAULT_BINDINGS = {
+    "sailing": {
+        "escape": "quit",
+        "d": "dock",
+        "space": "fire",
+        "s": "save",
+        "l": "load",
+        "f": "fleet_orders",
+        "o": "toggle_ocean",
+        "g": "cycle_quality",
+        "m": "world_map"
+    },
+    "dock_main": {
+        "up": "menu_up",
+        "down": "menu_down",
+        "return": "select",
+        "space": "select",
+        "escape": "leave_port"
+    },
+    "dock_trade": {
+        "up": "menu_up",
+        "down": "menu_down",
+        "left": "quantity_down",
+        "right": "quantity_up",
+        "page down": "quantity_down_10",
+        "page up": "quantity_up_10",
+        "b": "buy",
+        "s": "sell",
+        "m": "buy_max",
+        "a": "sell_all",
+        "escape": "back"
+    },
+    "dock_repair": {
+        "r": "repair",
+        "escape": "back"
+    },
+    "dock_crew": {
+        "up": "menu_up",
+        "down": "menu_down",
+        "return": "select",
+        "space": "select",
+        "escape": "back"
+    },
+    "dock_ledger": {
+        "escape": "back"
+    },
+    "dock_fleet": {
+        "up": "menu_up",
+        "down": "menu_down",
+        "left": "commodity_prev",
+        "right": "commodity_next",
+        "c": "send_crew",
+        "r": "recall_crew",
+        "g": "send_cargo",
+        "f": "fetch_cargo",
+        "b": "buy_ship",
+        "escape": "back"
+    },
+    "dock_classic": {
+        "1": "trade",
+        "2": "repair",
+        "3": "leave_port"
+    }
+}
+
+class InputMap:
+    """Lookup table from (state, key code) to command name"""
+    
+    def __init__(self, key_code, bindings=None):
+        """Initialize input map
+        
+        key_code converts a key name to a key code (pygame.key.key_code in the
+        client); it is passed in so this module never needs pygame itself.
+        """
+        self.key_code = key_code
+        self.bindings = {state: dict(keys) for state, keys in (bindings or DEFAULT_BINDINGS).items()}
+        self.table = {}
+        self.rebuild()
+    
+    def rebuild(self):
+        """Rebuild the flat (state, key) -> command table from the bindings"""
+        self.table = {}
+        for state, keys in self.bindings.items():
+            for key_name, command in keys.items():
+                self.table[(state, self.key_code(key_name))] = command
+    
+    def bind(self, state, key_name, command):
+        """Bind a key to a command in one state (None unbinds it)
+        
+        Raises ValueError for an unknown key name, before changing anything.
+        """
+        code = self.key_code(key_name)
+        keys = self.bindings.setdefault(state, {})
+        if command is None:
+            keys.pop(key_name, None)
+            self.table.pop((state, code), None)
+        else:
+            keys[key_name] = command
+            self.table[(state, code)] = command
+    
+    def load(self, filename=KEYBINDINGS_FILE):
+        """Apply overrides from a JSON config file, if it exists
+        
+        An entry with an unknown key name is skipped with a message, so a
+        typo leaves that key's default binding in place. A file that is not
+        valid JSON, or a state that is not a mapping of keys, is skipped the
+        same way and keeps the defaults.
+        """
+        if not os.path.exists(filename):
+            return False
+        
+        try:
+            with open(filename, 'r') as f:
+                overrides = json.load(f)
+            states = overrides.items()
+        except (ValueError, AttributeError) as e:
+            print(f"Skipping key bindings from {filename}: {e}")
+            return False
+        
+        for state, keys in states:
+            try:
+                entries = keys.items()
+            except AttributeError:
+                print(f"Skipping key bindings for {state} from {filename}: expected key names and commands")
+                continue
+            for key_name, command in entries:
+                try:
+                    self.bind(state, key_name, command)
+                except ValueError:
+                    print(f"Skipping key binding {key_name!r} in {state} from {filename}: unknown key name")
+        return True
+    
+    def save(self, filename=KEYBINDINGS_FILE):
+        """Write the current bindings to a JSON config file"""
+        with open(filename, 'w') as f:
+            json.dump(self.bindings, f, indent=2)
+    
+    def lookup(self, state, key):
+        """Get the command bound to a key in a state (or None)"""
+        return self.table.get((state, key))
+
+class CommandRecorder:
+    """Records dispatched commands per frame for replay"""
+    
+    def __init__(self):
+        """Initialize empty recording"""
+        self.frame = 0
+        self.commands = []  # (frame, state, command)
+    
+    def next_frame(self):
+        """Advance the frame counter (call once per simulation step)"""
+        self.frame += 1
+    
+    def record(self, state, command):
+        """Record a command at the current frame"""
+        self.commands.append((self.frame, state, command))
+    
+    def clear(self):
+        """Discard the recording"""
+        self.frame = 0
+        self.commands = []
+    
+    def save(self, filename):
+        """Save the recording as JSON lines"""
+        with open(filename, 'w') as f:
+            for frame, state, command in self.commands:
+                f.write(json.dumps([frame, state, command]) + "\n")
+    
+    @classmethod
+    def load(cls, filename):
+        """Load a recording saved with save()"""
+        recorder = cls()
+        with open(filename, 'r') as f:
+            for line in f:
+                if line.strip():
+                    frame, state, command = json.loads(line)
+                    recorder.commands.append((frame, state, command))
+        if recorder.commands:
+            recorder.frame = recorder.commands[-1][0]
+        return recorder
+    
+    def by_frame(self):
+        """Group recorded commands into {frame: [(state, command), ...]}"""
+        frames = {}
+        for frame, state, command in self.commands:
+            frames.setdefault(frame, []).append((state, command))
+        return frames
+
+class CommandDispatcher:
+    """Routes commands to handlers with one dictionary lookup per (state, command)"""
+    
+    def __init__(self, input_map=None, recorder=None):
+        """Initialize dispatcher"""
+        self.input_map = input_map
+        self.recorder = recorder
+        self.handlers = {}  # (state, command) -> handler
+    
+    def register(self, state, command, handler):
+        """Register a handler for a command in a state"""
+        self.handlers[(state, command)] = handler
+    
+    def register_all(self, state, handlers):
+        """Register a {command: handler} mapping for one state"""
+        for command, handler in handlers.items():
+            self.handlers[(state, command)] = handler
+    
+    def handle_key(self, state, key, *args):
+        """Dispatch the command bound to a key; returns the handler's result"""
+        command = self.input_map.lookup(state, key)
+        if command is None:
+            return None
+        return self.dispatch(state, command, *args)
+    
+    def dispatch(self, state, command, *args):
+        """Run the handler for a command; unknown commands are ignored"""
+        handler = self.handlers.get((state, command))
+        if handler is None:
+            return None
+        if self.recorder is not None:
+            self.recorder.record(state, command)
+        return handler(*args)
+    
+    def dispatch_batch(self, commands, *args):
+        """Run a batch of (state, command) pairs, e.g. for the headless simulator"""
+        return [self.dispatch(state, command, *args) for state, command in commands]
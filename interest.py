@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Interest Management
+Near/far simulation tiers around the players, on top of the spatial index
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+
+NEAR_RADIUS = 700.0     # Entities this close to a focus get the full per-frame simulation
+HYSTERESIS = 150.0      # Extra distance before a near entity drops back to the far tier
+FAR_INTERVAL = 0.5      # Seconds between coarse updates of each far entity
+
+class InterestManager:
+    """Splits the entities of a SpatialGrid into a near and a far tier
+    
+    Near entities are found with radius queries around each focus point
+    (the player ships), so their cost does not depend on how many entities
+    the world holds. An entity joins the near tier inside near_radius and
+    only leaves it beyond near_radius + hysteresis, so ships on the border
+    do not flicker between tiers.
+    
+    Far entities are updated round-robin: each frame takes just enough of
+    them off the queue that every one comes up about once per far_interval,
+    and hands back how long it has been since that entity was last
+    simulated so the caller can advance it analytically in one step. An
+    entity returning to the near tier is first caught up the same way, so
+    it resumes full simulation exactly where the coarse model says it is.
+    """
+    
+    def __init__(self, grid, near_radius=NEAR_RADIUS, hysteresis=HYSTERESIS, far_interval=FAR_INTERVAL):
+        """Initialize an interest manager over a spatial grid"""
+        self.grid = grid
+        self.near_radius = near_radius
+        self.hysteresis = hysteresis
+        self.far_interval = far_interval
+        self.clock = 0.0
+        self.near = set()
+        self.simulated_to = {}   # Entity -> clock time its simulation has reached
+        self.far_queue = deque()
+        self.queued = set()
+    
+    def add(self, entity):
+        """Insert an entity into the grid and start tracking it (in the far tier until the next update)"""
+        self.grid.insert(entity)
+        self.simulated_to[entity] = self.clock
+        self._enqueue(entity)
+    
+    def add_all(self, entities):
+        for entity in entities:
+            self.add(entity)
+    
+    def remove(self, entity):
+        """Remove an entity from the grid and both tiers"""
+        self.grid.remove(entity)
+        self.simulated_to.pop(entity, None)
+        self.near.discard(entity)
+    
+    def moved(self, entity):
+        """Re-bucket an entity in the grid after the caller moved it"""
+        self.grid.update(entity)
+    
+    def _enqueue(self, entity):
+        if entity not in self.queued:
+            self.queued.add(entity)
+            self.far_queue.append(entity)
+    
+    def update(self, dt, foci):
+        """Advance the clock and re-tier around the focus points
+        
+        foci is a list of (x, y) positions. Returns (near, far): near is the
+        list of entities to simulate in full for dt this frame, far a list
+        of (entity, elapsed) pairs to advance coarsely by elapsed seconds.
+        Apply the far updates first; they include catch-ups for entities
+        that just entered the near tier.
+        """
+        start = self.clock
+        self.clock += dt
+        grid = self.grid
+        
+        inner = set()
+        outer = set()
+        for x, y in foci:
+            inner.update(grid.query_radius(x, y, self.near_radius))
+            outer.update(grid.query_radius(x, y, self.near_radius + self.hysteresis))
+        near = inner | (outer & self.near)
+        
+        far = []
+        simulated_to = self.simulated_to
+        for entity in near - self.near:
+            elapsed = start - simulated_to[entity]
+            if elapsed > 0:
+                far.append((entity, elapsed))
+        for entity in self.near - near:
+            simulated_to[entity] = start
+            self._enqueue(entity)
+        for entity in near:
+            simulated_to[entity] = self.clock
+        self.near = near
+        
+        # Round-robin through the far queue; entities that went near or were removed drop out
+        queue = self.far_queue
+        budget = min(len(queue), math.ceil(len(queue) * dt / self.far_interval))
+        for _ in range(budget):
+            entity = queue.popleft()
+            if entity in near or entity not in simulated_to:
+                self.queued.discard(entity)
+                continue
+            far.append((entity, self.clock - simulated_to[entity]))
+            simulated_to[entity] = self.clock
+            queue.append(entity)
+        
+        return list(near), far
+
+def near_mask(x, y, focus_x, focus_y, radius, hysteresis=HYSTERESIS, previous=None):
+    """Vectorized near tier for entities kept in arrays
+    
+    x and y are per-entity positions, focus_x and focus_y the focus points.
+    Returns a boolean array: True within radius of any focus, or within
+    radius + hysteresis for entities that were near in previous.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(focus_x) == 0:
+        return np.zeros(len(x), dtype=bool)
+    distance_sq = ((x[None, :] - np.asarray(focus_x, dtype=np.float64)[:, None]) ** 2 +
+                   (y[None, :] - np.asarray(focus_y, dtype=np.float64)[:, None]) ** 2).min(axis=0)
+    near = distance_sq <= radius * radius
+    if previous is not None:
+        outer = radius + hysteresis
+        near |= previous & (distance_sq <= outer * outer)
+    return near
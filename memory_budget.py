@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Memory Budgets
+Per-subsystem counters of live effects and cached surfaces, with hard caps the FX systems degrade against
+"""
+
+import json
+import os
+import tracemalloc
+
+MEMORY_BUDGETS_FILE = "memory_budgets.json"
+
+# Hard caps per subsystem (live objects or cached surfaces); memory_budgets.json overrides them
+DEFAULT_BUDGETS = {
+    "wind_vanes": 24,        # Live WindVanes
+    "vane_sprites": 72,      # Cached rotated vane surfaces
+    "wind_particles": 300,   # Live WindParticles
+    "particle_stamps": 48,   # Cached particle surfaces
+    "rain_drops": 400,       # Active rain streaks
+    "weather_overlays": 24   # Cached grading/fog overlays
+}
+
+SOFT_LIMIT = 0.75            # Fraction of a budget where effects start living shorter
+MIN_LIFETIME_SCALE = 0.4     # Lifetime multiplier at a full budget
+TRACE_FRAMES = 1             # Stack depth tracemalloc records (1 is enough to group by file)
+
+def surface_bytes(surface):
+    """Get the pixel memory of a pygame surface"""
+    return surface.get_pitch() * surface.get_height()
+
+class MemoryBudget:
+    """Live counts, cached surface sizes and hard caps, shared by the FX systems
+    
+    FX systems report how many objects they hold with set_count() and
+    which surfaces they cache with set_surfaces(). Before spawning they ask
+    room() how many more they may add, and scale new lifetimes by
+    lifetime_scale(), which starts shrinking once a subsystem passes
+    SOFT_LIMIT of its budget. A long storm therefore thins the effects out
+    instead of growing them without bound.
+    
+    With trace on, tracemalloc runs too, and snapshot() attributes Python
+    allocations to the module files that made them (roughly one per
+    subsystem). Tracing slows allocation down, so it is for debugging only.
+    """
+    
+    def __init__(self, budgets=None, trace=False):
+        """Initialize counters; trace starts tracemalloc"""
+        self.limits = dict(DEFAULT_BUDGETS)
+        self.limits.update(budgets or {})
+        self.counts = {}
+        self.peaks = {}
+        self.surfaces = {}  # Subsystem -> (surface count, bytes)
+        self.trace = trace
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+    
+    def load(self, filename=MEMORY_BUDGETS_FILE):
+        """Apply budget overrides from a JSON config file, if it exists"""
+        if not os.path.exists(filename):
+            return False
+        with open(filename, 'r') as f:
+            self.limits.update(json.load(f))
+        return True
+    
+    def limit(self, name):
+        """Get a subsystem's budget (None: unlimited)"""
+        return self.limits.get(name)
+    
+    def set_count(self, name, live):
+        """Record how many objects a subsystem holds right now"""
+        self.counts[name] = live
+        if live > self.peaks.get(name, 0):
+            self.peaks[name] = live
+    
+    def room(self, name):
+        """How many more objects a subsystem may add before it reaches its budget"""
+        limit = self.limits.get(name)
+        if limit is None:
+            return float("inf")
+        return max(0, limit - self.counts.get(name, 0))
+    
+    def allow(self, name, wanted):
+        """Clamp a spawn count to the room left"""
+        return int(min(wanted, self.room(name)))
+    
+    def lifetime_scale(self, name):
+        """Multiplier for new lifetimes: 1.0 up to SOFT_LIMIT, falling to MIN_LIFETIME_SCALE at the budget"""
+        limit = self.limits.get(name)
+        if not limit:
+            return 1.0
+        usage = self.counts.get(name, 0) / limit
+        if usage <= SOFT_LIMIT:
+            return 1.0
+        over = min(1.0, (usage - SOFT_LIMIT) / (1.0 - SOFT_LIMIT))
+        return 1.0 - over * (1.0 - MIN_LIFETIME_SCALE)
+    
+    def set_surfaces(self, name, surfaces):
+        """Record the surfaces a subsystem keeps cached (call when the cache changes)"""
+        surfaces = [surface for surface in surfaces if surface is not None]
+        self.surfaces[name] = (len(surfaces), sum(surface_bytes(surface) for surface in surfaces))
+        self.set_count(name, len(surfaces))
+    
+    def surface_total(self):
+        """Get the bytes held in tracked surfaces"""
+        return sum(size for _, size in self.surfaces.values())
+    
+    def snapshot(self, top=8):
+        """Get [(module file, bytes)] for the largest traced Python allocations (empty without trace)"""
+        if not tracemalloc.is_tracing():
+            return []
+        stats = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>")
+        )).statistics('filename')
+        return [(os.path.basename(stat.traceback[0].filename), stat.size) for stat in stats[:top]]
+    
+    def summary(self):
+        """Get a flat dict of counts, surface memory and (when tracing) traced memory"""
+        summary = {name: self.counts.get(name, 0) for name in sorted(set(self.limits) | set(self.counts))}
+        summary["surface_mib"] = round(self.surface_total() / (1024 * 1024), 2)
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            summary["traced_mib"] = round(current / (1024 * 1024), 2)
+            summary["traced_peak_mib"] = round(peak / (1024 * 1024), 2)
+        return summary
+    
+    def report(self):
+        """Get human-readable report lines"""
+        lines = []
+        for name in sorted(set(self.limits) | set(self.counts)):
+            limit = self.limits.get(name)
+            line = f"{name}: {self.counts.get(name, 0)}/{limit if limit is not None else '-'} (peak {self.peaks.get(name, 0)})"
+            if name in self.surfaces:
+                line += f", {self.surfaces[name][1] / 1024:.0f} KiB of surfaces"
+            lines.append(line)
+        for filename, size in self.snapshot():
+            lines.append(f"traced {filename}: {size / 1024:.0f} KiB")
+        return lines
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Network Client
+Connection to the multiplayer server with snapshot interpolation and input prediction
+"""
+
+import asyncio
+from collections import deque
+import math
+import time
+
+from net_protocol import (DEFAULT_HOST, DEFAULT_PORT, MSG_WELCOME, MSG_SNAPSHOT, MSG_STATUS, MSG_BYE,
+                          WELCOME, FIRE_PORT, FIRE_STARBOARD, SnapshotDecoder, read_message, frame,
+                          encode_hello, encode_input, encode_trade, decode_status)
+
+INTERPOLATION_TICKS = 2.0   # Remote ships are drawn this many ticks in the past
+PREDICT_TURN_RATE = 60.0    # Degrees per second the client assumes for its own rudder
+ERROR_DECAY = 10.0          # How fast (per second) prediction errors are smoothed out
+
+def lerp_angle(start, end, t):
+    """Interpolate between two headings in degrees along the shorter way round"""
+    return (start + ((end - start + 180.0) % 360.0 - 180.0) * t) % 360.0
+
+class NetworkClient:
+    """One captain's connection: sends inputs, receives and interpolates snapshots
+    
+    Remote ships are drawn INTERPOLATION_TICKS behind the newest snapshot,
+    blending the two snapshots around that time. The captain's own ship is
+    predicted: the latest server state is advanced by every input the
+    server has not applied yet, and any correction is smoothed out instead
+    of snapping.
+    """
+    
+    def __init__(self, name="Captain"):
+        """Initialize an unconnected client"""
+        self.name = name
+        self.reader = None
+        self.writer = None
+        self.ship = None
+        self.tick_rate = 30
+        self.world_size = (0.0, 0.0)
+        self.decoder = SnapshotDecoder()
+        self.snapshots = deque(maxlen=8)  # (server time, Snapshot)
+        self.clock_offset = None          # Local time minus server time
+        self.connected = False
+        
+        # Status from the server
+        self.gold = 0
+        self.cargo_total = 0
+        self.cargo_space = 0
+        self.messages = deque(maxlen=5)
+        
+        # Prediction
+        self.sequence = 0
+        self.pending = deque()  # (sequence, rudder, dt) not yet applied by the server
+        self.error = [0.0, 0.0]  # Display offset left over from the last correction
+        self.bytes_received = 0
+    
+    async def connect(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Connect, say hello and wait for the welcome"""
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(encode_hello(self.name))
+        message_type, payload = await read_message(self.reader)
+        if message_type != MSG_WELCOME:
+            raise ConnectionError("Server did not welcome us")
+        self.ship, self.tick_rate, width, height = WELCOME.unpack_from(payload)
+        self.world_size = (width, height)
+        self.connected = True
+    
+    async def receive(self):
+        """Read messages until the connection closes (run as a task)"""
+        handlers = {
+            MSG_SNAPSHOT: self.on_snapshot,
+            MSG_STATUS: self.on_status
+        }
+        try:
+            while True:
+                message_type, payload = await read_message(self.reader)
+                self.bytes_received += len(payload) + 5
+                if message_type == MSG_BYE:
+                    break
+                handler = handlers.get(message_type)
+                if handler is not None:
+                    handler(payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        self.connected = False
+    
+    def on_snapshot(self, payload):
+        """Decode a snapshot, track the server clock and drop acknowledged inputs"""
+        snapshot = self.decoder.decode(payload)
+        server_time = snapshot.tick / self.tick_rate
+        offset = time.perf_counter() - server_time
+        # The smallest offset seen is the one with the least network delay
+        if self.clock_offset is None or offset < self.clock_offset:
+            self.clock_offset = offset
+        else:
+            self.clock_offset += (offset - self.clock_offset) * 0.01
+        
+        # Where we showed the ship: the previous state plus every pending input
+        old = self.predicted_own(0.0)
+        self.snapshots.append((server_time, snapshot))
+        
+        # Inputs the server has applied are already in this state; whatever
+        # separates the two predictions is the misprediction, smoothed away
+        while self.pending and self.pending[0][0] <= snapshot.last_input:
+            self.pending.popleft()
+        new = self.predicted_own(0.0)
+        if old is not None and new is not None:
+            self.error[0] += old[0] - new[0]
+            self.error[1] += old[1] - new[1]
+    
+    def on_status(self, payload):
+        self.gold, self.cargo_total, self.cargo_space, message = decode_status(payload)
+        if message:
+            self.messages.append(message)
+    
+    def send_input(self, rudder, fire_port=False, fire_starboard=False, dt=0.0):
+        """Send this frame's controls and remember them for prediction"""
+        if not self.connected:
+            return
+        self.sequence += 1
+        fire = (FIRE_PORT if fire_port else 0) | (FIRE_STARBOARD if fire_starboard else 0)
+        self.writer.write(encode_input(self.sequence, rudder, fire))
+        self.pending.append((self.sequence, rudder, dt))
+    
+    def send_trade(self, port, commodity, quantity):
+        """Buy (quantity > 0) or sell (quantity < 0) at a port the ship is docked at"""
+        if self.connected:
+            self.writer.write(encode_trade(port, commodity, quantity))
+    
+    async def close(self):
+        """Say goodbye and close the connection"""
+        if self.writer is None:
+            return
+        try:
+            self.writer.write(frame(MSG_BYE))
+            self.writer.close()
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        self.connected = False
+    
+    @property
+    def latest(self):
+        return self.snapshots[-1][1] if self.snapshots else None
+    
+    def predicted_own(self, dt):
+        """Get (x, y, heading) of our ship: server state plus unacknowledged inputs
+        
+        dt decays the smoothing offset left by corrections; pass 0 to peek.
+        """
+        snapshot = self.latest
+        if snapshot is None or self.ship not in snapshot.entities:
+            return None
+        x, y, heading, speed = snapshot.entities[self.ship][:4]
+        for _, rudder, step in self.pending:
+            heading = (heading + rudder * PREDICT_TURN_RATE * step) % 360.0
+            radians = math.radians(heading)
+            x += math.sin(radians) * speed * step
+            y -= math.cos(radians) * speed * step
+        
+        decay = math.exp(-ERROR_DECAY * dt)
+        self.error[0] *= decay
+        self.error[1] *= decay
+        return (x + self.error[0], y + self.error[1], heading)
+    
+    def interpolated(self):
+        """Get {id: (x, y, heading, hull, team)} for the other ships at the render time"""
+        if not self.snapshots or self.clock_offset is None:
+            return {}
+        render_time = time.perf_counter() - self.clock_offset - INTERPOLATION_TICKS / self.tick_rate
+        
+        # Find the snapshots either side of the render time
+        before = after = self.snapshots[-1]
+        for entry in reversed(self.snapshots):
+            if entry[0] <= render_time:
+                before = entry
+                break
+            after = entry
+        span = after[0] - before[0]
+        t = 0.0 if span <= 0 else min(1.0, (render_time - before[0]) / span)
+        
+        ships = {}
+        start = before[1].entities
+        for entity, state in after[1].entities.items():
+            if entity == self.ship:
+                continue
+            previous = start.get(entity, state)
+            ships[entity] = (previous[0] + (state[0] - previous[0]) * t,
+                             previous[1] + (state[1] - previous[1]) * t,
+                             lerp_angle(previous[2], state[2], t),
+                             state[4], state[6])
+        return ships
+
+async def run_bot(name, host, port, duration, rng):
+    """Headless captain for load tests: random rudder and guns at the tick rate"""
+    client = NetworkClient(name)
+    await client.connect(host, port)
+    receiver = asyncio.create_task(client.receive())
+    dt = 1.0 / client.tick_rate
+    rudder = 0
+    end = time.perf_counter() + duration
+    while client.connected and time.perf_counter() < end:
+        if rng.random() < 0.05:
+            rudder = rng.choice((-1, 0, 1))
+        client.send_input(rudder, rng.random() < 0.02, rng.random() < 0.02, dt)
+        client.predicted_own(dt)
+        client.interpolated()
+        await asyncio.sleep(dt)
+    await client.close()
+    receiver.cancel()
+    return client.bytes_received
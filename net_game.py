@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Multiplayer Client
+Pygame front end that sails a ship on a multiplayer server
+"""
+
+import argparse
+import asyncio
+import math
+import time
+
+import pygame
+
+from catalog import Catalog
+from input_bindings import InputMap, CommandDispatcher
+from net_client import NetworkClient
+from net_protocol import DEFAULT_HOST, DEFAULT_PORT, DOCK_RANGE
+from spatial_index import Camera
+from fonts import LazyFont
+from display import SCREEN_WIDTH, SCREEN_HEIGHT, create_window
+
+FPS = 60
+
+class MultiplayerGame:
+    """Draws the server's world around our predicted ship and sends our controls"""
+    
+    def __init__(self, client):
+        """Initialize display and controls for a connected client"""
+        self.client = client
+        self.screen = create_window(f"Privateers Legacy - {client.name}")
+        self.running = True
+        self.fire_pressed = False
+        
+        self.catalog = Catalog.load()
+        self.commodity = 0
+        self.near_port = None
+        width, height = client.world_size
+        self.camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT, int(width), int(height))
+        
+        # Colors
+        self.colors = {
+            'ocean': (0, 119, 190),
+            'island': (34, 139, 34),
+            'own': (139, 69, 19),
+            'captain': (70, 90, 200),
+            'enemy': (200, 40, 40),
+            'shot': (40, 40, 40),
+            'text': (255, 255, 255),
+            'gold': (255, 215, 0)
+        }
+        self.font = LazyFont(24)
+        
+        self.input_map = InputMap(pygame.key.key_code)
+        self.input_map.load()
+        self.dispatcher = CommandDispatcher(self.input_map)
+        self.dispatcher.register_all("sailing", {
+            "quit": self.quit,
+            "fire": self.fire
+        })
+        self.dispatcher.register_all("dock_trade", {
+            "menu_up": lambda: self.select_commodity(-1),
+            "menu_down": lambda: self.select_commodity(1),
+            "buy": lambda: self.trade(1),
+            "sell": lambda: self.trade(-1)
+        })
+    
+    def quit(self):
+        self.running = False
+    
+    def fire(self):
+        """Fire both broadsides on the next input"""
+        self.fire_pressed = True
+    
+    def select_commodity(self, step):
+        self.commodity = (self.commodity + step) % self.catalog.commodity_count
+    
+    def trade(self, quantity):
+        if self.near_port is not None:
+            self.client.send_trade(self.near_port, self.commodity, quantity)
+    
+    def handle_events(self):
+        """Dispatch keys: trading keys in port, sailing keys everywhere"""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if self.near_port is not None and self.dispatcher.input_map.lookup("dock_trade", event.key):
+                    self.dispatcher.handle_key("dock_trade", event.key)
+                else:
+                    self.dispatcher.handle_key("sailing", event.key)
+    
+    def send_controls(self, dt):
+        """Send the rudder and guns for this frame"""
+        keys = pygame.key.get_pressed()
+        rudder = 0
+        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            rudder = -1
+        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            rudder = 1
+        self.client.send_input(rudder, self.fire_pressed, self.fire_pressed, dt)
+        self.fire_pressed = False
+    
+    def draw_ship(self, x, y, heading, color, offset):
+        """Draw a ship as a hull rectangle with a heading line"""
+        screen_x = x + offset[0]
+        screen_y = y + offset[1]
+        pygame.draw.rect(self.screen, color, (screen_x - 12, screen_y - 8, 24, 16))
+        radians = math.radians(heading)
+        pygame.draw.line(self.screen, self.colors['text'], (screen_x, screen_y),
+                         (screen_x + math.sin(radians) * 20, screen_y - math.cos(radians) * 20), 2)
+    
+    def draw(self, dt):
+        """Draw the world around our ship and the HUD"""
+        own = self.client.predicted_own(dt)
+        if own is not None:
+            self.camera.follow(own[0], own[1])
+        offset = self.camera.offset
+        self.screen.fill(self.colors['ocean'])
+        
+        # Ports
+        self.near_port = None
+        for port, (x, y) in enumerate(self.catalog.port_positions):
+            pygame.draw.rect(self.screen, self.colors['island'], (x - 30 + offset[0], y - 20 + offset[1], 60, 40))
+            if own is not None and math.hypot(own[0] - x, own[1] - y) <= DOCK_RANGE:
+                self.near_port = port
+        
+        # Other ships, interpolated between snapshots
+        for x, y, heading, hull, team in self.client.interpolated().values():
+            self.draw_ship(x, y, heading, self.colors['enemy'] if team else self.colors['captain'], offset)
+        snapshot = self.client.latest
+        if snapshot is not None:
+            for x, y in snapshot.shots.tolist():
+                pygame.draw.circle(self.screen, self.colors['shot'], (x + offset[0], y + offset[1]), 3)
+        if own is not None:
+            self.draw_ship(own[0], own[1], own[2], self.colors['own'], offset)
+        
+        # HUD
+        client = self.client
+        lines = [(f"Gold: {client.gold}  Cargo: {client.cargo_total}/{client.cargo_space}", self.colors['gold'])]
+        if snapshot is not None and client.ship in snapshot.entities:
+            lines.append((f"Hull: {snapshot.entities[client.ship][4]:.0f}", self.colors['text']))
+            lines.append((f"Wind: {snapshot.wind_speed:.1f} knots from {snapshot.wind_direction:.0f}°", self.colors['text']))
+        if self.near_port is not None:
+            commodity = self.catalog.commodity_names[self.commodity]
+            lines.append((f"In port: Up/Down choose, B buys, S sells one {commodity}", self.colors['text']))
+        lines.extend((message, self.colors['text']) for message in client.messages)
+        for i, (line, color) in enumerate(lines):
+            self.screen.blit(self.font.render(line, True, color), (10, 10 + i * 22))
+        
+        pygame.display.flip()
+    
+    async def run(self):
+        """Frame loop; yields to the network between frames"""
+        receiver = asyncio.create_task(self.client.receive())
+        frame_time = 1.0 / FPS
+        last = time.perf_counter()
+        while self.running and self.client.connected:
+            now = time.perf_counter()
+            dt = now - last
+            last = now
+            self.handle_events()
+            self.send_controls(dt)
+            self.draw(dt)
+            await asyncio.sleep(max(0.0, frame_time - (time.perf_counter() - now)))
+        await self.client.close()
+        receiver.cancel()
+
+async def play(host, port, name):
+    client = NetworkClient(name)
+    await client.connect(host, port)
+    await MultiplayerGame(client).run()
+
+def main():
+    """Join a multiplayer server"""
+    parser = argparse.ArgumentParser(description="Privateers Legacy multiplayer client")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="server address")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="server TCP port")
+    parser.add_argument("--name", default="Captain", help="your captain's name")
+    args = parser.parse_args()
+    
+    pygame.init()
+    try:
+        asyncio.run(play(args.host, args.port, args.name))
+    finally:
+        pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Network Protocol
+Message framing and delta-compressed world snapshots for the multiplayer server
+"""
+
+import struct
+
+import numpy as np
+
+PROTOCOL_VERSION = 1
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+TICK_RATE = 30  # Server simulation and snapshot rate (Hz)
+DOCK_RANGE = 80.0  # Same docking range as the single-player game; clients use it to offer trading
+
+# Message types
+MSG_HELLO = 1     # Client -> server: protocol version, captain name
+MSG_WELCOME = 2   # Server -> client: the captain's ship id, tick rate, world size
+MSG_INPUT = 3     # Client -> server: input sequence number, rudder, fire buttons
+MSG_SNAPSHOT = 4  # Server -> client: delta-compressed world state
+MSG_TRADE = 5     # Client -> server: buy (quantity > 0) or sell (< 0) at a port
+MSG_STATUS = 6    # Server -> client: gold, cargo and a message for the captain
+MSG_BYE = 7       # Either way: closing the connection
+
+# Fire buttons in MSG_INPUT
+FIRE_PORT = 1
+FIRE_STARBOARD = 2
+
+# Every message is a little-endian uint32 length (of type + payload) and a uint8 type
+FRAME_HEADER = struct.Struct("<IB")
+MAX_FRAME_BYTES = 1024 * 1024   # Longest frame a reader accepts (snapshots stay far below this)
+MAX_CLIENT_FRAME_BYTES = 256    # Longest frame the server accepts from a captain (hello, input, trade)
+HELLO = struct.Struct("<H")             # Version; the name follows as UTF-8
+WELCOME = struct.Struct("<HHff")        # Ship id, tick rate, world width, world height
+INPUT = struct.Struct("<Ibb")           # Sequence, rudder (-1, 0, 1), fire buttons
+TRADE = struct.Struct("<Hhi")           # Port, commodity, quantity
+STATUS = struct.Struct("<iHH")          # Gold, cargo total, cargo space; message text follows
+SNAPSHOT_HEADER = struct.Struct("<IIff")  # Tick, last input applied, wind direction, wind speed
+COUNT = struct.Struct("<H")
+
+# Entity fields as sent on the wire: (name, wire dtype, quantization scale)
+# Positions are in eighths of a world unit, headings in 1/65536 of a turn
+ENTITY_FIELDS = (
+    ("x", "<i4", 8.0),
+    ("y", "<i4", 8.0),
+    ("heading", "<u2", 65536.0 / 360.0),
+    ("speed", "<i2", 100.0),
+    ("hull", "u1", 1.0),
+    ("sails", "u1", 1.0),
+    ("team", "u1", 1.0),
+)
+FIELD_COUNT = len(ENTITY_FIELDS)
+FIELD_INDEX = {name: index for index, (name, _, _) in enumerate(ENTITY_FIELDS)}
+
+class ProtocolError(ConnectionError):
+    """A frame or payload from the other end that breaks the protocol"""
+
+def frame(message_type, payload=b""):
+    """Wrap a payload into a framed message"""
+    return FRAME_HEADER.pack(len(payload) + 1, message_type) + payload
+
+async def read_message(reader, max_length=MAX_FRAME_BYTES):
+    """Read one framed message from an asyncio stream; returns (type, payload)
+    
+    The length comes from the other end, so a frame with no type byte or
+    longer than max_length raises ProtocolError before anything is
+    buffered for it.
+    """
+    header = await reader.readexactly(4)
+    length = struct.unpack("<I", header)[0]
+    if length == 0 or length > max_length:
+        raise ProtocolError(f"bad frame length {length}")
+    body = await reader.readexactly(length)
+    return body[0], body[1:]
+
+def quantize(x, y, heading, speed, hull, sails, team):
+    """Quantize per-entity arrays into an (n, FIELD_COUNT) int64 table for delta encoding"""
+    table = np.empty((len(x), FIELD_COUNT), dtype=np.int64)
+    for index, values in enumerate((x, y, heading % 360.0, speed, hull, sails, team)):
+        scale = ENTITY_FIELDS[index][2]
+        table[:, index] = np.rint(np.asarray(values, dtype=np.float64) * scale)
+    table[:, FIELD_INDEX["heading"]] %= 65536
+    return table
+
+class SnapshotEncoder:
+    """Per-client delta encoder
+    
+    Remembers, per entity id, the quantized state last sent to this client.
+    A snapshot carries the ids that left the client's interest set, then one
+    column per field listing only the entities whose value in that field
+    changed. Entities entering interest are sent in full. Columns are
+    packed straight from numpy arrays, so encoding cost does not grow with a
+    per-entity Python loop. The connection is TCP, so every snapshot is
+    delivered and the baseline is simply the last one sent.
+    """
+    
+    def __init__(self, capacity=64):
+        """Initialize an encoder with nothing sent yet"""
+        self.sent = np.zeros((capacity, FIELD_COUNT), dtype=np.int64)
+        self.known = np.zeros(capacity, dtype=bool)
+    
+    def _reserve(self, count):
+        capacity = len(self.known)
+        if count <= capacity:
+            return
+        new_capacity = max(capacity * 2, count)
+        sent = np.zeros((new_capacity, FIELD_COUNT), dtype=np.int64)
+        sent[:capacity] = self.sent
+        known = np.zeros(new_capacity, dtype=bool)
+        known[:capacity] = self.known
+        self.sent, self.known = sent, known
+    
+    def encode(self, tick, last_input, wind_direction, wind_speed, table, visible, shots=None):
+        """Build a snapshot payload
+        
+        table is the quantize() output for every entity id, visible the ids
+        inside this client's interest set, and shots an optional (n, 2)
+        array of cannonball positions near the client.
+        """
+        self._reserve(len(table))
+        visible = np.asarray(visible, dtype=np.int64)
+        in_view = np.zeros(len(self.known), dtype=bool)
+        in_view[visible] = True
+        
+        removed = np.flatnonzero(self.known & ~in_view)
+        entering = visible[~self.known[visible]]
+        staying = visible[self.known[visible]]
+        
+        parts = [SNAPSHOT_HEADER.pack(tick, last_input, wind_direction, wind_speed),
+                 COUNT.pack(len(removed)), removed.astype("<u2").tobytes()]
+        
+        changed = table[staying] != self.sent[staying]
+        for index, (_, dtype, _) in enumerate(ENTITY_FIELDS):
+            ids = np.concatenate((entering, staying[changed[:, index]]))
+            parts.append(COUNT.pack(len(ids)))
+            parts.append(ids.astype("<u2").tobytes())
+            parts.append(table[ids, index].astype(dtype).tobytes())
+        
+        if shots is None:
+            shots = np.zeros((0, 2))
+        parts.append(COUNT.pack(len(shots)))
+        parts.append(np.rint(shots).astype("<i2").tobytes())
+        
+        self.sent[visible] = table[visible]
+        self.known[removed] = False
+        self.known[visible] = True
+        return b"".join(parts)
+
+class Snapshot:
+    """A decoded snapshot: header values plus the state of every known entity"""
+    
+    __slots__ = ('tick', 'last_input', 'wind_direction', 'wind_speed', 'entities', 'shots')
+    
+    def __init__(self, tick, last_input, wind_direction, wind_speed, entities, shots):
+        self.tick = tick
+        self.last_input = last_input
+        self.wind_direction = wind_direction
+        self.wind_speed = wind_speed
+        self.entities = entities  # id -> (x, y, heading, speed, hull, sails, team) in world units
+        self.shots = shots        # (n, 2) cannonball positions
+
+class SnapshotDecoder:
+    """Client-side mirror of SnapshotEncoder: applies deltas to the known world"""
+    
+    def __init__(self):
+        """Initialize an empty world"""
+        self.state = {}  # id -> list of quantized field values
+    
+    def decode(self, payload):
+        """Apply one snapshot payload; returns a Snapshot of the updated world"""
+        tick, last_input, wind_direction, wind_speed = SNAPSHOT_HEADER.unpack_from(payload, 0)
+        offset = SNAPSHOT_HEADER.size
+        
+        count = COUNT.unpack_from(payload, offset)[0]
+        offset += COUNT.size
+        for entity in np.frombuffer(payload, "<u2", count, offset).tolist():
+            self.state.pop(entity, None)
+        offset += count * 2
+        
+        for index, (_, dtype, _) in enumerate(ENTITY_FIELDS):
+            count = COUNT.unpack_from(payload, offset)[0]
+            offset += COUNT.size
+            ids = np.frombuffer(payload, "<u2", count, offset).tolist()
+            offset += count * 2
+            values = np.frombuffer(payload, dtype, count, offset)
+            offset += values.nbytes
+            for entity, value in zip(ids, values.tolist()):
+                fields = self.state.get(entity)
+                if fields is None:
+                    fields = self.state[entity] = [0] * FIELD_COUNT
+                fields[index] = value
+        
+        count = COUNT.unpack_from(payload, offset)[0]
+        offset += COUNT.size
+        shots = np.frombuffer(payload, "<i2", count * 2, offset).reshape(count, 2)
+        
+        scales = [scale for _, _, scale in ENTITY_FIELDS]
+        entities = {entity: tuple(value / scale for value, scale in zip(fields, scales))
+                    for entity, fields in self.state.items()}
+        return Snapshot(tick, last_input, wind_direction, wind_speed, entities, shots)
+
+def encode_hello(name):
+    return frame(MSG_HELLO, HELLO.pack(PROTOCOL_VERSION) + name.encode("utf-8")[:64])
+
+def decode_hello(payload):
+    """Get (version, name)"""
+    version = HELLO.unpack_from(payload)[0]
+    return version, payload[HELLO.size:].decode("utf-8", "replace")
+
+def encode_welcome(ship, tick_rate, world_width, world_height):
+    return frame(MSG_WELCOME, WELCOME.pack(ship, tick_rate, world_width, world_height))
+
+def encode_input(sequence, rudder, fire):
+    return frame(MSG_INPUT, INPUT.pack(sequence, rudder, fire))
+
+def encode_trade(port, commodity, quantity):
+    return frame(MSG_TRADE, TRADE.pack(port, commodity, quantity))
+
+def encode_status(gold, cargo_total, cargo_space, message=""):
+    return frame(MSG_STATUS, STATUS.pack(gold, cargo_total, cargo_space) + message.encode("utf-8"))
+
+def decode_status(payload):
+    """Get (gold, cargo total, cargo space, message)"""
+    gold, cargo_total, cargo_space = STATUS.unpack_from(payload)
+    return gold, cargo_total, cargo_space, payload[STATUS.size:].decode("utf-8", "replace")
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Multiplayer Server
+Authoritative asyncio server that simulates the world and streams snapshots to captains
+
+This is also the dedicated-server entry point: it imports only the pure
+logic modules (never pygame, fonts or the renderers), so it starts fast,
+stays small and many worlds can share one host.
+"""
+
+import time
+IMPORT_STARTED = time.perf_counter()
+
+import argparse
+import asyncio
+import math
+import random
+import struct
+import sys
+
+try:
+    import resource  # Unix only; used for the memory report
+except ImportError:
+    resource = None
+
+import numpy as np
+
+from catalog import Catalog, Market
+from combat import CombatEngine, SIDE_PORT, SIDE_STARBOARD
+from player_state import PlayerState
+from sailing_engine import SailingEngine, WindSystem
+from weather import WeatherSystem, WeatherWind
+from interest import FAR_INTERVAL, near_mask
+from net_protocol import (DEFAULT_HOST, DEFAULT_PORT, TICK_RATE, PROTOCOL_VERSION, DOCK_RANGE,
+                          MAX_CLIENT_FRAME_BYTES, MSG_HELLO, MSG_INPUT, MSG_SNAPSHOT, MSG_TRADE, MSG_BYE,
+                          INPUT, TRADE, FIRE_PORT, FIRE_STARBOARD, ProtocolError, SnapshotEncoder,
+                          read_message, frame, quantize, decode_hello, encode_welcome, encode_status)
+import trading
+
+WORLD_WIDTH = 2400.0
+WORLD_HEIGHT = 1800.0
+INTEREST_RADIUS = 600.0        # Captains are sent ships and cannonballs within this range
+AI_SHIPS = 8                   # Hostile patrols kept at sea
+AI_SPEED = 40.0                # World units per second
+RESPAWN_TIME = 5.0             # Seconds before a sunk ship returns
+MAX_WRITE_BUFFER = 64 * 1024   # Snapshots are skipped for clients this far behind
+GAME_HOURS_PER_SECOND = 0.2    # Same clock as the enhanced game
+
+class Captain:
+    """A connected player: their ship, latest inputs and snapshot encoder"""
+    
+    def __init__(self, name, ship, writer, player):
+        """Initialize captain"""
+        self.name = name
+        self.ship = ship          # Ship id in the combat engine (also the entity id on the wire)
+        self.writer = writer
+        self.player = player
+        self.sailing = SailingEngine()
+        self.speed_factor = player.speed_factor
+        self.encoder = SnapshotEncoder()
+        self.rudder = 0
+        self.fire = 0
+        self.last_input = 0       # Sequence number of the newest input applied
+
+class GameServer:
+    """Authoritative world: captains, AI patrols, wind and weather, markets and combat
+    
+    Every ship lives in one CombatEngine, so guns, damage and movement for
+    the whole world are batched numpy work. Captains steer through their
+    own SailingEngine; patrols use the engine's steering AI. Each tick the
+    world is quantized once, and each captain gets a delta snapshot of just
+    the ships and cannonballs within INTEREST_RADIUS.
+    """
+    
+    def __init__(self, tick_rate=TICK_RATE, interest_radius=INTEREST_RADIUS, ai_ships=AI_SHIPS, seed=None):
+        """Initialize the world"""
+        self.tick_rate = tick_rate
+        self.interest_radius = interest_radius
+        self.rng = random.Random(seed)
+        self.running = True
+        
+        self.catalog = Catalog.load()
+        self.market = Market(self.catalog, self.rng)
+        self.wind_system = WindSystem()
+        self.weather = WeatherSystem(seed)
+        self.wind = WeatherWind(self.wind_system, self.weather)
+        self.game_hours = 0.0
+        
+        self.combat = CombatEngine(seed)
+        self.captains = {}     # Ship id -> Captain
+        self.free_ships = []   # Ship ids left by departed captains
+        self.ai_ships = []
+        self.sunk_at = {}      # Ship id -> time it sank
+        self.time = 0.0
+        self.tick_count = 0
+        
+        # Tick timing for the load test
+        self.tick_total = 0.0
+        self.tick_worst = 0.0
+        self.bytes_sent = 0
+        
+        for _ in range(ai_ships):
+            x, y = self._random_position()
+            ship = self.combat.add_ship(x, y, self.rng.uniform(0, 360), team=1, speed=AI_SPEED,
+                                        radius=13, crew=12, guns=6)
+            self.ai_ships.append(ship)
+        self.ai_ids = np.array(self.ai_ships, dtype=np.int64)
+        self.ai_near = np.zeros(len(self.ai_ships), dtype=bool)  # Patrols within interest of a captain
+        self.far_timer = 0.0
+        
+        self.message_handlers = {
+            MSG_INPUT: self.handle_input,
+            MSG_TRADE: self.handle_trade
+        }
+    
+    def _random_position(self):
+        return (self.rng.uniform(100, WORLD_WIDTH - 100), self.rng.uniform(100, WORLD_HEIGHT - 100))
+    
+    def _reset_ship(self, ship, hull=100.0, crew=30):
+        """Put a ship back to sea at a random spot with full hull and sails"""
+        combat = self.combat
+        combat.x[ship], combat.y[ship] = self._random_position()
+        combat.heading[ship] = self.rng.uniform(0, 360)
+        combat.hull[ship] = hull
+        combat.sails[ship] = 100.0
+        combat.crew[ship] = crew
+        combat.reload[ship] = 0.0
+        combat.alive[ship] = True
+        self.sunk_at.pop(ship, None)
+    
+    def join(self, name, writer):
+        """Add a captain and give them a ship"""
+        if self.free_ships:
+            ship = self.free_ships.pop()
+        else:
+            ship = self.combat.add_ship(0.0, 0.0, team=0)
+        self._reset_ship(ship)
+        player = PlayerState(self.catalog.commodity_count, name or "Captain")
+        captain = Captain(name, ship, writer, player)
+        self.captains[ship] = captain
+        self.refresh_crew(captain)
+        print(f"{name} joined ({len(self.captains)} captains)")
+        return captain
+    
+    def refresh_crew(self, captain):
+        """Update a captain's sailing speed and gunnery from their crew (call after it changes)"""
+        captain.speed_factor = captain.player.speed_factor
+        self.combat.gunnery[captain.ship] = captain.player.combat_factor
+    
+    def leave(self, captain):
+        """Remove a captain; their ship id is reused by the next to join"""
+        self.combat.alive[captain.ship] = False
+        self.combat.speed[captain.ship] = 0.0
+        del self.captains[captain.ship]
+        self.sunk_at.pop(captain.ship, None)
+        self.free_ships.append(captain.ship)
+        print(f"{captain.name} left ({len(self.captains)} captains)")
+    
+    def handle_input(self, captain, payload):
+        """Take the newest rudder and gun orders (older inputs are ignored)"""
+        sequence, rudder, fire = INPUT.unpack_from(payload)
+        if sequence > captain.last_input:
+            captain.last_input = sequence
+            captain.rudder = max(-1, min(1, rudder))
+            captain.fire |= fire
+    
+    def handle_trade(self, captain, payload):
+        """Trade at a port within docking range, with the same rules as the dock menu"""
+        port, commodity, quantity = TRADE.unpack_from(payload)
+        player = captain.player
+        message = ""
+        if port >= self.catalog.port_count or not 0 <= commodity < self.catalog.commodity_count:
+            message = "No such port or commodity!"
+        else:
+            port_x, port_y = self.catalog.port_positions[port]
+            ship = captain.ship
+            if math.hypot(self.combat.x[ship] - port_x, self.combat.y[ship] - port_y) > DOCK_RANGE:
+                message = "Too far from port to trade!"
+            else:
+                buys = [(commodity, quantity)] if quantity > 0 else []
+                sells = [(commodity, -quantity)] if quantity < 0 else []
+                result = trading.execute_trades(self.market, port, player, buys, sells)
+                message = result.error or f"Traded {abs(quantity)} {self.catalog.commodity_names[commodity]}"
+        captain.writer.write(encode_status(player.gold, player.cargo_total, player.max_cargo, message))
+    
+    def step(self, dt):
+        """Advance the whole world one tick"""
+        self.time += dt
+        self.tick_count += 1
+        self.game_hours += dt * GAME_HOURS_PER_SECOND
+        self.weather.update(self.game_hours)
+        self.wind_system.update(dt)
+        combat = self.combat
+        
+        # Captains sail with their own engines and fire on command
+        for captain in self.captains.values():
+            ship = captain.ship
+            if not combat.alive[ship]:
+                captain.fire = 0
+                continue
+            sailing_data = captain.sailing.update_ship_physics(dt, combat.heading[ship], self.wind, captain.rudder)
+            heading = sailing_data['new_heading']
+            speed = sailing_data['current_speed'] * captain.speed_factor
+            dx, dy = captain.sailing.calculate_movement(speed, heading, 1.0)
+            combat.heading[ship] = heading
+            combat.speed[ship] = math.hypot(dx, dy)
+            if captain.fire & FIRE_PORT:
+                combat.fire(ship, SIDE_PORT)
+            if captain.fire & FIRE_STARBOARD:
+                combat.fire(ship, SIDE_STARBOARD)
+            captain.fire = 0
+        
+        # Patrols near a captain hunt them; the rest sail on and only get a coarse course check
+        ai = self.ai_ids
+        ships = list(self.captains)
+        self.ai_near = near_mask(combat.x[ai], combat.y[ai], combat.x[ships], combat.y[ships],
+                                 self.interest_radius, previous=self.ai_near)
+        near = ai[self.ai_near]
+        combat.steer(dt, near)
+        combat.auto_fire(near)
+        self.far_timer += dt
+        if self.far_timer >= FAR_INTERVAL:
+            self.far_timer = 0.0
+            self._steer_far(ai[~self.ai_near])
+        combat.step(dt)
+        n = combat.count
+        np.clip(combat.x[:n], 0.0, WORLD_WIDTH, out=combat.x[:n])
+        np.clip(combat.y[:n], 0.0, WORLD_HEIGHT, out=combat.y[:n])
+        
+        # Sunk ships return after a while
+        for ship in np.flatnonzero(~combat.alive[:n]).tolist():
+            if ship in self.free_ships:
+                continue
+            sunk_at = self.sunk_at.setdefault(ship, self.time)
+            if self.time - sunk_at >= RESPAWN_TIME:
+                self._reset_ship(ship, crew=12 if ship not in self.captains else 30)
+    
+    def _steer_far(self, ships):
+        """Coarse patrol for ships no captain is near: hold course, turning back from the world edge"""
+        combat = self.combat
+        x = combat.x[ships]
+        y = combat.y[ships]
+        edge = (x < 100) | (x > WORLD_WIDTH - 100) | (y < 100) | (y > WORLD_HEIGHT - 100)
+        bearing = np.degrees(np.arctan2(WORLD_WIDTH / 2 - x[edge], y[edge] - WORLD_HEIGHT / 2))
+        combat.heading[ships[edge]] = bearing % 360.0
+    
+    def broadcast(self):
+        """Send every captain a delta snapshot of what is near them"""
+        if not self.captains:
+            return
+        combat = self.combat
+        n = combat.count
+        table = quantize(combat.x[:n], combat.y[:n], combat.heading[:n], combat.speed[:n],
+                         combat.hull[:n], combat.sails[:n], combat.team[:n])
+        
+        # Interest: one distance matrix from every captain to every live ship and ball
+        captains = list(self.captains.values())
+        ships = np.array([captain.ship for captain in captains])
+        focus_x = combat.x[ships][:, None]
+        focus_y = combat.y[ships][:, None]
+        radius_sq = self.interest_radius * self.interest_radius
+        
+        live = np.flatnonzero(combat.alive[:n])
+        near = (combat.x[live] - focus_x) ** 2 + (combat.y[live] - focus_y) ** 2 <= radius_sq
+        
+        shots = combat.shots
+        balls = np.flatnonzero(shots.active)
+        ball_xy = np.stack((shots.x[balls], shots.y[balls]), axis=1)
+        near_balls = (ball_xy[:, 0] - focus_x) ** 2 + (ball_xy[:, 1] - focus_y) ** 2 <= radius_sq
+        
+        wind_direction = float(self.wind.true_wind_direction)
+        wind_speed = float(self.wind.true_wind_speed)
+        for row, captain in enumerate(captains):
+            transport = captain.writer.transport
+            if transport.is_closing() or transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                continue  # Slow client: the next snapshot carries the changes instead
+            payload = captain.encoder.encode(self.tick_count, captain.last_input, wind_direction, wind_speed,
+                                             table, live[near[row]], ball_xy[near_balls[row]])
+            message = frame(MSG_SNAPSHOT, payload)
+            captain.writer.write(message)
+            self.bytes_sent += len(message)
+    
+    async def handle_client(self, reader, writer):
+        """Serve one connection from hello to goodbye"""
+        captain = None
+        try:
+            message_type, payload = await read_message(reader, MAX_CLIENT_FRAME_BYTES)
+            if message_type != MSG_HELLO:
+                return
+            version, name = decode_hello(payload)
+            if version != PROTOCOL_VERSION:
+                return
+            captain = self.join(name, writer)
+            writer.write(encode_welcome(captain.ship, self.tick_rate, WORLD_WIDTH, WORLD_HEIGHT))
+            player = captain.player
+            writer.write(encode_status(player.gold, player.cargo_total, player.max_cargo, f"Welcome aboard, {name}!"))
+            
+            while True:
+                message_type, payload = await read_message(reader, MAX_CLIENT_FRAME_BYTES)
+                if message_type == MSG_BYE:
+                    break
+                handler = self.message_handlers.get(message_type)
+                if handler is not None:
+                    handler(captain, payload)
+        except (ProtocolError, struct.error) as error:
+            # Bad frame lengths and short payloads drop the client, not the server
+            print(f"Dropped {captain.name if captain is not None else 'a connection'}: {error}")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if captain is not None:
+                self.leave(captain)
+            writer.close()
+    
+    async def run(self, host=DEFAULT_HOST, port=DEFAULT_PORT, duration=None):
+        """Accept captains and tick at a fixed rate until stopped (or duration seconds pass)"""
+        server = await asyncio.start_server(self.handle_client, host, port)
+        loop = asyncio.get_running_loop()
+        dt = 1.0 / self.tick_rate
+        started = loop.time()
+        next_tick = started
+        
+        async with server:
+            while self.running and (duration is None or loop.time() - started < duration):
+                tick_started = time.perf_counter()
+                self.step(dt)
+                self.broadcast()
+                elapsed = time.perf_counter() - tick_started
+                self.tick_total += elapsed
+                self.tick_worst = max(self.tick_worst, elapsed)
+                
+                # Fixed rate; if we fall behind, drop the backlog rather than spiral
+                next_tick += dt
+                delay = next_tick - loop.time()
+                if delay < 0:
+                    next_tick = loop.time()
+                await asyncio.sleep(max(0.0, delay))
+
+async def load_test(server, host, port, bots, duration):
+    """Run the server and a crowd of bot captains over loopback in one process"""
+    from net_client import run_bot
+    
+    rng = random.Random(0)
+    server_task = asyncio.create_task(server.run(host, port, duration + 1.0))
+    await asyncio.sleep(0.2)
+    received = await asyncio.gather(*(run_bot(f"Bot {i}", host, port, duration, rng) for i in range(bots)))
+    await server_task
+    
+    ticks = max(1, server.tick_count)
+    print(f"{bots} captains, {server.tick_count} ticks at {server.tick_rate} Hz")
+    print(f"Server tick: {server.tick_total / ticks * 1000:.2f} ms average, {server.tick_worst * 1000:.2f} ms worst "
+          f"(budget {1000 / server.tick_rate:.1f} ms)")
+    print(f"Snapshots: {server.bytes_sent / ticks / max(1, bots):.0f} bytes per captain per tick, "
+          f"{sum(received) / max(1, bots) / duration / 1024:.1f} KiB/s per captain")
+
+def peak_memory_mib():
+    """Peak resident memory of this process in MiB, or None where it cannot be read"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def startup_report(servers, started):
+    """Describe how long the worlds took to start and how much memory they hold"""
+    memory = peak_memory_mib()
+    report = (f"{len(servers)} world(s) ready in {(time.perf_counter() - started) * 1000:.0f} ms "
+              f"(imports {(started - IMPORT_STARTED) * 1000:.0f} ms)")
+    if memory is not None:
+        report += f", peak memory {memory:.1f} MiB"
+    if "pygame" in sys.modules:
+        report += " - warning: pygame was imported"
+    return report
+
+async def run_worlds(servers, host, port):
+    """Run independent worlds side by side on consecutive ports"""
+    await asyncio.gather(*(server.run(host, port + i) for i, server in enumerate(servers)))
+
+def main():
+    """Run a dedicated server, or a loopback load test with --bots"""
+    parser = argparse.ArgumentParser(description="Privateers Legacy multiplayer server")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="simulation and snapshot rate (Hz)")
+    parser.add_argument("--seed", type=int, default=None, help="world seed")
+    parser.add_argument("--instances", type=int, default=1,
+                        help="independent worlds to run in this process, on consecutive ports")
+    parser.add_argument("--bots", type=int, default=0, help="run a load test with this many bot captains")
+    parser.add_argument("--duration", type=float, default=10.0, help="load test length in seconds")
+    args = parser.parse_args()
+    
+    started = time.perf_counter()
+    servers = [GameServer(args.tick_rate, seed=None if args.seed is None else args.seed + i)
+               for i in range(max(1, args.instances))]
+    print(startup_report(servers, started))
+    if args.bots:
+        asyncio.run(load_test(servers[0], args.host, args.port, args.bots, args.duration))
+    else:
+        last_port = args.port + len(servers) - 1
+        ports = str(args.port) if last_port == args.port else f"{args.port}-{last_port}"
+        print(f"Listening on {args.host}:{ports} at {args.tick_rate} Hz")
+        try:
+            asyncio.run(run_worlds(servers, args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
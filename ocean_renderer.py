@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Ocean Renderer
+Wind-driven water heightfield computed with numpy at low resolution and upscaled
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+import pygame
+
+# Wave components: (angle from the downwind direction in degrees, wavelength in world units)
+WAVE_COMPONENTS = ((-30.0, 140.0), (-8.0, 90.0), (14.0, 60.0), (36.0, 38.0))
+WAVE_STEEPNESS = 0.08  # Amplitude as a fraction of wavelength at full wind
+WAVE_GRAVITY = 40.0    # Sets wave speed (omega = sqrt(g * k)); tuned for looks, not physics
+LIGHT_DIRECTION = (-0.6, -0.8)  # Light comes from the top left
+FOAM_WIND = 12.0       # Knots before crests start to whiten
+MARGIN_CELLS = 3       # Spare cells on every side, so the camera can scroll between keyframes
+
+class OceanRenderer:
+    """Animated water drawn from a low-resolution heightfield
+    
+    The heightfield is a sum of directional sine waves aligned with the
+    wind, sampled every `scale` world units. It is only evaluated at
+    keyframes (update_rate per second); frames in between interpolate the
+    two nearest keyframes, shade the result, write it through surfarray and
+    smoothscale it up to the screen. The grid is anchored to world cells
+    and has a margin, so the camera can scroll between keyframes by just
+    moving the blit; the grid is only re-anchored at a keyframe or when the
+    view leaves the margin.
+    """
+    
+    def __init__(self, screen_width, screen_height, scale=8, update_rate=15.0):
+        """Initialize renderer"""
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.scale = scale
+        self.keyframe_time = 1.0 / update_rate
+        
+        self.grid_width = screen_width // scale + 1 + 2 * MARGIN_CELLS
+        self.grid_height = screen_height // scale + 1 + 2 * MARGIN_CELLS
+        self.cell_x = np.arange(self.grid_width, dtype=np.float32) * scale
+        self.cell_y = np.arange(self.grid_height, dtype=np.float32) * scale
+        
+        self.time = 0.0
+        self.keyframe_start = 0.0  # Time of height_from; height_to is one keyframe later
+        self.origin = None  # World position of grid cell (0, 0) for the current keyframes
+        self.height_from = None
+        self.height_to = None
+        self.wind_direction = 0.0
+        self.wind_speed = 0.0
+        
+        self.low = pygame.Surface((self.grid_width, self.grid_height))
+        self.scaled = pygame.Surface((self.grid_width * scale, self.grid_height * scale))
+        self.rgb = np.zeros((self.grid_width, self.grid_height, 3), dtype=np.uint8)
+        
+        # Colors
+        self.colors = {
+            'deep': np.array((0, 84, 150), dtype=np.float32),
+            'crest': np.array((40, 150, 210), dtype=np.float32),
+            'foam': np.array((220, 235, 245), dtype=np.float32)
+        }
+    
+    def _grid_origin(self, offset):
+        """World position of the top-left grid cell for a camera offset, snapped to whole cells"""
+        left = (-offset[0] // self.scale - MARGIN_CELLS) * self.scale
+        top = (-offset[1] // self.scale - MARGIN_CELLS) * self.scale
+        return (left, top)
+    
+    def _covers(self, offset):
+        """Check whether the current grid still covers the screen at a camera offset"""
+        x = self.origin[0] + offset[0]
+        y = self.origin[1] + offset[1]
+        return (self.screen_width - self.grid_width * self.scale <= x <= 0 and
+                self.screen_height - self.grid_height * self.scale <= y <= 0)
+    
+    def _heightfield(self, origin, at_time):
+        """Evaluate the wave sum over the grid at one moment"""
+        world_x = self.cell_x + origin[0]
+        world_y = self.cell_y + origin[1]
+        wind_factor = min(2.0, self.wind_speed / 10.0)
+        
+        # Waves travel downwind; 0 degrees is north, wind_direction is where it blows from
+        downwind = self.wind_direction + 180.0
+        height = np.zeros((self.grid_width, self.grid_height), dtype=np.float32)
+        for angle, wavelength in WAVE_COMPONENTS:
+            radians = math.radians(downwind + angle)
+            k = 2 * math.pi / wavelength
+            omega = math.sqrt(WAVE_GRAVITY * k)
+            amplitude = wavelength * WAVE_STEEPNESS * wind_factor
+            # Separable phase: one row and one column term, broadcast over the grid
+            phase_x = (k * math.sin(radians)) * world_x
+            phase_y = (-k * math.cos(radians)) * world_y - omega * at_time
+            height += amplitude * np.sin(phase_x[:, None] + phase_y[None, :])
+        return height
+    
+    def update(self, dt, wind_direction, wind_speed, offset=(0, 0)):
+        """Advance the animation; evaluates new keyframes only when the current pair runs out"""
+        self.time += dt
+        self.wind_direction = wind_direction
+        self.wind_speed = wind_speed
+        
+        elapsed = self.time - self.keyframe_start
+        if self.height_to is not None and elapsed < self.keyframe_time and self._covers(offset):
+            return
+        
+        origin = self._grid_origin(offset)
+        if self.height_to is not None and self.keyframe_time <= elapsed < 2 * self.keyframe_time:
+            # Next keyframe pair; the old end is the new start unless the grid moved
+            self.keyframe_start += self.keyframe_time
+            if origin == self.origin:
+                self.height_from = self.height_to
+            else:
+                self.height_from = self._heightfield(origin, self.keyframe_start)
+        else:
+            # First frame, a stall, or the view left the margin between keyframes
+            if self.height_to is None or elapsed >= self.keyframe_time:
+                self.keyframe_start = self.time
+            self.height_from = self._heightfield(origin, self.keyframe_start)
+        self.height_to = self._heightfield(origin, self.keyframe_start + self.keyframe_time)
+        self.origin = origin
+    
+    def _shade(self, height):
+        """Color the heightfield: deeper troughs, lit slopes and foam on high crests"""
+        wind_factor = min(2.0, self.wind_speed / 10.0)
+        peak = max(1e-3, sum(wavelength for _, wavelength in WAVE_COMPONENTS) * WAVE_STEEPNESS * wind_factor)
+        
+        slope_x, slope_y = np.gradient(height, self.scale)
+        light = 1.0 - 0.6 * (slope_x * LIGHT_DIRECTION[0] + slope_y * LIGHT_DIRECTION[1])
+        mix = np.clip(0.5 + 0.5 * height / peak, 0.0, 1.0)
+        
+        colors = self.colors
+        rgb = colors['deep'] + (colors['crest'] - colors['deep']) * mix[..., None]
+        rgb *= np.clip(light, 0.6, 1.4)[..., None]
+        if self.wind_speed > FOAM_WIND:
+            foam = np.clip((mix - 0.8) * 5.0, 0.0, 1.0) * min(1.0, (self.wind_speed - FOAM_WIND) / FOAM_WIND)
+            rgb += (colors['foam'] - rgb) * foam[..., None]
+        np.clip(rgb, 0, 255, out=rgb)
+        self.rgb[:] = rgb
+    
+    def draw(self, screen, offset=(0, 0)):
+        """Draw the water over the whole screen (replaces the ocean fill)"""
+        if self.height_to is None:
+            return
+        t = min(1.0, (self.time - self.keyframe_start) / self.keyframe_time)
+        height = self.height_from + (self.height_to - self.height_from) * t
+        self._shade(height)
+        
+        pygame.surfarray.blit_array(self.low, self.rgb)
+        pygame.transform.smoothscale(self.low, self.scaled.get_size(), self.scaled)
+        screen.blit(self.scaled, (self.origin[0] + offset[0], self.origin[1] + offset[1]))
+
+def main():
+    """Benchmark: time the heightfield renderer against the line-segment wave effect"""
+    parser = argparse.ArgumentParser(description="Benchmark ocean rendering")
+    parser.add_argument("--frames", type=int, default=300, help="frames to draw per renderer")
+    parser.add_argument("--scale", type=int, default=8, help="world units per heightfield cell")
+    parser.add_argument("--rate", type=float, default=15.0, help="heightfield keyframes per second")
+    parser.add_argument("--wind", type=float, default=15.0, help="wind speed in knots")
+    args = parser.parse_args()
+    
+    from wind_ui import EnhancedWaveEffect
+    
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    dt = 1.0 / 60
+    
+    waves = EnhancedWaveEffect(800, 600)
+    started = time.perf_counter()
+    for frame in range(args.frames):
+        waves.update(dt, 90.0, args.wind)
+        screen.fill((0, 119, 190))
+        waves.draw(screen)
+    lines_ms = (time.perf_counter() - started) / args.frames * 1000
+    
+    ocean = OceanRenderer(800, 600, args.scale, args.rate)
+    started = time.perf_counter()
+    for frame in range(args.frames):
+        offset = (-frame, 0)  # Scroll to include grid re-anchoring
+        ocean.update(dt, 90.0, args.wind, offset)
+        ocean.draw(screen, offset)
+    ocean_ms = (time.perf_counter() - started) / args.frames * 1000
+    
+    print(f"Line waves:  {lines_ms:.2f} ms per frame")
+    print(f"Heightfield: {ocean_ms:.2f} ms per frame ({ocean.grid_width}x{ocean.grid_height} cells, "
+          f"{args.rate:g} keyframes/s)")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
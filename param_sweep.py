@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Parameter Sweep
+Runs headless autopilot trading sessions over a grid of tuning values on a process pool
+"""
+
+import argparse
+import csv
+import importlib
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from catalog import Catalog, Market
+from crew import CrewRoster
+from player_state import PlayerState, SAILING_CREW
+import player_state
+from sailing_engine import SailingEngine, WindSystem, NavigationData
+from weather import WeatherSystem, WeatherWind
+from world import WORLD_WIDTH, WORLD_HEIGHT, EDGE_MARGIN
+import trading
+
+GAME_HOURS_PER_SECOND = 0.2  # Same clock as the enhanced game
+
+# Session parameters and their defaults. Names with a dot ("module.NAME")
+# are not listed here: they override that module-level constant in the
+# worker process before the session runs, e.g. player_state.RECRUIT_COST.
+DEFAULT_PARAMS = {
+    "hours": 24.0,                  # Game hours per session
+    "dt": 1 / 30,                   # Physics step in seconds
+    "dock_range": 80.0,             # pirate_game_sprint5.DOCK_RANGE
+    "strong_wind_threshold": 15.0,  # WindVaneSystem.strong_wind_threshold
+    "crew_floor": SAILING_CREW,     # Recruit in port when the crew drops below this
+    "tack_angle": 60.0,             # Degrees the autopilot bears off when in irons
+    "tack_time": 3.0,               # Seconds it holds a tack before heading for port again
+    "hull_wear": 0.0,               # Hull points lost per game hour at sea (repaired in port)
+    "starting_crew": 15             # Sailors aboard at the start
+}
+
+# The enhanced game has no hull damage outside combat, which these sessions
+# do not sail into, so player_state.REPAIR_COST only changes the results
+# (repair_spend, gold_per_hour) when hull_wear is above zero.
+
+# Result columns, in table order
+METRICS = ("trips", "hours_to_dock", "gold_per_hour", "stall_seconds", "longest_stall",
+           "strong_wind_share", "crew", "repair_spend")
+
+_original_constants = {}  # (module, name) -> value before any override
+
+def apply_overrides(params):
+    """Set "module.NAME" parameters as module constants (in this process only)
+    
+    Workers run many sessions, so constants overridden for an earlier
+    session are restored first. Code must read the constant through its
+    module (player_state.RECRUIT_COST) for an override to reach it.
+    """
+    for (module, constant), value in _original_constants.items():
+        setattr(module, constant, value)
+    for name, value in params.items():
+        if "." in name:
+            module_name, constant = name.rsplit(".", 1)
+            module = importlib.import_module(module_name)
+            if not hasattr(module, constant):
+                raise AttributeError(f"{module_name} has no constant {constant}")
+            _original_constants.setdefault((module, constant), getattr(module, constant))
+            setattr(module, constant, value)
+
+def run_session(params, seed):
+    """Sail an autopilot trader for a number of game hours; returns a metrics dict
+    
+    The captain starts in a random port, buys the good that pays best
+    elsewhere, sails there (tacking off when in irons), sells, repairs,
+    recruits when short-handed and repeats. Wind, weather, crew wages and
+    market moves are the game's own. Every random draw comes from the seed,
+    so a grid point differs from another only by its parameters.
+    """
+    settings = dict(DEFAULT_PARAMS)
+    settings.update(params)
+    apply_overrides(settings)
+    dt = settings["dt"]
+    rng = random.Random(seed)
+    random.seed(seed)  # The sailing engine draws from the global generator
+    
+    catalog = Catalog.load()
+    market = Market(catalog, rng)
+    roster = CrewRoster(rng=np.random.default_rng(seed))
+    roster.hire(settings["starting_crew"])
+    player = PlayerState(catalog.commodity_count, roster=roster)
+    sailing = SailingEngine()
+    wind_system = WindSystem()
+    weather = WeatherSystem(seed)
+    wind = WeatherWind(wind_system, weather)
+    navigation = NavigationData()
+    
+    port = rng.randrange(catalog.port_count)
+    x, y = catalog.port_positions[port]
+    heading = rng.uniform(0, 360)
+    start_gold = player.gold
+    game_hours = 0.0
+    trips = []
+    trip_started = 0.0
+    stall_seconds = longest_stall = strong_wind_seconds = 0.0
+    tack_timer = 0.0
+    tack_side = 1
+    wear = 0.0
+    repair_spend = 0
+    
+    def dock(port):
+        """Trade, repair and recruit in port; returns the next destination"""
+        nonlocal repair_spend
+        market.refresh_port(port)
+        trading.sell_all(market, port, player)
+        cost = player.repair_cost
+        if 0 < cost <= player.gold:
+            player.gold -= cost
+            player.health = player.max_health
+            repair_spend += cost
+        short = settings["crew_floor"] - player.crew
+        if short > 0:
+            count = min(short, player.max_crew - player.crew, player.gold // max(1, player_state.RECRUIT_COST))
+            if count > 0:
+                player.gold -= player_state.RECRUIT_COST * count
+                player.recruit(count)
+        best = market.best_buy_here(port)
+        if best is not None:
+            trading.buy_max(market, port, player, best[0])
+            return best[2]
+        return rng.choice([other for other in range(catalog.port_count) if other != port] or [port])
+    
+    target = dock(port)
+    elapsed = 0.0
+    while game_hours < settings["hours"]:
+        elapsed += dt
+        day = int(game_hours // 24)
+        game_hours += dt * GAME_HOURS_PER_SECOND
+        if int(game_hours // 24) > day:
+            player.end_day()
+        weather.update(game_hours)
+        wind_system.update(dt)
+        wear += settings["hull_wear"] * dt * GAME_HOURS_PER_SECOND
+        if wear >= 1.0:
+            player.health = max(1, player.health - int(wear))
+            wear -= int(wear)
+        
+        # Autopilot: turn toward the port, or hold a tack after being caught in irons
+        target_x, target_y = catalog.port_positions[target]
+        bearing = math.degrees(math.atan2(target_x - x, -(target_y - y)))
+        if tack_timer > 0:
+            tack_timer -= dt
+            bearing += tack_side * settings["tack_angle"]
+        relative = (bearing - heading + 180.0) % 360.0 - 180.0
+        turning = 0 if abs(relative) < 3 else (1 if relative > 0 else -1)
+        
+        sailing_data = sailing.update_ship_physics(dt, heading, wind, turning)
+        heading = sailing_data['new_heading']
+        speed = sailing_data['current_speed'] * player.speed_factor
+        navigation.update(sailing_data, wind)
+        if speed > 0:
+            dx, dy = sailing.calculate_movement(speed, heading, dt)
+            x = max(EDGE_MARGIN, min(WORLD_WIDTH - EDGE_MARGIN, x + dx))
+            y = max(EDGE_MARGIN, min(WORLD_HEIGHT - EDGE_MARGIN, y + dy))
+        
+        if navigation.is_stalled:
+            stall_seconds += dt
+            longest_stall = max(longest_stall, navigation.stall_time)
+            if tack_timer <= 0 and navigation.stall_time > 1.0:
+                tack_timer = settings["tack_time"]
+                tack_side = -tack_side
+        if wind.true_wind_speed > settings["strong_wind_threshold"]:
+            strong_wind_seconds += dt
+        
+        if math.hypot(target_x - x, target_y - y) <= settings["dock_range"]:
+            trips.append(game_hours - trip_started)
+            trip_started = game_hours
+            target = dock(target)
+    
+    # Cargo still aboard counts at the best price it would fetch
+    worth = player.gold + sum(quantity * market.best_price[commodity]
+                              for commodity, quantity in enumerate(player.cargo) if quantity)
+    return {
+        "trips": len(trips),
+        "hours_to_dock": sum(trips) / len(trips) if trips else float("nan"),
+        "gold_per_hour": (worth - start_gold) / settings["hours"],
+        "stall_seconds": stall_seconds,
+        "longest_stall": longest_stall,
+        "strong_wind_share": strong_wind_seconds / elapsed if elapsed else 0.0,
+        "crew": player.crew,
+        "repair_spend": repair_spend
+    }
+
+def run_job(job):
+    """Process-pool entry point: (index, params, seed) -> (index, metrics)"""
+    index, params, seed = job
+    return index, run_session(params, seed)
+
+def expand_grid(grid):
+    """Turn {name: [values]} into one params dict per combination"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def sweep(grid, seeds=4, workers=None, base_params=None):
+    """Run every grid point for every seed on a process pool; returns one averaged row per point
+    
+    Jobs are independent and only small dicts cross the process boundary,
+    so throughput grows with the number of worker processes.
+    """
+    points = expand_grid(grid)
+    jobs = []
+    for index, point in enumerate(points):
+        params = dict(base_params or {})
+        params.update(point)
+        jobs.extend((index, params, seed) for seed in range(seeds))
+    
+    workers = workers or os.cpu_count() or 1
+    totals = [{metric: [] for metric in METRICS} for _ in points]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for index, metrics in pool.map(run_job, jobs, chunksize=chunksize):
+            for metric in METRICS:
+                totals[index][metric].append(metrics[metric])
+    
+    rows = []
+    for point, values in zip(points, totals):
+        row = dict(point)
+        for metric in METRICS:
+            finite = [value for value in values[metric] if not math.isnan(value)]
+            row[metric] = sum(finite) / len(finite) if finite else float("nan")
+        rows.append(row)
+    return rows
+
+def parse_param(text):
+    """Parse "name=v1,v2,..." into (name, [values]); values are JSON (numbers, true/false) or strings"""
+    name, _, values = text.partition("=")
+    if not name or not values:
+        raise argparse.ArgumentTypeError(f"expected name=value[,value...], got {text!r}")
+    parsed = []
+    for value in values.split(","):
+        try:
+            parsed.append(json.loads(value))
+        except ValueError:
+            parsed.append(value)
+    return name, parsed
+
+def write_table(rows, output):
+    """Write rows as CSV"""
+    if not rows:
+        return
+    writer = csv.DictWriter(output, fieldnames=list(rows[0]))
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({name: round(value, 3) if isinstance(value, float) else value
+                         for name, value in row.items()})
+
+def main():
+    """Sweep tuning parameters from the command line"""
+    parser = argparse.ArgumentParser(
+        description="Privateers Legacy parameter sweep",
+        epilog="example: python param_sweep.py --param dock_range=60,80,100 "
+               "--param player_state.RECRUIT_COST=15,25,40 --seeds 8 --output sweep.csv")
+    parser.add_argument("--param", type=parse_param, action="append", default=[],
+                        help="name=v1,v2,... (session parameter or module.CONSTANT)")
+    parser.add_argument("--grid", help="JSON file of {name: [values]} to sweep")
+    parser.add_argument("--seeds", type=int, default=4, help="sessions per grid point")
+    parser.add_argument("--hours", type=float, default=DEFAULT_PARAMS["hours"], help="game hours per session")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--output", help="CSV file for the results (default: print to the terminal)")
+    args = parser.parse_args()
+    
+    grid = {}
+    if args.grid:
+        with open(args.grid, 'r') as f:
+            grid.update(json.load(f))
+    grid.update(dict(args.param))
+    if not grid:
+        grid = {"dock_range": [DEFAULT_PARAMS["dock_range"]]}
+    
+    started = time.perf_counter()
+    rows = sweep(grid, args.seeds, args.workers, {"hours": args.hours})
+    elapsed = time.perf_counter() - started
+    sessions = len(rows) * args.seeds
+    
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            write_table(rows, f)
+        print(f"Wrote {len(rows)} rows to {args.output}")
+    else:
+        write_table(rows, sys.stdout)
+    print(f"{sessions} sessions of {args.hours:g} game hours in {elapsed:.1f}s "
+          f"({sessions / elapsed:.2f} sessions/s on {args.workers or os.cpu_count()} workers)")
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,22 @@ import random
 import math
 import json
 
-# Initialize Pygame
-pygame.init()
+from spatial_index import SpatialGrid, Camera, VisibilityCuller, LOD_MARKER
+from interest import InterestManager
+from input_bindings import InputMap, CommandDispatcher
+from combat import CombatEngine, SIDE_PORT, SIDE_STARBOARD
+from weather import WeatherSystem
+from weather_ui import WeatherRenderer
+from wind_ui import Minimap
+from fonts import get_font, LazyFont
+from display import SCREEN_WIDTH, SCREEN_HEIGHT, create_window
+from world import WORLD_WIDTH, WORLD_HEIGHT
+from screen_overlay import ScreenOverlays, OVERLAY_DAMAGE, OVERLAY_DIM
+import telemetry
+from telemetry import Telemetry
+
+PLUNDER = 50  # Gold for sinking an enemy ship
+GAME_HOURS_PER_FRAME = 0.2 / 60  # One game day every two minutes at 60 FPS
 
 class Ship:
     def __init__(self, x, y):
@@ -27,13 +41,13 @@ class Ship:
             # Move forward in the direction the ship is facing
             self.x += math.cos(self.angle) * self.speed
             self.y += math.sin(self.angle) * self.speed
-            # Keep ship within screen bounds
-            self.x = max(0, min(800 - self.width, self.x))
-            self.y = max(0, min(600 - self.height, self.y))
+            # Keep ship within world bounds
+            self.x = max(0, min(WORLD_WIDTH - self.width, self.x))
+            self.y = max(0, min(WORLD_HEIGHT - self.height, self.y))
     
-    def draw(self, screen):
+    def draw(self, screen, offset=(0, 0)):
         """Draw the ship on screen"""
-        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
+        pygame.draw.rect(screen, self.color, (self.x + offset[0], self.y + offset[1], self.width, self.height))
     
     def get_distance_to(self, island):
         """Calculate distance between ship center and island center"""
@@ -44,28 +58,6 @@ class Ship:
         
         return math.sqrt((ship_center_x - island_center_x)**2 + (ship_center_y - island_center_y)**2)
 
-class Cannonball:
-    def __init__(self, x, y, angle):
-        self.x = x
-        self.y = y
-        self.angle = angle
-        self.speed = 8
-        self.radius = 3
-        self.color = (64, 64, 64)  # Dark gray
-    
-    def update(self):
-        """Move cannonball forward"""
-        self.x += math.cos(self.angle) * self.speed
-        self.y += math.sin(self.angle) * self.speed
-    
-    def is_offscreen(self):
-        """Check if cannonball is off screen"""
-        return self.x < 0 or self.x > 800 or self.y < 0 or self.y > 600
-    
-    def draw(self, screen):
-        """Draw the cannonball"""
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-
 class EnemyShip:
     def __init__(self, x, y):
         self.x = x
@@ -75,16 +67,39 @@ class EnemyShip:
         self.speed = 2
         self.direction = 1  # 1 for right, -1 for left
         self.color = (139, 0, 0)  # Dark red
+        self.combat_id = None  # Ship id in the combat engine
     
     def update(self):
         """Move enemy ship back and forth"""
         self.x += self.speed * self.direction
-        if self.x <= 0 or self.x >= 800 - self.width:
+        if self.x <= 0 or self.x >= WORLD_WIDTH - self.width:
             self.direction *= -1
     
-    def draw(self, screen):
+    def advance(self, seconds):
+        """Jump ahead by a span of time in one step (far tier), bouncing off the edges the same way"""
+        span = WORLD_WIDTH - self.width
+        # Unfold the bounces: one back-and-forth is 2 * span of travel
+        travel = self.x if self.direction > 0 else 2 * span - self.x
+        travel = (travel + self.speed * seconds * 60) % (2 * span)
+        if travel <= span:
+            self.x = travel
+            self.direction = 1
+        else:
+            self.x = 2 * span - travel
+            self.direction = -1
+    
+    def draw(self, screen, offset=(0, 0)):
         """Draw the enemy ship"""
-        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
+        pygame.draw.rect(screen, self.color, (self.x + offset[0], self.y + offset[1], self.width, self.height))
+    
+    def draw_marker(self, screen, offset=(0, 0)):
+        """Draw a simplified far-away marker"""
+        center = (int(self.x + self.width // 2 + offset[0]), int(self.y + self.height // 2 + offset[1]))
+        pygame.draw.circle(screen, self.color, center, 3)
+    
+    def get_bounds(self):
+        """Get world bounds as (left, top, width, height)"""
+        return (self.x, self.y, self.width, self.height)
     
     def collides_with(self, ship):
         """Check collision with player ship"""
@@ -101,9 +116,18 @@ class Island:
         self.height = height
         self.color = (34, 139, 34)  # Forest green
     
-    def draw(self, screen):
+    def draw(self, screen, offset=(0, 0)):
         """Draw the island on screen"""
-        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
+        pygame.draw.rect(screen, self.color, (self.x + offset[0], self.y + offset[1], self.width, self.height))
+    
+    def draw_marker(self, screen, offset=(0, 0)):
+        """Draw a simplified far-away marker"""
+        center = (int(self.x + self.width // 2 + offset[0]), int(self.y + self.height // 2 + offset[1]))
+        pygame.draw.circle(screen, self.color, center, 4)
+    
+    def get_bounds(self):
+        """Get world bounds as (left, top, width, height)"""
+        return (self.x, self.y, self.width, self.height)
 
 class GameState:
     def __init__(self, ship_x, ship_y, gold, health):
@@ -122,7 +146,6 @@ class GameState:
         }
         with open(filename, 'w') as f:
             json.dump(data, f)
-        print("Game saved!")
     
     @classmethod
     def load(cls, filename="savegame.json"):
@@ -130,23 +153,25 @@ class GameState:
         try:
             with open(filename, 'r') as f:
                 data = json.load(f)
-            print("Game loaded!")
             return cls(data["ship_x"], data["ship_y"], data["gold"], data["health"])
         except FileNotFoundError:
-            print("No save file found!")
             return None
 
 class Game:
     def __init__(self):
-        self.screen = pygame.display.set_mode((800, 600))
-        pygame.display.set_caption("Pirate Ship Adventure")
+        # Pygame starts with the game window, not at import, so the logic imports headless
+        pygame.init()
+        self.screen = create_window("Pirate Ship Adventure")
         self.clock = pygame.time.Clock()
         self.running = True
         self.paused = False
         self.ocean_color = (0, 119, 190)  # Ocean blue
         
+        # Gameplay events and frame times, written to rotating log files off the main thread
+        self.telemetry = Telemetry()
+        
         # Create ship at center of screen
-        self.ship = Ship(385, 290)
+        self.ship = Ship(WORLD_WIDTH // 2 - 15, WORLD_HEIGHT // 2 - 10)
         
         # Game stats
         self.health = 100
@@ -156,15 +181,58 @@ class Game:
         # Create 3 random islands
         self.islands = self._generate_islands()
         
-        # Cannonballs list
-        self.cannonballs = []
-        
         # Enemy ships
         self.enemy_ships = self._generate_enemy_ships()
         self.hit_flash = 0
+        self.overlays = ScreenOverlays(SCREEN_WIDTH, SCREEN_HEIGHT)  # Hit flash and dock dimming
+        
+        # Combat: the game moves the ships, the engine handles guns and damage
+        self.combat = CombatEngine()
+        self.combat.move_ships = False
+        self.player_id = self.combat.add_ship(self.ship.x, self.ship.y, team=0, hull=self.health)
+        for enemy in self.enemy_ships:
+            enemy.combat_id = self.combat.add_ship(enemy.x, enemy.y, team=1, radius=13, crew=12, guns=6)
+        self.cannonball_color = (64, 64, 64)  # Dark gray
+        
+        # Camera and spatial indexes for visibility culling
+        self.camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT, WORLD_WIDTH, WORLD_HEIGHT)
+        self.culler = VisibilityCuller(self.camera)
+        self.island_index = SpatialGrid()
+        self.island_index.rebuild(self.islands)
+        self.enemy_index = SpatialGrid()
+        self.enemy_interest = InterestManager(self.enemy_index)
+        self.enemy_interest.add_all(self.enemy_ships)
+        
+        # Time of day and weather
+        self.game_hours = 0.0
+        self.weather = WeatherSystem()
+        self.weather_renderer = WeatherRenderer(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.weather_renderer.prewarm(self.weather)
+        self.base_fx_range = self.culler.fx_range
+        
+        # Minimap over cached island terrain
+        self.minimap = Minimap(SCREEN_WIDTH - 150, SCREEN_HEIGHT - 115, 140, 105, self.camera.world_width, self.camera.world_height)
+        self.minimap.add_terrain(self.islands)
         
         # Font for docking message
-        self.font = pygame.font.Font(None, 36)
+        self.font = LazyFont(36)
+        
+        # Key bindings (keybindings.json overrides the defaults) and command dispatch
+        self.input_map = InputMap(pygame.key.key_code)
+        self.input_map.load()
+        self.dispatcher = CommandDispatcher(self.input_map)
+        self.dispatcher.register_all("sailing", {
+            "fire": self._fire_cannon,
+            "dock": self._try_dock,
+            "save": self._save_game,
+            "load": self._load_game,
+            "world_map": self.minimap.toggle_full_map
+        })
+        self.dispatcher.register_all("dock_classic", {
+            "trade": lambda: self._leave_dock_menu("trade"),
+            "repair": lambda: self._leave_dock_menu("repair"),
+            "leave_port": lambda: self._leave_dock_menu("leave_port")
+        })
     
     def _generate_islands(self):
         """Generate 3 randomly placed islands"""
@@ -172,10 +240,10 @@ class Game:
         for _ in range(3):
             # Ensure islands don't spawn too close to ship starting position
             while True:
-                x = random.randint(50, 750 - 60)
-                y = random.randint(50, 550 - 40)
+                x = random.randint(50, WORLD_WIDTH - 50 - 60)
+                y = random.randint(50, WORLD_HEIGHT - 50 - 40)
                 # Check if island is far enough from ship start position
-                if abs(x - 385) > 100 or abs(y - 290) > 100:
+                if abs(x - self.ship.x) > 100 or abs(y - self.ship.y) > 100:
                     islands.append(Island(x, y))
                     break
         return islands
@@ -185,30 +253,106 @@ class Game:
         enemy_ships = []
         num_enemies = random.randint(1, 3)
         for _ in range(num_enemies):
-            x = random.randint(0, 750)
-            y = random.randint(100, 500)
+            x = random.randint(0, WORLD_WIDTH - 50)
+            y = random.randint(100, WORLD_HEIGHT - 100)
             enemy_ships.append(EnemyShip(x, y))
         return enemy_ships
     
+    def _fire_cannon(self):
+        """Fire both broadsides (each only if it has reloaded)"""
+        self.combat.fire(self.player_id, SIDE_PORT)
+        self.combat.fire(self.player_id, SIDE_STARBOARD)
+    
+    def _sync_combat(self, moved):
+        """Copy ship positions into the combat engine (headings: 0 = north, in degrees)"""
+        combat = self.combat
+        ship = self.ship
+        combat.x[self.player_id] = ship.x + ship.width / 2
+        combat.y[self.player_id] = ship.y + ship.height / 2
+        combat.heading[self.player_id] = math.degrees(ship.angle) + 90
+        combat.speed[self.player_id] = ship.speed * 60 if moved else 0
+        
+        for enemy in self.enemy_ships:
+            combat.x[enemy.combat_id] = enemy.x + enemy.width / 2
+            combat.y[enemy.combat_id] = enemy.y + enemy.height / 2
+            combat.heading[enemy.combat_id] = 90 if enemy.direction > 0 else 270
+            combat.speed[enemy.combat_id] = enemy.speed * 60
+    
+    def _update_combat(self):
+        """Let the enemies fire, fly the cannonballs and apply the damage"""
+        self.combat.auto_fire([enemy.combat_id for enemy in self.enemy_ships])
+        self.combat.step(1 / 60)
+        
+        for ship_id, hits in self.combat.hits:
+            if ship_id == self.player_id:
+                self.hit_flash = 30
+                self.telemetry.record(telemetry.EVENT_HIT, target="player", cannonballs=hits,
+                                      health=int(self.combat.hull[self.player_id]))
+        
+        # Sunk or struck enemies leave the map and pay out their plunder
+        for enemy in self.enemy_ships[:]:
+            if not self.combat.alive[enemy.combat_id]:
+                self.enemy_ships.remove(enemy)
+                self.enemy_interest.remove(enemy)
+                self.gold += PLUNDER
+                self.telemetry.record(telemetry.EVENT_PLUNDER, gold=PLUNDER)
+        
+        self.health = int(self.combat.hull[self.player_id])
+    
+    def _draw_cannonballs(self, offset):
+        """Draw the cannonballs inside the camera view"""
+        shots = self.combat.shots
+        left, top, width, height = self.camera.get_view_rect()
+        visible = (shots.active & (shots.x >= left) & (shots.x <= left + width) &
+                   (shots.y >= top) & (shots.y <= top + height))
+        for slot in visible.nonzero()[0]:
+            center = (int(shots.x[slot] + offset[0]), int(shots.y[slot] + offset[1]))
+            pygame.draw.circle(self.screen, self.cannonball_color, center, 3)
+    
+    def _try_dock(self):
+        """Check if near island for docking"""
+        for index, island in enumerate(self.islands):
+            if self.ship.get_distance_to(island) < 80:
+                self.paused = True
+                self.telemetry.record(telemetry.EVENT_DOCK, port=f"island {index + 1}")
+                break
+    
+    def _save_game(self):
+        """Save game"""
+        game_state = GameState(self.ship.x, self.ship.y, self.gold, self.health)
+        game_state.save()
+        self.telemetry.record(telemetry.EVENT_SAVE, gold=self.gold, health=self.health)
+    
+    def _load_game(self):
+        """Load game"""
+        loaded_state = GameState.load()
+        self.telemetry.record(telemetry.EVENT_LOAD, found=loaded_state is not None)
+        if loaded_state:
+            self.ship.x = loaded_state.ship_x
+            self.ship.y = loaded_state.ship_y
+            self.gold = loaded_state.gold
+            self.health = loaded_state.health
+            self.combat.hull[self.player_id] = self.health
+            self.combat.alive[self.player_id] = self.health > 0
+    
+    def _leave_dock_menu(self, action):
+        """Close the dock menu after choosing an option"""
+        self.telemetry.record(telemetry.EVENT_PORT_ACTION, action=action)
+        self.paused = False
+    
     def _check_docking(self):
         """Check if ship is near any island and display docking message"""
         for island in self.islands:
             distance = self.ship.get_distance_to(island)
             if distance < 80:  # Docking range
-                print("Press D to dock")
-                # Display message on screen too
+                # On screen only: a console print here ran every frame while in range
                 text = self.font.render("Press D to dock", True, (255, 255, 255))
                 self.screen.blit(text, (300, 50))
                 break
     
     def _draw_dock_menu(self):
         """Draw the docking menu"""
-        # Semi-transparent overlay
-        overlay = pygame.Surface((800, 600))
-        overlay.set_alpha(128)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
-        
+        # The semi-transparent overlay is the dim layer, composited before this
         # Menu text
         menu_items = [
             "DOCKED AT ISLAND",
@@ -225,7 +369,7 @@ class Game:
     
     def _draw_hud(self):
         """Draw the HUD at the top of the screen"""
-        hud_font = pygame.font.Font(None, 24)
+        hud_font = get_font(24)
         
         # Ship name (left)
         name_text = hud_font.render(self.ship_name, True, (255, 255, 255))
@@ -237,7 +381,11 @@ class Game:
         
         # Gold (right)
         gold_text = hud_font.render(f"Gold: {self.gold}", True, (255, 255, 255))
-        self.screen.blit(gold_text, (650, 10))
+        self.screen.blit(gold_text, (SCREEN_WIDTH - 150, 10))
+        
+        # Weather and time of day (bottom left)
+        weather_text = hud_font.render(self.weather.describe(), True, (255, 255, 255))
+        self.screen.blit(weather_text, (10, SCREEN_HEIGHT - 25))
     
     def run(self):
         """Main game loop"""
@@ -247,93 +395,86 @@ class Game:
                 if event.type == pygame.QUIT:
                     self.running = False
                 elif event.type == pygame.KEYDOWN:
-                    if self.paused:
-                        if event.key == pygame.K_1:
-                            print("Trading goods...")
-                            self.paused = False
-                        elif event.key == pygame.K_2:
-                            print("Repairing ship...")
-                            self.paused = False
-                        elif event.key == pygame.K_3:
-                            print("Leaving island...")
-                            self.paused = False
-                    else:
-                        if event.key == pygame.K_SPACE:
-                            # Fire cannonball from ship position
-                            cannon_x = self.ship.x + self.ship.width // 2
-                            cannon_y = self.ship.y + self.ship.height // 2
-                            self.cannonballs.append(Cannonball(cannon_x, cannon_y, self.ship.angle))
-                        elif event.key == pygame.K_d:
-                            # Check if near island for docking
-                            for island in self.islands:
-                                if self.ship.get_distance_to(island) < 80:
-                                    self.paused = True
-                                    break
-                        elif event.key == pygame.K_s:
-                            # Save game
-                            game_state = GameState(self.ship.x, self.ship.y, self.gold, self.health)
-                            game_state.save()
-                        elif event.key == pygame.K_l:
-                            # Load game
-                            loaded_state = GameState.load()
-                            if loaded_state:
-                                self.ship.x = loaded_state.ship_x
-                                self.ship.y = loaded_state.ship_y
-                                self.gold = loaded_state.gold
-                                self.health = loaded_state.health
+                    state = "dock_classic" if self.paused else "sailing"
+                    self.dispatcher.handle_key(state, event.key)
             
             if not self.paused:
                 # Get pressed keys
                 keys = pygame.key.get_pressed()
                 
                 # Update game objects
+                old_position = (self.ship.x, self.ship.y)
                 self.ship.update(keys)
                 
-                # Update cannonballs
-                for cannonball in self.cannonballs[:]:
-                    cannonball.update()
-                    if cannonball.is_offscreen():
-                        self.cannonballs.remove(cannonball)
-                
-                # Update enemy ships
-                for enemy in self.enemy_ships:
+                # Enemies near the player sail every frame, distant ones in coarse steps
+                ship_center = (self.ship.x + self.ship.width / 2, self.ship.y + self.ship.height / 2)
+                near_enemies, far_enemies = self.enemy_interest.update(1 / 60, [ship_center])
+                for enemy, elapsed in far_enemies:
+                    enemy.advance(elapsed)
+                    self.enemy_interest.moved(enemy)
+                for enemy in near_enemies:
                     enemy.update()
+                    self.enemy_interest.moved(enemy)
+                
+                # Broadsides and cannonball hits
+                self._sync_combat((self.ship.x, self.ship.y) != old_position)
+                self._update_combat()
                 
-                # Check collisions with enemy ships
-                for enemy in self.enemy_ships:
+                # Check collisions with enemy ships (only near ones can touch us)
+                for enemy in near_enemies:
                     if enemy.collides_with(self.ship) and self.hit_flash == 0:
-                        self.health -= 10
+                        self.combat.damage(self.player_id, hull=10)
+                        self.health = int(self.combat.hull[self.player_id])
                         self.hit_flash = 30  # Flash for 30 frames
-                        print(f"Hit! Health: {self.health}")
+                        self.telemetry.record(telemetry.EVENT_HIT, target="player", damage=10, health=self.health)
                 
                 # Update hit flash
                 if self.hit_flash > 0:
                     self.hit_flash -= 1
+                
+                # Weather limits how far away enemies can be made out
+                self.game_hours += GAME_HOURS_PER_FRAME
+                self.weather.update(self.game_hours)
+                self.weather_renderer.update(1 / 60, self.weather)
+                self.culler.full_detail_range = self.weather.visibility
+                self.culler.fx_range = min(self.base_fx_range, self.weather.visibility)
             
             # Draw everything
             self.screen.fill(self.ocean_color)  # Ocean background
             
+            # Cull everything outside the camera view
+            ship_center_x = self.ship.x + self.ship.width // 2
+            ship_center_y = self.ship.y + self.ship.height // 2
+            self.camera.follow(ship_center_x, ship_center_y)
+            offset = self.camera.offset
+            
             # Draw islands
-            for island in self.islands:
-                island.draw(self.screen)
+            for island, lod in self.culler.visible(self.island_index, ship_center_x, ship_center_y):
+                if lod == LOD_MARKER:
+                    island.draw_marker(self.screen, offset)
+                else:
+                    island.draw(self.screen, offset)
             
             # Draw ship
-            self.ship.draw(self.screen)
+            self.ship.draw(self.screen, offset)
             
             # Draw cannonballs
-            for cannonball in self.cannonballs:
-                cannonball.draw(self.screen)
+            self._draw_cannonballs(offset)
             
             # Draw enemy ships
-            for enemy in self.enemy_ships:
-                enemy.draw(self.screen)
+            for enemy, lod in self.culler.visible(self.enemy_index, ship_center_x, ship_center_y):
+                if lod == LOD_MARKER:
+                    enemy.draw_marker(self.screen, offset)
+                else:
+                    enemy.draw(self.screen, offset)
+            
+            # Light, fog and rain
+            self.weather_renderer.draw(self.screen, self.weather, self.camera.world_to_screen(ship_center_x, ship_center_y))
             
-            # Apply hit flash effect
-            if self.hit_flash > 0:
-                flash_surface = pygame.Surface((800, 600))
-                flash_surface.set_alpha(50)
-                flash_surface.fill((255, 0, 0))
-                self.screen.blit(flash_surface, (0, 0))
+            # Apply hit flash and dock dimming in one blit
+            self.overlays.set(OVERLAY_DAMAGE, 50 if self.hit_flash > 0 else 0)
+            self.overlays.set(OVERLAY_DIM, 128 if self.paused else 0)
+            self.overlays.draw(self.screen)
             
             # Check for docking
             if not self.paused:
@@ -344,10 +485,17 @@ class Game:
             # Draw HUD
             self._draw_hud()
             
+            # Minimap with enemies from the spatial index (the world map covers the HUD)
+            if not self.paused:
+                markers = self.minimap.markers_from_grid(self.enemy_index, 'enemy')
+                markers.append((ship_center_x, ship_center_y, 'player'))
+                self.minimap.draw(self.screen, markers, self.camera.get_view_rect())
+            
             # Update display
             pygame.display.flip()
-            self.clock.tick(60)  # 60 FPS
+            self.telemetry.frame(self.clock.tick(60) / 1000)  # 60 FPS
         
+        self.telemetry.close()
         pygame.quit()
 
 # Run the game
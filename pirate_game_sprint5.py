@@ -8,16 +8,39 @@ import pygame
 import random
 import math
 import json
+import argparse
 from enum import Enum
 
 # Import our new systems
 from dock_menu import DockMenu
+from catalog import Catalog, Market
+from player_state import PlayerState, SAILING_CREW
+from fleet import Fleet, ORDER_FOLLOW, ORDER_HOLD
+from weather import WeatherSystem, WeatherWind
+from world_sim import WorldSimulation, WorldSimulator, KIND_NAMES, KIND_TRADER
 from sailing_engine import SailingEngine, WindSystem, NavigationData
 from wind_ui import (WindVaneSystem, EnhancedWaveEffect, CompassDisplay, 
-                     SpeedDisplay, StallWarning, EnhancedWindDisplay)
+                     SpeedDisplay, StallWarning, EnhancedWindDisplay, Minimap)
+from weather_ui import WeatherRenderer
+from ocean_renderer import OceanRenderer
+from wake import WakeTrails
+from spatial_index import SpatialGrid, Camera, VisibilityCuller, LOD_MARKER
+from frame_pacer import FramePacer, PACE_ACTIVE, PACE_IDLE, PACE_MINIMIZED
+from input_bindings import InputMap, CommandDispatcher, CommandRecorder
+from fonts import get_font, LazyFont
+from display import SCREEN_WIDTH, SCREEN_HEIGHT, create_window
+from world import WORLD_WIDTH, WORLD_HEIGHT, EDGE_MARGIN
+from screen_overlay import ScreenOverlays
+import telemetry
+from telemetry import Telemetry
+from memory_budget import MemoryBudget
+from graphics_quality import (AutoQuality, QUALITY_PRESETS, QUALITY_LEVELS, QUALITY_AUTO, QUALITY_HIGH,
+                              next_quality)
 
-# Initialize Pygame
-pygame.init()
+GAME_HOURS_PER_SECOND = 0.2  # One game day every two minutes of sailing
+DOCK_RANGE = 80              # How close to an island the ship must be to dock
+APPROACH_RANGE = 100         # How close before the "press D to dock" prompt shows
+MEMORY_REPORT_INTERVAL = 30.0  # Seconds between memory telemetry events
 
 class GameState(Enum):
     """Game states"""
@@ -36,12 +59,8 @@ class Ship:
         self.height = 20
         self.color = (139, 69, 19)  # Brown
         
-        # Simple crew system for demo
-        self.crew_count = 15
-        self.max_crew = 30
-        
-    def update(self, keys, sailing_engine, wind_system, navigation_data, dt):
-        """Update ship with enhanced sailing mechanics"""
+    def update(self, keys, sailing_engine, wind_system, navigation_data, dt, speed_factor=1.0):
+        """Update ship with enhanced sailing mechanics (speed_factor comes from the crew)"""
         # Handle steering input
         turning_input = 0
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
@@ -56,7 +75,7 @@ class Ship:
         
         # Update ship state
         self.heading = sailing_data['new_heading']
-        self.current_speed = sailing_data['current_speed']
+        self.current_speed = sailing_data['current_speed'] * speed_factor
         
         # Update navigation data
         navigation_data.update(sailing_data, wind_system)
@@ -68,21 +87,28 @@ class Ship:
             self.y += dy
             
             # Keep ship within bounds
-            self.x = max(50, min(750, self.x))
-            self.y = max(50, min(550, self.y))
+            self.x = max(EDGE_MARGIN, min(WORLD_WIDTH - EDGE_MARGIN, self.x))
+            self.y = max(EDGE_MARGIN, min(WORLD_HEIGHT - EDGE_MARGIN, self.y))
     
-    def draw(self, screen):
+    def draw(self, screen, offset=(0, 0)):
         """Draw the ship"""
+        screen_x = self.x + offset[0]
+        screen_y = self.y + offset[1]
+        
         # Simple ship representation
-        ship_rect = pygame.Rect(self.x - self.width//2, self.y - self.height//2, 
+        ship_rect = pygame.Rect(screen_x - self.width//2, screen_y - self.height//2, 
                                self.width, self.height)
         pygame.draw.rect(screen, self.color, ship_rect)
         
         # Draw heading indicator
         heading_rad = math.radians(self.heading)
-        end_x = self.x + math.sin(heading_rad) * 25
-        end_y = self.y - math.cos(heading_rad) * 25
-        pygame.draw.line(screen, (255, 255, 255), (self.x, self.y), (end_x, end_y), 3)
+        end_x = screen_x + math.sin(heading_rad) * 25
+        end_y = screen_y - math.cos(heading_rad) * 25
+        pygame.draw.line(screen, (255, 255, 255), (screen_x, screen_y), (end_x, end_y), 3)
+    
+    def get_bounds(self):
+        """Get world bounds as (left, top, width, height)"""
+        return (self.x - self.width // 2, self.y - self.height // 2, self.width, self.height)
     
     def get_distance_to(self, island):
         """Calculate distance to island"""
@@ -91,86 +117,128 @@ class Ship:
 class Island:
     """Simple island class"""
     
-    def __init__(self, x, y, width=60, height=40):
+    def __init__(self, x, y, width=60, height=40, port=0):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
+        self.port = port  # Index into the port catalog
         self.color = (34, 139, 34)  # Forest green
     
-    def draw(self, screen):
+    def draw(self, screen, offset=(0, 0)):
         """Draw the island"""
-        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
-
-class CrewSystem:
-    """Simple crew system for demo"""
-    
-    def __init__(self, initial_crew_count=15):
-        self.crew_count = initial_crew_count
-        self.max_crew = 30
-    
-    def get_crew_count(self):
-        return self.crew_count
+        pygame.draw.rect(screen, self.color, (self.x + offset[0], self.y + offset[1], 
+                                              self.width, self.height))
     
-    def can_recruit(self, count):
-        return self.crew_count + count <= self.max_crew
+    def draw_marker(self, screen, offset=(0, 0)):
+        """Draw a simplified far-away marker"""
+        center = (int(self.x + self.width // 2 + offset[0]), int(self.y + self.height // 2 + offset[1]))
+        pygame.draw.circle(screen, self.color, center, 4)
     
-    def recruit_crew(self, count):
-        if self.can_recruit(count):
-            self.crew_count += count
-            return True
-        return False
+    def get_bounds(self):
+        """Get world bounds as (left, top, width, height)"""
+        return (self.x, self.y, self.width, self.height)
 
 class EnhancedGame:
     """Enhanced game with Sprint 5 features"""
     
-    def __init__(self):
-        self.screen = pygame.display.set_mode((800, 600))
-        pygame.display.set_caption("Privateers Legacy - Sprint 5 Enhanced")
+    def __init__(self, trace_memory=False, quality=QUALITY_AUTO):
+        # Pygame starts with the game window, not at import, so the logic imports headless
+        pygame.init()
+        self.screen = create_window("Privateers Legacy - Sprint 5 Enhanced")
         self.clock = pygame.time.Clock()
+        self.pacer = FramePacer(self.clock)
+        
+        # Key bindings (keybindings.json overrides the defaults) and command dispatch
+        self.input_map = InputMap(pygame.key.key_code)
+        self.input_map.load()
+        self.command_recorder = CommandRecorder()
+        self.dispatcher = CommandDispatcher(self.input_map, self.command_recorder)
         self.running = True
         self.game_state = GameState.MAIN_GAME
         
-        # Game stats
-        self.gold = 500
-        self.health = 100
-        self.ship_name = "The Salty Squid"
+        # Commodity/port catalog and live market prices
+        self.catalog = Catalog.load()
+        self.market = Market(self.catalog)
+        
+        # Player stats (gold, health, crew, cargo), shared with every subsystem
+        self.player = PlayerState(self.catalog.commodity_count, "The Salty Squid", gold=500, health=100)
+        self.crew_speed_factor = self.player.speed_factor  # Refreshed daily and after docking
+        self.game_hours = 0.0
+        
+        # Distant traders, patrols and market drift run hourly on a worker thread
+        self.world_sim = WorldSimulator(WorldSimulation(self.catalog, start_hour=self.game_hours))
+        self.world_sim.start()
+        self.world_hour = int(self.game_hours)
+        self.world_sim.request(self.world_hour, self.market)
+        self.world_update = None
+        
+        # Gameplay events and frame times, written to rotating log files off the main thread
+        self.telemetry = Telemetry()
+        
+        # FX memory budgets (memory_budgets.json overrides the defaults); tracemalloc only when tracing
+        self.memory = MemoryBudget(trace=trace_memory)
+        self.memory.load()
+        self.memory_timer = 0.0
         
         # Colors
         self.ocean_color = (0, 119, 190)
         
-        # Create ship
-        self.ship = Ship(400, 300)
-        self.crew_system = CrewSystem()
+        # Create ship; escorts bought in port join the fleet
+        self.ship = Ship(WORLD_WIDTH // 2, WORLD_HEIGHT // 2)
+        self.fleet = Fleet(self.player)
+        self.fleet.update(0, self.ship.x, self.ship.y, self.ship.heading)
+        self.wakes = WakeTrails()  # One row per fleet ship index
         
-        # Create islands
-        self.islands = [
-            Island(150, 150),
-            Island(600, 200),
-            Island(300, 450)
-        ]
+        # Create an island for every port in the catalog
+        self.islands = [Island(x, y, port=port) 
+                        for port, (x, y) in enumerate(self.catalog.port_positions)]
+        
+        # Camera and visibility culling (world is one screen for now)
+        self.camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT, WORLD_WIDTH, WORLD_HEIGHT)
+        self.culler = VisibilityCuller(self.camera)
+        self.island_index = SpatialGrid()
+        self.island_index.rebuild(self.islands)
         
         # Initialize enhanced sailing systems
         self.sailing_engine = SailingEngine()
         self.wind_system = WindSystem()
         self.navigation_data = NavigationData()
         
+        # Time of day and weather; everything reads the weather-adjusted wind
+        self.weather = WeatherSystem()
+        self.wind = WeatherWind(self.wind_system, self.weather)
+        self.base_fx_range = self.culler.fx_range
+        
         # Initialize enhanced UI systems
-        self.dock_menu = DockMenu()
-        self.wind_vane_system = WindVaneSystem(800, 600)
-        self.wave_effect = EnhancedWaveEffect(800, 600)
-        self.compass_display = CompassDisplay(700, 100)
+        self.dock_menu = DockMenu(self.dispatcher, self.catalog, self.market, self.fleet)
+        self.wind_vane_system = WindVaneSystem(SCREEN_WIDTH, SCREEN_HEIGHT, interest_radius=250, budget=self.memory)
+        self.wave_effect = EnhancedWaveEffect(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.ocean_renderer = OceanRenderer(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.ocean_enabled = True  # Heightfield water; O switches back to the line waves
+        self.compass_display = CompassDisplay(SCREEN_WIDTH - 100, 100)
         self.speed_display = SpeedDisplay(10, 200)
-        self.stall_warning = StallWarning()
+        self.overlays = ScreenOverlays(SCREEN_WIDTH, SCREEN_HEIGHT)  # Full-screen washes, one blit per frame
+        self.stall_warning = StallWarning(self.overlays)
         self.enhanced_wind_display = EnhancedWindDisplay(10, 300)
+        self.weather_renderer = WeatherRenderer(SCREEN_WIDTH, SCREEN_HEIGHT, budget=self.memory)
+        self.minimap = Minimap(SCREEN_WIDTH - 150, 205, 140, 105, self.camera.world_width, self.camera.world_height)
+        self.minimap.add_terrain(self.islands)
+        self.weather_renderer.prewarm(self.weather)
+        
+        # Graphics quality: a fixed preset, or auto stepping between presets to hold the frame rate
+        self.quality_mode = quality
+        self.auto_quality = AutoQuality(self.pacer.target_fps)
+        self.apply_quality(QUALITY_HIGH if quality == QUALITY_AUTO else quality)
         
         # State
         self.docked = False
         self.near_island = False
+        self.register_commands()
         
         # Fonts
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.font = LazyFont(36)
+        self.small_font = LazyFont(24)
         
         print("=== Privateers Legacy - Sprint 5 Enhanced ===")
         print("New Features:")
@@ -186,74 +254,185 @@ class EnhancedGame:
     def run(self):
         """Main game loop"""
         while self.running:
-            dt = self.clock.tick(60) / 1000.0  # Delta time in seconds
+            # Blocks on events while docked or minimized, caps FPS when unfocused
+            events, frame_dt = self.pacer.wait_for_frame(idle=self.docked)
+            if self.pacer.simulating:  # Idle waits while docked or minimized are not frame times
+                self.telemetry.frame(frame_dt)
+            self.memory_timer += frame_dt
+            if self.memory_timer >= MEMORY_REPORT_INTERVAL:
+                self.memory_timer = 0.0
+                self.telemetry.record(telemetry.EVENT_MEMORY, **self.memory.summary())
+            if self.quality_mode == QUALITY_AUTO and self.pacer.mode == PACE_ACTIVE:
+                level = self.auto_quality.sample(self.pacer.work_time, frame_dt)
+                if level is not None:
+                    self.apply_quality(level)
+                    self.telemetry.record(telemetry.EVENT_QUALITY, mode=QUALITY_AUTO, level=level,
+                                          work_ms=round(self.pacer.work_time * 1000, 2))
+            self.handle_events(events)
+            
+            if self.pacer.mode == PACE_MINIMIZED:
+                continue
+            
+            if self.pacer.mode == PACE_IDLE:
+                # Only dock menu timers run while docked
+                self.update(frame_dt)
+            else:
+                # Fixed-step simulation, independent of the visual frame rate
+                for _ in range(self.pacer.physics_steps(frame_dt)):
+                    self.update(self.pacer.physics_step)
+                    self.command_recorder.next_frame()
             
-            self.handle_events()
-            self.update(dt)
             self.draw()
         
+        self.world_sim.stop()
+        self.telemetry.record(telemetry.EVENT_MEMORY, **self.memory.summary())
+        self.telemetry.close()
+        if self.memory.trace:
+            print("\n".join(self.memory.report()))
         pygame.quit()
     
-    def handle_events(self):
+    def handle_events(self, events=None):
         """Handle pygame events"""
-        for event in pygame.event.get():
+        if events is None:
+            events = pygame.event.get()
+        
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
             
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # Window contents were lost, so the cached dock frame must be redrawn
+                self.dock_menu.mark_dirty()
+            
             elif event.type == pygame.KEYDOWN:
                 # Handle dock menu if active
                 if self.dock_menu.active:
-                    player_stats = {
-                        'gold': self.gold,
-                        'health': self.health
-                    }
-                    result = self.dock_menu.handle_input(event, self.crew_system, player_stats)
-                    if result:
-                        if result == "leave_port":
-                            self.docked = False
-                            self.game_state = GameState.MAIN_GAME
-                        elif isinstance(result, dict):
-                            # Handle dock menu actions
-                            if result['action'] == 'buy':
-                                print(f"Bought {result['quantity']} {result['commodity']} for {result['cost']} gold")
-                            elif result['action'] == 'sell':
-                                print(f"Sold {result['quantity']} {result['commodity']} for {result['value']} gold")
-                            elif result['action'] == 'repair':
-                                print(f"Ship repaired for {result['cost']} gold")
-                            elif result['action'] == 'recruit':
-                                self.crew_system.recruit_crew(result['count'])
-                                print(f"Recruited {result['count']} crew for {result['cost']} gold")
-                            
-                            # Update player stats
-                            self.gold = player_stats['gold']
-                            self.health = player_stats['health']
-                    return
+                    result = self.dock_menu.handle_input(event, self.player)
+                    if result == "leave_port":
+                        self.docked = False
+                        self.game_state = GameState.MAIN_GAME
+                        self.crew_speed_factor = self.player.speed_factor
+                        self.fleet.refresh_speeds(SAILING_CREW)
+                    elif isinstance(result, dict):
+                        self.dock_result_handlers[result['action']](result)
+                    continue
                 
                 # Main game controls
-                if event.key == pygame.K_ESCAPE:
-                    self.running = False
-                elif event.key == pygame.K_d:
-                    self.check_docking()
+                self.dispatcher.handle_key("sailing", event.key)
+    
+    def register_commands(self):
+        """Register sailing commands and dock result handlers"""
+        self.dispatcher.register_all("sailing", {
+            "quit": self.quit,
+            "dock": self.check_docking,
+            "fleet_orders": self.toggle_fleet_orders,
+            "toggle_ocean": self.toggle_ocean,
+            "cycle_quality": self.cycle_quality,
+            "world_map": self.minimap.toggle_full_map
+        })
+        
+        record = self.telemetry.record
+        self.dock_result_handlers = {
+            'buy': lambda result: record(telemetry.EVENT_TRADE, side="buy", commodity=result['commodity'],
+                                         quantity=result['quantity'], gold=result['cost']),
+            'sell': lambda result: record(telemetry.EVENT_TRADE, side="sell", commodity=result['commodity'],
+                                          quantity=result['quantity'], gold=result['value']),
+            'repair': lambda result: record(telemetry.EVENT_REPAIR, gold=result['cost'], health_restored=result['health_restored']),
+            'recruit': lambda result: record(telemetry.EVENT_RECRUIT, count=result['count'], gold=result['cost']),
+            'buy_ship': lambda result: record(telemetry.EVENT_BUY_SHIP, name=result['name'], gold=result['cost'])
+        }
+    
+    def quit(self):
+        """Stop the main loop"""
+        self.running = False
+    
+    def toggle_fleet_orders(self):
+        """Switch every escort between following in formation and holding position"""
+        if self.fleet.count < 2:
+            return
+        following = self.fleet.order[1] == ORDER_FOLLOW
+        self.fleet.order_all(ORDER_HOLD if following else ORDER_FOLLOW)
+        self.telemetry.record(telemetry.EVENT_ORDERS, order="hold" if following else "follow")
+    
+    def toggle_ocean(self):
+        """Switch between the heightfield ocean and the flat fill with line waves"""
+        self.ocean_enabled = not self.ocean_enabled
+    
+    def apply_quality(self, level):
+        """Set every effect from a graphics quality preset"""
+        settings = QUALITY_PRESETS[level]
+        self.quality = level
+        self.ocean_enabled = settings["ocean"]
+        if self.ocean_renderer.scale != settings["ocean_scale"]:
+            self.ocean_renderer = OceanRenderer(SCREEN_WIDTH, SCREEN_HEIGHT, settings["ocean_scale"], settings["ocean_rate"])
+        else:
+            self.ocean_renderer.keyframe_time = 1.0 / settings["ocean_rate"]
+        self.wave_effect.wave_spacing = settings["wave_spacing"]
+        self.wind_vane_system.spawn_count = settings["vane_spawn"]
+        self.wind_vane_system.spawn_interval = settings["vane_interval"]
+        self.stall_warning.overlay = settings["stall_overlay"]
+        self.weather_renderer.rain.density = settings["rain_density"]
+        self.wakes_enabled = settings["wakes"]
+        if not self.wakes_enabled:
+            self.wakes.clear()
+        self.base_fx_range = settings["fx_range"]
+        self.culler.fx_range = min(self.base_fx_range, self.weather.visibility)
+    
+    def cycle_quality(self):
+        """Step through the presets and auto mode"""
+        self.quality_mode = next_quality(self.quality_mode)
+        if self.quality_mode == QUALITY_AUTO:
+            self.auto_quality = AutoQuality(self.pacer.target_fps, self.quality)
+        else:
+            self.apply_quality(self.quality_mode)
+        self.telemetry.record(telemetry.EVENT_QUALITY, mode=self.quality_mode, level=self.quality)
+    
+    def islands_near(self, radius):
+        """Get the islands within radius of the ship from the spatial index, not a scan of every island"""
+        return [island for island in self.island_index.query_radius(self.ship.x, self.ship.y, radius)
+                if self.ship.get_distance_to(island) < radius]
     
     def check_docking(self):
         """Check if player can dock at nearby island"""
-        for island in self.islands:
-            distance = self.ship.get_distance_to(island)
-            if distance < 80:  # Docking range
-                if not self.docked:
-                    self.docked = True
-                    self.game_state = GameState.DOCKED
-                    player_stats = {
-                        'gold': self.gold,
-                        'health': self.health
-                    }
-                    self.dock_menu.activate(self.crew_system, player_stats)
-                    print("Docked at island!")
-                return
+        for island in self.islands_near(DOCK_RANGE):
+            if not self.docked:
+                self.docked = True
+                self.game_state = GameState.DOCKED
+                self.dock_menu.activate(self.player, island.port)
+                self.telemetry.record(telemetry.EVENT_DOCK, port=self.catalog.port_names[island.port])
+            return
+    
+    def end_day(self):
+        """Pay the crew and run their daily update"""
+        report = self.player.end_day()
+        self.crew_speed_factor = self.player.speed_factor
+        self.fleet.refresh_speeds(SAILING_CREW)
+        
+        self.telemetry.record(telemetry.EVENT_DAY, day=int(self.game_hours // 24), paid=report.paid,
+                              unpaid=report.unpaid, deserted=report.deserted, died=report.died)
     
     def update(self, dt):
         """Update game state"""
         if self.game_state == GameState.MAIN_GAME:
+            # Advance the game clock; the crew is updated once per game day
+            day = int(self.game_hours // 24)
+            self.game_hours += dt * GAME_HOURS_PER_SECOND
+            if int(self.game_hours // 24) > day:
+                self.end_day()
+            
+            # Hand the world a new hour to simulate and pick up finished ones
+            if int(self.game_hours) > self.world_hour:
+                self.world_hour = int(self.game_hours)
+                self.world_sim.request(self.world_hour, self.market)
+            for world_update in self.world_sim.poll():
+                world_update.apply(self.market)
+                self.world_update = world_update
+            
+            # Weather changes the wind and how far ahead we can see
+            self.weather.update(self.game_hours)
+            self.culler.full_detail_range = self.weather.visibility
+            self.culler.fx_range = min(self.base_fx_range, self.weather.visibility)
+            
             # Update enhanced sailing systems
             self.wind_system.update(dt)
             
@@ -261,19 +440,27 @@ class EnhancedGame:
             keys = pygame.key.get_pressed()
             
             # Update ship with enhanced physics
-            self.ship.update(keys, self.sailing_engine, self.wind_system, self.navigation_data, dt)
+            self.ship.update(keys, self.sailing_engine, self.wind, self.navigation_data, dt,
+                             self.crew_speed_factor)
+            self.fleet.update(dt, self.ship.x, self.ship.y, self.ship.heading)
+            ships = self.fleet.count
+            if self.wakes_enabled:
+                self.wakes.update(dt, self.fleet.x[:ships], self.fleet.y[:ships], self.fleet.heading[:ships])
             
             # Update enhanced UI systems
-            self.wind_vane_system.update(dt, self.wind_system.true_wind_direction, self.wind_system.true_wind_speed)
-            self.wave_effect.update(dt, self.wind_system.true_wind_direction, self.wind_system.true_wind_speed)
-            self.stall_warning.update(dt)
+            self.wind_vane_system.update(dt, self.wind.true_wind_direction, self.wind.true_wind_speed,
+                                         self.camera.world_to_screen(self.ship.x, self.ship.y))
+            if self.ocean_enabled:
+                self.ocean_renderer.update(dt, self.wind.true_wind_direction, self.wind.true_wind_speed,
+                                           self.camera.offset)
+            else:
+                self.wave_effect.update(dt, self.wind.true_wind_direction, self.wind.true_wind_speed)
+            self.weather_renderer.update(dt, self.weather, self.wind.true_wind_direction, self.wind.true_wind_speed)
+            self.stall_warning.update(dt, self.navigation_data)
+            self.overlays.update(dt)
             
             # Check proximity to islands
-            self.near_island = False
-            for island in self.islands:
-                if self.ship.get_distance_to(island) < 100:
-                    self.near_island = True
-                    break
+            self.near_island = bool(self.islands_near(APPROACH_RANGE))
         
         elif self.game_state == GameState.DOCKED:
             # Update dock menu
@@ -281,35 +468,54 @@ class EnhancedGame:
     
     def draw(self):
         """Draw the game"""
-        # Clear screen with ocean
-        self.screen.fill(self.ocean_color)
-        
-        # Draw enhanced wave effects
-        self.wave_effect.draw(self.screen)
-        
-        # Draw islands
-        for island in self.islands:
-            island.draw(self.screen)
-        
-        # Draw ship
-        self.ship.draw(self.screen)
+        # While docked the world is frozen, so the last frame is still valid
+        # unless the dock menu changed; skip drawing and flip() entirely
+        if self.dock_menu.active and not self.dock_menu.needs_redraw:
+            return
+        
+        self.camera.follow(self.ship.x, self.ship.y)
+        offset = self.camera.offset
+        
+        # Draw the ocean: animated heightfield, or a flat fill with line waves
+        if self.ocean_enabled:
+            self.ocean_renderer.draw(self.screen, offset)
+        else:
+            self.screen.fill(self.ocean_color)
+            self.wave_effect.draw(self.screen)
+        
+        # Wakes behind every ship within FX range
+        if self.wakes_enabled:
+            self.wakes.draw(self.screen, offset, self.camera.get_view_rect(16),
+                            (self.ship.x, self.ship.y), self.culler.fx_range)
+        
+        # Draw only the islands inside the camera view
+        for island, lod in self.culler.visible(self.island_index, self.ship.x, self.ship.y):
+            if lod == LOD_MARKER:
+                island.draw_marker(self.screen, offset)
+            else:
+                island.draw(self.screen, offset)
+        
+        # Traders and patrols from the world simulation, then escorts, then the flagship on top
+        self.draw_world_ships(offset)
+        self.draw_fleet(offset)
+        self.ship.draw(self.screen, offset)
         
         # Draw wind vanes (for strong wind)
         self.wind_vane_system.draw(self.screen)
         
+        # Light, fog and rain over the world, under the UI
+        self.weather_renderer.draw(self.screen, self.weather, self.camera.world_to_screen(self.ship.x, self.ship.y))
+        
         # Draw enhanced UI elements
         self.compass_display.draw(self.screen, self.navigation_data)
         self.speed_display.draw(self.screen, self.navigation_data)
         self.enhanced_wind_display.draw(self.screen, self.navigation_data)
-        self.stall_warning.draw(self.screen, self.navigation_data, 800, 600)
+        self.overlays.draw(self.screen)
+        self.stall_warning.draw(self.screen, self.navigation_data, SCREEN_WIDTH, SCREEN_HEIGHT)
         
         # Draw dock menu if active
         if self.dock_menu.active:
-            player_stats = {
-                'gold': self.gold,
-                'health': self.health
-            }
-            self.dock_menu.draw(self.screen, self.crew_system, player_stats)
+            self.dock_menu.draw(self.screen, self.player)
         
         # Draw HUD
         self.draw_hud()
@@ -319,28 +525,86 @@ class EnhancedGame:
             dock_text = self.small_font.render("Press D to dock", True, (255, 255, 0))
             self.screen.blit(dock_text, (350, 50))
         
+        # Minimap last, so the full-screen world map covers everything
+        if not self.dock_menu.active:
+            self.minimap.draw(self.screen, self.map_markers(), self.camera.get_view_rect())
+        
         pygame.display.flip()
     
+    def draw_fleet(self, offset):
+        """Draw the escort ships inside the camera view"""
+        fleet = self.fleet
+        left, top, width, height = self.camera.get_view_rect(self.ship.width)
+        for ship in range(1, fleet.count):
+            x, y = fleet.x[ship], fleet.y[ship]
+            if not (left <= x <= left + width and top <= y <= top + height):
+                continue
+            
+            screen_x = x + offset[0]
+            screen_y = y + offset[1]
+            ship_rect = pygame.Rect(screen_x - 12, screen_y - 8, 24, 16)
+            pygame.draw.rect(self.screen, (160, 90, 40), ship_rect)
+            
+            heading_rad = math.radians(fleet.heading[ship])
+            end_x = screen_x + math.sin(heading_rad) * 20
+            end_y = screen_y - math.cos(heading_rad) * 20
+            pygame.draw.line(self.screen, (255, 255, 255), (screen_x, screen_y), (end_x, end_y), 2)
+    
+    def draw_world_ships(self, offset):
+        """Draw the world simulation's ships inside the camera view at their place along their legs"""
+        if self.world_update is None:
+            return
+        xs, ys, headings = self.world_update.positions_at(self.game_hours)
+        left, top, width, height = self.camera.get_view_rect(16)
+        visible = (xs >= left) & (xs <= left + width) & (ys >= top) & (ys <= top + height)
+        kinds = self.world_update.kind
+        for ship in visible.nonzero()[0].tolist():
+            screen_x = xs[ship] + offset[0]
+            screen_y = ys[ship] + offset[1]
+            color = (200, 170, 110) if kinds[ship] == KIND_TRADER else (90, 90, 110)
+            pygame.draw.rect(self.screen, color, (screen_x - 9, screen_y - 6, 18, 12))
+            heading_rad = math.radians(headings[ship])
+            end_x = screen_x + math.sin(heading_rad) * 14
+            end_y = screen_y - math.cos(heading_rad) * 14
+            pygame.draw.line(self.screen, (255, 255, 255), (screen_x, screen_y), (end_x, end_y), 1)
+    
+    def map_markers(self):
+        """Get minimap markers for the flagship, its escorts and the world's traders and patrols"""
+        markers = []
+        if self.world_update is not None:
+            xs, ys, _ = self.world_update.positions_at(self.game_hours)
+            markers.extend(zip(xs.tolist(), ys.tolist(), [KIND_NAMES[kind] for kind in self.world_update.kind]))
+        markers.extend((self.fleet.x[ship], self.fleet.y[ship], 'escort') for ship in range(1, self.fleet.count))
+        markers.append((self.ship.x, self.ship.y, 'player'))
+        return markers
+    
     def draw_hud(self):
         """Draw the HUD"""
         # Ship name
-        name_text = self.font.render(self.ship_name, True, (255, 255, 255))
+        name_text = self.font.render(self.player.ship_name, True, (255, 255, 255))
         self.screen.blit(name_text, (10, 10))
         
         # Stats
-        health_text = self.small_font.render(f"Health: {self.health}", True, (255, 255, 255))
+        health_text = self.small_font.render(f"Health: {self.player.health}", True, (255, 255, 255))
         self.screen.blit(health_text, (10, 50))
         
-        gold_text = self.small_font.render(f"Gold: {self.gold}", True, (255, 215, 0))
+        gold_text = self.small_font.render(f"Gold: {self.player.gold}", True, (255, 215, 0))
         self.screen.blit(gold_text, (10, 75))
         
-        crew_text = self.small_font.render(f"Crew: {self.crew_system.get_crew_count()}/{self.crew_system.max_crew}", True, (255, 255, 255))
+        crew_text = f"Crew: {self.player.crew}/{self.player.max_crew}"
+        if self.fleet.count > 1:
+            crew_text += f"  Fleet: {self.fleet.count} ships"
+        crew_text = self.small_font.render(crew_text, True, (255, 255, 255))
         self.screen.blit(crew_text, (10, 100))
         
         # Wind info
-        wind_text = self.small_font.render(f"Wind: {self.wind_system.true_wind_speed:.1f} knots from {self.wind_system.true_wind_direction:.0f}°", True, (0, 255, 255))
+        wind_text = self.small_font.render(f"Wind: {self.wind.true_wind_speed:.1f} knots from {self.wind.true_wind_direction:.0f}°", True, (0, 255, 255))
         self.screen.blit(wind_text, (10, 125))
         
+        # Weather and time of day
+        weather_text = self.small_font.render(self.weather.describe(), True, (255, 255, 255))
+        self.screen.blit(weather_text, (SCREEN_WIDTH - 10 - weather_text.get_width(), 10))
+        
         # Speed info
         speed_text = self.small_font.render(f"Speed: {self.ship.current_speed:.1f} knots", True, (0, 255, 0))
         self.screen.blit(speed_text, (10, 150))
@@ -350,13 +614,22 @@ class EnhancedGame:
             instructions = [
                 "Arrow Keys: Steer",
                 "D: Dock at island",
+                "O: Toggle ocean detail",
+                f"G: Graphics ({self.quality_mode if self.quality_mode != QUALITY_AUTO else 'auto: ' + self.quality})",
+                "M: World map",
                 "ESC: Quit"
             ]
             for i, instruction in enumerate(instructions):
-                text = pygame.font.Font(None, 18).render(instruction, True, (200, 200, 200))
-                self.screen.blit(text, (10, 550 - i * 15))
+                text = get_font(18).render(instruction, True, (200, 200, 200))
+                self.screen.blit(text, (10, SCREEN_HEIGHT - 50 - i * 15))
 
 # Run the enhanced game
 if __name__ == "__main__":
-    game = EnhancedGame()
+    parser = argparse.ArgumentParser(description="Privateers Legacy - Sprint 5 Enhanced")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="track Python allocations with tracemalloc (slower) and print a memory report on exit")
+    parser.add_argument("--quality", choices=QUALITY_LEVELS + (QUALITY_AUTO,), default=QUALITY_AUTO,
+                        help="graphics quality preset, or auto to hold the frame rate (default: auto)")
+    args = parser.parse_args()
+    game = EnhancedGame(trace_memory=args.trace_memory, quality=args.quality)
     game.run()
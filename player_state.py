@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Player State
+Single authoritative player and ship state shared by every subsystem
+"""
+
+from array import array
+
+from crew import CrewRoster
+
+SAILING_CREW = 10  # Hands needed to sail at full speed
+GUN_CREW = 20      # Hands needed to work every gun
+RECRUIT_COST = 25  # Gold per sailor recruited in port
+REPAIR_COST = 10   # Gold per 10 hull points (or part of them) repaired
+
+class PlayerState:
+    """Gold, health, crew and cargo for the player's ship
+    
+    One instance is created by the game and passed by reference to the dock
+    menu, HUD, save code and simulators, so there is nothing to copy back.
+    Cargo is a fixed-size integer array indexed by commodity index; the
+    crew are individual sailors in a CrewRoster.
+    """
+    
+    __slots__ = ('ship_name', 'gold', 'health', 'max_health', 'roster', 'max_crew',
+                 'cargo', 'cargo_total', 'max_cargo')
+    
+    def __init__(self, commodity_count, ship_name="The Salty Squid", gold=500, health=100,
+                 crew=15, max_crew=30, max_cargo=100, roster=None):
+        """Initialize player state with an empty hold"""
+        self.ship_name = ship_name
+        self.gold = gold
+        self.health = health
+        self.max_health = 100
+        if roster is None:
+            roster = CrewRoster()
+            roster.hire(crew)
+        self.roster = roster
+        self.max_crew = max_crew
+        self.cargo = array('i', [0] * commodity_count)
+        self.cargo_total = 0
+        self.max_cargo = max_cargo
+    
+    @property
+    def crew(self):
+        """Number of living sailors aboard the flagship"""
+        return self.roster.size(0)
+    
+    @property
+    def speed_factor(self):
+        """Sailing speed multiplier from crew size, skill and morale"""
+        return self.roster.speed_factor(SAILING_CREW)
+    
+    @property
+    def combat_factor(self):
+        """Gunnery multiplier from crew size, skill, morale and health"""
+        return self.roster.combat_factor(GUN_CREW)
+    
+    @property
+    def repair_cost(self):
+        """Gold to repair the ship to full health"""
+        damage = max(0, self.max_health - self.health)
+        return -(-damage // 10) * REPAIR_COST
+    
+    @property
+    def free_cargo(self):
+        """Cargo space left in the hold"""
+        return self.max_cargo - self.cargo_total
+    
+    def add_cargo(self, index, quantity):
+        """Load cargo into the hold"""
+        self.cargo[index] += quantity
+        self.cargo_total += quantity
+    
+    def remove_cargo(self, index, quantity):
+        """Unload cargo from the hold"""
+        self.cargo[index] -= quantity
+        self.cargo_total -= quantity
+    
+    def can_recruit(self, count):
+        """Check if there is room for more crew"""
+        return self.crew + count <= self.max_crew
+    
+    def recruit(self, count):
+        """Add crew members if there is room"""
+        if self.can_recruit(count):
+            self.roster.hire(count)
+            return True
+        return False
+    
+    def end_day(self, at_sea=True):
+        """Run the crew's daily update and pay their wages"""
+        report = self.roster.daily_update(self.gold, at_sea)
+        self.gold -= report.paid
+        return report
+    
+    def to_dict(self):
+        """Get a JSON-serializable snapshot (for saves and replays)"""
+        return {
+            "ship_name": self.ship_name,
+            "gold": self.gold,
+            "health": self.health,
+            "crew": self.crew,
+            "roster": self.roster.to_dict(),
+            "max_crew": self.max_crew,
+            "cargo": list(self.cargo),
+            "max_cargo": self.max_cargo
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild player state from to_dict() output"""
+        roster = CrewRoster.from_dict(data["roster"]) if "roster" in data else None
+        state = cls(len(data["cargo"]), data["ship_name"], data["gold"], data["health"],
+                    data["crew"], data["max_crew"], data["max_cargo"], roster)
+        state.cargo = array('i', data["cargo"])
+        state.cargo_total = sum(state.cargo)
+        return state
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Screen Overlays
+Full-screen color washes (damage, stall, dimming, fades) from preallocated surfaces, composited in one blit
+"""
+
+import pygame
+
+# Overlay layers, bottom to top, and their colors
+OVERLAY_DAMAGE = "damage"
+OVERLAY_STALL = "stall"
+OVERLAY_DIM = "dim"
+OVERLAY_FADE = "fade"
+OVERLAY_LAYERS = (
+    (OVERLAY_DAMAGE, (255, 0, 0)),
+    (OVERLAY_STALL, (255, 0, 0)),
+    (OVERLAY_DIM, (0, 0, 0)),
+    (OVERLAY_FADE, (0, 0, 0))
+)
+
+class ScreenOverlays:
+    """Solid full-screen overlays at varying alpha, without per-frame surfaces
+    
+    Every overlay is a solid color, so one opaque surface per color is
+    filled once and only its set_alpha() changes from frame to frame.
+    Effects set their layer's alpha (0 turns it off) and draw() applies
+    them all: one active layer is a single blit of its color's surface;
+    several stacked layers are folded into the one color and alpha that
+    blending them in order would give, so they still cost a single blit.
+    """
+    
+    def __init__(self, width, height, layers=OVERLAY_LAYERS):
+        """Initialize overlays for a screen size (surfaces are made on first use)"""
+        self.size = (width, height)
+        self.order = [name for name, _ in layers]
+        self.colors = dict(layers)
+        self.alpha = {name: 0 for name in self.order}
+        self.fades = {}      # Layer -> (start alpha, target alpha, duration, elapsed)
+        self.surfaces = {}   # Color -> surface
+        self.composite = None
+        self.composite_color = None
+    
+    def set(self, name, alpha):
+        """Set a layer's opacity (0-255); 0 turns it off"""
+        self.alpha[name] = max(0, min(255, int(alpha)))
+    
+    def fade(self, name, target, seconds, start=None):
+        """Animate a layer's opacity to target over seconds (from start, or where it is now)"""
+        if start is not None:
+            self.set(name, start)
+        self.fades[name] = (self.alpha[name], target, seconds, 0.0)
+    
+    def update(self, dt):
+        """Advance running fades"""
+        for name, (start, target, duration, elapsed) in list(self.fades.items()):
+            elapsed += dt
+            if elapsed >= duration:
+                self.set(name, target)
+                del self.fades[name]
+            else:
+                self.set(name, start + (target - start) * elapsed / duration)
+                self.fades[name] = (start, target, duration, elapsed)
+    
+    def _surface(self, color):
+        """Get the preallocated surface for a color"""
+        surface = self.surfaces.get(color)
+        if surface is None:
+            surface = pygame.Surface(self.size)
+            surface.fill(color)
+            self.surfaces[color] = surface
+        return surface
+    
+    def draw(self, screen):
+        """Blend every active layer over the screen in one blit"""
+        active = [name for name in self.order if self.alpha[name] > 0]
+        if not active:
+            return
+        if len(active) == 1:
+            surface = self._surface(self.colors[active[0]])
+            surface.set_alpha(self.alpha[active[0]])
+            screen.blit(surface, (0, 0))
+            return
+        
+        # Blending layers in order: screen * (1 - A) + C * A with
+        # A = 1 - prod(1 - a_i) and C * A = sum(c_i * a_i * prod of (1 - a_j) above i)
+        red = green = blue = 0.0
+        clear = 1.0  # Share of the screen that shows through
+        for name in active:
+            alpha = self.alpha[name] / 255.0
+            red, green, blue = (channel * (1.0 - alpha) for channel in (red, green, blue))
+            color = self.colors[name]
+            red += color[0] * alpha
+            green += color[1] * alpha
+            blue += color[2] * alpha
+            clear *= 1.0 - alpha
+        coverage = 1.0 - clear
+        color = (int(red / coverage), int(green / coverage), int(blue / coverage))
+        
+        if self.composite is None:
+            self.composite = pygame.Surface(self.size)
+        if color != self.composite_color:
+            self.composite.fill(color)
+            self.composite_color = color
+        self.composite.set_alpha(int(round(coverage * 255)))
+        screen.blit(self.composite, (0, 0))
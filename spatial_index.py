@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Spatial Index
+Uniform grid spatial hash, camera and level-of-detail culling for world entities
+"""
+
+import math
+
+# Level-of-detail tiers (higher is more detailed)
+LOD_CULLED = 0   # Outside the camera view, not drawn at all
+LOD_MARKER = 1   # Far away, drawn as a simplified marker
+LOD_SIMPLE = 2   # Full sprite, but no wake or FX
+LOD_FULL = 3     # Full sprite with wake and FX
+
+class SpatialGrid:
+    """Uniform grid spatial hash for rectangle and radius queries
+    
+    Entities must provide get_bounds() returning (left, top, width, height)
+    in world coordinates. Each entity is bucketed into every cell its bounds
+    overlap, so queries only visit the cells they touch.
+    """
+    
+    def __init__(self, cell_size=128):
+        """Initialize an empty grid"""
+        self.cell_size = cell_size
+        self.cells = {}           # (cell_x, cell_y) -> list of entities
+        self.entity_ranges = {}   # entity -> (x0, y0, x1, y1) cell range
+    
+    def __len__(self):
+        return len(self.entity_ranges)
+    
+    def __contains__(self, entity):
+        return entity in self.entity_ranges
+    
+    def _cell_range(self, left, top, width, height):
+        """Get the inclusive cell range covered by a rectangle"""
+        size = self.cell_size
+        return (int(math.floor(left / size)), int(math.floor(top / size)),
+                int(math.floor((left + width) / size)), int(math.floor((top + height) / size)))
+    
+    def insert(self, entity):
+        """Add an entity to the grid"""
+        if entity in self.entity_ranges:
+            self.update(entity)
+            return
+        
+        cell_range = self._cell_range(*entity.get_bounds())
+        self.entity_ranges[entity] = cell_range
+        self._add_to_cells(entity, cell_range)
+    
+    def remove(self, entity):
+        """Remove an entity from the grid (no-op if absent)"""
+        cell_range = self.entity_ranges.pop(entity, None)
+        if cell_range is not None:
+            self._remove_from_cells(entity, cell_range)
+    
+    def update(self, entity):
+        """Re-bucket an entity after it moved
+        
+        Only touches the cell lists when the entity actually crossed a cell
+        boundary, which is the rare case for per-frame movement.
+        """
+        old_range = self.entity_ranges.get(entity)
+        if old_range is None:
+            self.insert(entity)
+            return
+        
+        new_range = self._cell_range(*entity.get_bounds())
+        if new_range != old_range:
+            self._remove_from_cells(entity, old_range)
+            self._add_to_cells(entity, new_range)
+            self.entity_ranges[entity] = new_range
+    
+    def rebuild(self, entities):
+        """Clear the grid and insert all entities"""
+        self.clear()
+        for entity in entities:
+            self.insert(entity)
+    
+    def clear(self):
+        """Remove every entity"""
+        self.cells.clear()
+        self.entity_ranges.clear()
+    
+    def _add_to_cells(self, entity, cell_range):
+        x0, y0, x1, y1 = cell_range
+        for cell_x in range(x0, x1 + 1):
+            for cell_y in range(y0, y1 + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if bucket is None:
+                    self.cells[(cell_x, cell_y)] = [entity]
+                else:
+                    bucket.append(entity)
+    
+    def _remove_from_cells(self, entity, cell_range):
+        x0, y0, x1, y1 = cell_range
+        for cell_x in range(x0, x1 + 1):
+            for cell_y in range(y0, y1 + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if bucket is None:
+                    continue
+                bucket.remove(entity)
+                if not bucket:
+                    del self.cells[(cell_x, cell_y)]
+    
+    def query_rect(self, left, top, width, height):
+        """Get all entities whose bounds intersect a rectangle"""
+        x0, y0, x1, y1 = self._cell_range(left, top, width, height)
+        right = left + width
+        bottom = top + height
+        
+        found = []
+        seen = set()
+        for cell_x in range(x0, x1 + 1):
+            for cell_y in range(y0, y1 + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if not bucket:
+                    continue
+                for entity in bucket:
+                    if entity in seen:
+                        continue
+                    seen.add(entity)
+                    e_left, e_top, e_width, e_height = entity.get_bounds()
+                    if (e_left < right and e_left + e_width > left and
+                            e_top < bottom and e_top + e_height > top):
+                        found.append(entity)
+        return found
+    
+    def query_radius(self, x, y, radius):
+        """Get all entities whose bounds come within radius of a point"""
+        found = []
+        radius_sq = radius * radius
+        for entity in self.query_rect(x - radius, y - radius, radius * 2, radius * 2):
+            e_left, e_top, e_width, e_height = entity.get_bounds()
+            # Closest point of the bounds to the query point
+            near_x = max(e_left, min(x, e_left + e_width))
+            near_y = max(e_top, min(y, e_top + e_height))
+            if (near_x - x) ** 2 + (near_y - y) ** 2 <= radius_sq:
+                found.append(entity)
+        return found
+
+class Camera:
+    """Viewport into the world, clamped to the world bounds"""
+    
+    def __init__(self, view_width, view_height, world_width=None, world_height=None):
+        """Initialize camera at the world origin"""
+        self.view_width = view_width
+        self.view_height = view_height
+        self.world_width = world_width if world_width is not None else view_width
+        self.world_height = world_height if world_height is not None else view_height
+        self.x = 0.0
+        self.y = 0.0
+    
+    def follow(self, target_x, target_y):
+        """Center the view on a world position, clamped to the world edges"""
+        max_x = max(0, self.world_width - self.view_width)
+        max_y = max(0, self.world_height - self.view_height)
+        self.x = max(0, min(max_x, target_x - self.view_width / 2))
+        self.y = max(0, min(max_y, target_y - self.view_height / 2))
+    
+    @property
+    def offset(self):
+        """Screen offset to add to world coordinates when drawing"""
+        return (-int(self.x), -int(self.y))
+    
+    def get_view_rect(self, margin=0):
+        """Get the visible world rectangle as (left, top, width, height)"""
+        return (self.x - margin, self.y - margin,
+                self.view_width + margin * 2, self.view_height + margin * 2)
+    
+    def world_to_screen(self, x, y):
+        """Convert world coordinates to screen coordinates"""
+        return (int(x - self.x), int(y - self.y))
+
+class VisibilityCuller:
+    """Selects visible entities from a spatial index and assigns LOD tiers
+    
+    Distance is measured from a focus point (normally the player ship) to the
+    center of each entity's bounds.
+    """
+    
+    def __init__(self, camera, full_detail_range=600, fx_range=400, margin=32):
+        """Initialize culler with LOD distance thresholds"""
+        self.camera = camera
+        self.full_detail_range = full_detail_range  # Beyond this, draw markers only
+        self.fx_range = fx_range                    # Beyond this, no wake or FX
+        self.margin = margin                        # Keeps sprites from popping at the edges
+    
+    def get_lod(self, entity, focus_x, focus_y):
+        """Get the LOD tier for an entity based on distance from the focus"""
+        left, top, width, height = entity.get_bounds()
+        dx = left + width / 2 - focus_x
+        dy = top + height / 2 - focus_y
+        distance_sq = dx * dx + dy * dy
+        
+        if distance_sq <= self.fx_range * self.fx_range:
+            return LOD_FULL
+        if distance_sq <= self.full_detail_range * self.full_detail_range:
+            return LOD_SIMPLE
+        return LOD_MARKER
+    
+    def visible(self, grid, focus_x, focus_y):
+        """Get (entity, lod) pairs for every entity inside the camera view"""
+        view_rect = self.camera.get_view_rect(self.margin)
+        return [(entity, self.get_lod(entity, focus_x, focus_y))
+                for entity in grid.query_rect(*view_rect)]
+    
+    def fx_enabled(self, entity, focus_x, focus_y):
+        """Check whether wake and FX should be drawn for an entity"""
+        return self.get_lod(entity, focus_x, focus_y) == LOD_FULL
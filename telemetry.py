@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Telemetry
+Typed gameplay events in a ring buffer, written in batches to rotating JSON-lines files
+"""
+
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+
+# Event types
+EVENT_TRADE = "trade"        # side ('buy'/'sell'), commodity, quantity, gold
+EVENT_REPAIR = "repair"      # gold, health_restored
+EVENT_RECRUIT = "recruit"    # count, gold
+EVENT_BUY_SHIP = "buy_ship"  # name, gold
+EVENT_DOCK = "dock"          # port
+EVENT_PORT_ACTION = "port_action"  # action chosen in the classic dock menu
+EVENT_HIT = "hit"            # target, cannonballs or damage, health
+EVENT_PLUNDER = "plunder"    # gold
+EVENT_DAY = "day"            # day, paid, unpaid, deserted, died
+EVENT_SAVE = "save"          # gold, health
+EVENT_LOAD = "load"          # found
+EVENT_ORDERS = "orders"      # order
+EVENT_QUALITY = "quality"    # mode, level (work_ms when auto changed it)
+EVENT_MEMORY = "memory"      # live FX counts per subsystem, surface_mib, traced_mib when tracing
+EVENT_FRAMES = "frames"      # frames, mean_ms, p95_ms, max_ms (one summary per interval)
+
+BUFFER_SIZE = 4096           # Events held before the oldest are dropped
+FLUSH_INTERVAL = 1.0         # Seconds between background writes
+FRAME_SUMMARY_INTERVAL = 10.0  # Seconds of frames per frame-time summary
+MAX_FILE_BYTES = 1024 * 1024   # Rotate the log at this size
+BACKUP_COUNT = 4             # Rotated files kept (events.1.jsonl is the newest)
+TELEMETRY_DIR = "telemetry"
+LOG_NAME = "events.jsonl"
+HISTOGRAM_MS = 100           # Frame-time histogram: 1 ms buckets up to this, then one overflow bucket
+
+class Telemetry:
+    """Buffered event log for the game loop
+    
+    record() only appends a small tuple to a ring buffer under a lock, so
+    it costs about the same as a list append on the main thread. A daemon
+    thread wakes every flush_interval (or as soon as the buffer is half
+    full), swaps the buffer out and writes the batch as compact JSON lines,
+    rotating files like logging's RotatingFileHandler. If the writer falls
+    behind, the oldest events are dropped and counted rather than ever
+    blocking the frame loop. With echo on, the writer thread also prints a
+    short line per event in place of the game's old console messages.
+    """
+    
+    def __init__(self, directory=TELEMETRY_DIR, capacity=BUFFER_SIZE, flush_interval=FLUSH_INTERVAL,
+                 max_bytes=MAX_FILE_BYTES, backup_count=BACKUP_COUNT, echo=True, enabled=True):
+        """Initialize the buffer and start the writer thread"""
+        self.directory = directory
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.echo = echo
+        self.enabled = enabled
+        self.started = time.time()
+        
+        self.buffer = deque()
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.dropped = 0
+        self.running = enabled
+        
+        # Frame-time summary, aggregated on the main thread
+        self.frame_histogram = [0] * (HISTOGRAM_MS + 1)
+        self.frame_count = 0
+        self.frame_total = 0.0
+        self.frame_max = 0.0
+        self.frame_window = 0.0
+        
+        self.thread = None
+        if enabled:
+            self.thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+            self.thread.start()
+    
+    def record(self, event_type, **fields):
+        """Queue one event (cheap; never does I/O)"""
+        if not self.enabled:
+            return
+        event = (round(time.time() - self.started, 3), event_type, fields)
+        with self.lock:
+            if len(self.buffer) >= self.capacity:
+                self.buffer.popleft()
+                self.dropped += 1
+            self.buffer.append(event)
+            half_full = len(self.buffer) >= self.capacity // 2
+        if half_full:
+            self.wake.set()
+    
+    def frame(self, dt):
+        """Add one frame time (seconds); emits a frames summary every FRAME_SUMMARY_INTERVAL"""
+        milliseconds = dt * 1000.0
+        self.frame_histogram[min(HISTOGRAM_MS, int(milliseconds))] += 1
+        self.frame_count += 1
+        self.frame_total += milliseconds
+        self.frame_max = max(self.frame_max, milliseconds)
+        self.frame_window += dt
+        if self.frame_window >= FRAME_SUMMARY_INTERVAL:
+            self.flush_frames()
+    
+    def flush_frames(self):
+        """Record the frame-time summary so far and start a new window"""
+        if not self.frame_count:
+            return
+        # 95th percentile from the histogram: the bucket where the running count passes 95%
+        threshold = self.frame_count * 0.95
+        running = 0
+        p95 = HISTOGRAM_MS
+        for bucket, count in enumerate(self.frame_histogram):
+            running += count
+            if running >= threshold:
+                p95 = min(bucket + 1, self.frame_max)
+                break
+        self.record(EVENT_FRAMES, frames=self.frame_count, mean_ms=round(self.frame_total / self.frame_count, 2),
+                    p95_ms=round(p95, 2), max_ms=round(self.frame_max, 2))
+        self.frame_histogram = [0] * (HISTOGRAM_MS + 1)
+        self.frame_count = 0
+        self.frame_total = 0.0
+        self.frame_max = 0.0
+        self.frame_window = 0.0
+    
+    def close(self):
+        """Summarize the last frames, write everything still buffered and stop the writer"""
+        if not self.enabled:
+            return
+        self.flush_frames()
+        self.running = False
+        self.wake.set()
+        if self.thread is not None:
+            self.thread.join(2.0)
+    
+    # Writer thread
+    
+    def _run(self):
+        while self.running:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self._write_batch()
+        self._write_batch()
+    
+    def _take_batch(self):
+        with self.lock:
+            batch = self.buffer
+            self.buffer = deque()
+            dropped = self.dropped
+            self.dropped = 0
+        return batch, dropped
+    
+    def _write_batch(self):
+        batch, dropped = self._take_batch()
+        if not batch and not dropped:
+            return
+        lines = []
+        for elapsed, event_type, fields in batch:
+            lines.append(json.dumps({"t": elapsed, "type": event_type, **fields}, separators=(",", ":")))
+            if self.echo:
+                details = " ".join(f"{name}={value}" for name, value in fields.items())
+                print(f"[{event_type}] {details}")
+        if dropped:
+            lines.append(json.dumps({"t": round(time.time() - self.started, 3), "type": "dropped",
+                                     "count": dropped}, separators=(",", ":")))
+        try:
+            self._write_lines(lines)
+        except OSError as error:
+            # Telemetry must never take the game down; give up on this batch
+            print(f"Telemetry write failed: {error}")
+    
+    def _write_lines(self, lines):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, LOG_NAME)
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        if os.path.exists(path) and os.path.getsize(path) + len(data) > self.max_bytes:
+            self._rotate(path)
+        with open(path, 'ab') as f:
+            f.write(data)
+    
+    def _rotate(self, path):
+        """events.jsonl -> events.1.jsonl -> ... -> events.<backup_count>.jsonl (dropped)"""
+        stem, extension = os.path.splitext(path)
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{stem}.{index}{extension}"
+            if os.path.exists(source):
+                os.replace(source, f"{stem}.{index + 1}{extension}")
+        if self.backup_count > 0:
+            os.replace(path, f"{stem}.1{extension}")
+        else:
+            os.remove(path)
+
+def read_events(directory=TELEMETRY_DIR):
+    """Yield every logged event, oldest file first"""
+    stem, extension = os.path.splitext(os.path.join(directory, LOG_NAME))
+    rotated = glob.glob(f"{stem}.*{extension}")
+    rotated.sort(key=lambda name: int(name[len(stem) + 1:-len(extension)]), reverse=True)
+    for path in rotated + [stem + extension]:
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+def analyze(events):
+    """Summarize events into a dict of counts, gold flows and frame times"""
+    counts = Counter()
+    gold = Counter()
+    traded = Counter()
+    docks = Counter()
+    frames = 0
+    frame_total = 0.0
+    worst_p95 = 0
+    worst_frame = 0.0
+    for event in events:
+        event_type = event["type"]
+        counts[event_type] += 1
+        if event_type == EVENT_TRADE:
+            gold["earned" if event["side"] == "sell" else "spent"] += event["gold"]
+            traded[(event["side"], event["commodity"])] += event["quantity"]
+        elif event_type in (EVENT_REPAIR, EVENT_RECRUIT, EVENT_BUY_SHIP):
+            gold["spent"] += event["gold"]
+        elif event_type == EVENT_PLUNDER:
+            gold["earned"] += event["gold"]
+        elif event_type == EVENT_DAY:
+            gold["wages"] += event["paid"]
+        elif event_type == EVENT_DOCK:
+            docks[event["port"]] += 1
+        elif event_type == EVENT_FRAMES:
+            frames += event["frames"]
+            frame_total += event["mean_ms"] * event["frames"]
+            worst_p95 = max(worst_p95, event["p95_ms"])
+            worst_frame = max(worst_frame, event["max_ms"])
+    return {
+        "counts": counts,
+        "gold": gold,
+        "traded": traded,
+        "docks": docks,
+        "frames": frames,
+        "mean_frame_ms": frame_total / frames if frames else 0.0,
+        "worst_p95_ms": worst_p95,
+        "worst_frame_ms": worst_frame
+    }
+
+def main():
+    """Offline analyzer: summarize the telemetry logs"""
+    parser = argparse.ArgumentParser(description="Summarize Privateers Legacy telemetry logs")
+    parser.add_argument("directory", nargs="?", default=TELEMETRY_DIR, help="telemetry directory")
+    args = parser.parse_args()
+    
+    summary = analyze(read_events(args.directory))
+    if not summary["counts"]:
+        print(f"No events in {args.directory}")
+        return
+    
+    print("Events:")
+    for event_type, count in summary["counts"].most_common():
+        print(f"  {event_type}: {count}")
+    gold = summary["gold"]
+    print(f"Gold: earned {gold['earned']}, spent {gold['spent']}, wages {gold['wages']}")
+    if summary["traded"]:
+        print("Goods traded:")
+        for (side, commodity), quantity in sorted(summary["traded"].items()):
+            print(f"  {side} {commodity}: {quantity}")
+    if summary["docks"]:
+        print("Port visits: " + ", ".join(f"{port} x{count}" for port, count in summary["docks"].most_common()))
+    if summary["frames"]:
+        print(f"Frames: {summary['frames']}, mean {summary['mean_frame_ms']:.2f} ms, "
+              f"worst p95 {summary['worst_p95_ms']} ms, worst frame {summary['worst_frame_ms']:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Tests for the batched trading rules and the supply-curve price model"""
+
+import pytest
+
+from catalog import Catalog, Market
+from player_state import PlayerState
+import trading
+
+PRICE = 20
+
+@pytest.fixture
+def catalog():
+    return Catalog([{"name": "Rum", "base_price": PRICE, "price_variation": 0.0}],
+                   [{"name": "Port", "x": 0, "y": 0, "commodities": ["Rum"]}])
+
+def fresh(catalog, stock=100, cargo=0, gold=100000):
+    """A one-port market at PRICE and a player with some rum aboard"""
+    market = Market(catalog)
+    market.set_price(0, 0, PRICE)
+    market.stock[0][0] = stock
+    player = PlayerState(1, gold=gold, max_cargo=1000)
+    player.add_cargo(0, cargo)
+    return market, player
+
+def test_duplicate_buys_cannot_oversell_stock(catalog):
+    market, player = fresh(catalog, stock=14)
+    result = trading.execute_trades(market, 0, player, buys=[(0, 14), (0, 14)])
+    assert not result.ok
+    assert market.stock[0][0] == 14
+    assert player.cargo[0] == 0
+
+def test_duplicate_sells_cannot_sell_missing_cargo(catalog):
+    market, player = fresh(catalog, stock=0, cargo=28)
+    result = trading.execute_trades(market, 0, player, sells=[(0, 28), (0, 28)])
+    assert not result.ok
+    assert player.cargo[0] == 28
+    assert player.cargo_total == 28
+
+@pytest.mark.parametrize("chunk", [1, 10])
+def test_split_buys_follow_the_supply_curve(catalog, chunk):
+    split_market, split_player = fresh(catalog)
+    whole_market, whole_player = fresh(catalog)
+    orders = 100 // chunk
+    for _ in range(orders):
+        assert trading.execute_trades(split_market, 0, split_player, buys=[(0, chunk)]).ok
+    whole = trading.execute_trades(whole_market, 0, whole_player, buys=[(0, 100)])
+    assert whole.ok
+    
+    spent = 100000 - split_player.gold
+    # Splitting never beats one order; each order rounds up by less than a gold piece
+    assert whole.cost <= spent <= whole.cost + orders
+    assert split_market.prices[0][0] == pytest.approx(whole_market.prices[0][0])
+    assert split_market.stock[0][0] == whole_market.stock[0][0]
+
+@pytest.mark.parametrize("chunk", [1, 10])
+def test_split_sells_follow_the_supply_curve(catalog, chunk):
+    split_market, split_player = fresh(catalog, stock=0, cargo=100)
+    whole_market, whole_player = fresh(catalog, stock=0, cargo=100)
+    orders = 100 // chunk
+    for _ in range(orders):
+        assert trading.execute_trades(split_market, 0, split_player, sells=[(0, chunk)]).ok
+    whole = trading.execute_trades(whole_market, 0, whole_player, sells=[(0, 100)])
+    assert whole.ok
+    
+    earned = split_player.gold - 100000
+    assert whole.value - orders <= earned <= whole.value
+    assert split_market.prices[0][0] == pytest.approx(whole_market.prices[0][0])
+
+def test_single_unit_trades_move_cheap_prices(catalog):
+    market, player = fresh(catalog)
+    trading.execute_trades(market, 0, player, buys=[(0, 1)])
+    assert market.prices[0][0] > PRICE
+    trading.execute_trades(market, 0, player, sells=[(0, 1)])
+    assert market.prices[0][0] == pytest.approx(PRICE)
+
+def test_round_trip_never_pays(catalog):
+    market, player = fresh(catalog)
+    for quantity in (1, 7, 40):
+        trading.execute_trades(market, 0, player, buys=[(0, quantity)])
+        trading.execute_trades(market, 0, player, sells=[(0, quantity)])
+    assert player.gold <= 100000
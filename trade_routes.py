@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Trade Route Optimizer
+Finds the most profitable multi-stop trade route under cargo and time limits
+"""
+
+import argparse
+import math
+import random
+import time
+
+from catalog import Catalog, Market
+import trading
+
+DEFAULT_SAIL_SPEED = 100.0  # World units per game hour
+DEFAULT_TIME_BUDGET = 24.0  # Game hours
+STATE_BUDGET = 4000         # Route states kept per time bucket, shared out over the ports
+MIN_STATES_PER_BUCKET = 8   # ...but never fewer than this
+
+class TradeLeg:
+    """One leg of a route: buy at origin, sail, sell at destination"""
+    
+    __slots__ = ('origin', 'destination', 'commodity', 'quantity', 'profit', 'travel_time', 'gold_limited')
+    
+    def __init__(self, origin, destination, commodity, quantity, profit, travel_time, gold_limited=False):
+        self.origin = origin
+        self.destination = destination
+        self.commodity = commodity
+        self.quantity = quantity
+        self.profit = profit
+        self.travel_time = travel_time
+        self.gold_limited = gold_limited  # More gold would have bought more
+
+class TradeRoute:
+    """A sequence of legs starting at one port"""
+    
+    def __init__(self, start, legs):
+        """Initialize route from its legs"""
+        self.start = start
+        self.legs = legs
+        self.profit = sum(leg.profit for leg in legs)
+        self.travel_time = sum(leg.travel_time for leg in legs)
+    
+    @property
+    def ports(self):
+        return [self.start] + [leg.destination for leg in self.legs]
+    
+    def describe(self, catalog):
+        """Get one human-readable line per leg"""
+        lines = []
+        for leg in self.legs:
+            origin = catalog.port_names[leg.origin]
+            destination = catalog.port_names[leg.destination]
+            lines.append(f"{origin} -> {destination}: {leg.quantity} "
+                         f"{catalog.commodity_names[leg.commodity]}, +{leg.profit} gold "
+                         f"({leg.travel_time:.1f}h)")
+        return lines
+
+class TradeRouteOptimizer:
+    """Dynamic-programming route search over ports using the dock trading rules
+    
+    A leg buys one commodity at the origin (limited by cargo space, stock
+    and gold) and sells it all at the destination. Leg results are memoized
+    until the market changes. The search is a DP over (time bucket, port)
+    that only follows each port's most profitable outgoing legs, to the
+    ports paying the most for its goods, and keeps only the best states
+    per bucket (fewer the more ports there are), which keeps it
+    interactive for hundreds of ports.
+    
+    Each route state remembers how much of every good it bought or sold
+    where, and its gold so far. A leg trading a good the route already
+    moved in the same port is priced again along the supply curve, so a
+    route cannot sell the same cheap stock twice.
+    """
+    
+    def __init__(self, catalog, market, sail_speed=DEFAULT_SAIL_SPEED, time_step=1.0,
+                 candidates_per_port=8):
+        """Initialize optimizer"""
+        self.catalog = catalog
+        self.market = market
+        self.sail_speed = sail_speed
+        self.time_step = time_step                      # DP time resolution in hours
+        self.candidates_per_port = candidates_per_port  # Outgoing legs explored per port
+        
+        self.travel_times = {}  # Static: depends only on port positions
+        self.legs = {}          # (origin, destination) -> TradeLeg
+        self.successors = {}    # origin -> best outgoing legs
+        self.buyers = {}        # commodity -> ports paying the most for it, best first
+        self.leg_limits = None  # (max_cargo, gold) the memoized legs were built for
+    
+    def invalidate(self):
+        """Forget memoized legs (call after prices or stock change)"""
+        self.legs.clear()
+        self.successors.clear()
+        self.buyers.clear()
+    
+    def best_buyers(self, commodity):
+        """Get the candidates_per_port ports paying the most for a commodity (memoized)"""
+        ports = self.buyers.get(commodity)
+        if ports is None:
+            prices = self.market.prices
+            ports = sorted(self.catalog.commodity_ports[commodity], key=lambda port: prices[port][commodity],
+                           reverse=True)[:self.candidates_per_port]
+            self.buyers[commodity] = ports
+        return ports
+    
+    def travel_time(self, origin, destination):
+        """Get sailing time between two ports in game hours"""
+        key = (origin, destination) if origin < destination else (destination, origin)
+        hours = self.travel_times.get(key)
+        if hours is None:
+            x1, y1 = self.catalog.port_positions[origin]
+            x2, y2 = self.catalog.port_positions[destination]
+            hours = math.hypot(x2 - x1, y2 - y1) / self.sail_speed
+            self.travel_times[key] = hours
+        return hours
+    
+    def leg(self, origin, destination, max_cargo, gold):
+        """Get the best single-commodity trade between two ports (memoized)"""
+        if self.leg_limits != (max_cargo, gold):
+            self.invalidate()
+            self.leg_limits = (max_cargo, gold)
+        
+        key = (origin, destination)
+        cached = self.legs.get(key)
+        if cached is not None:
+            return cached
+        
+        buy_prices = self.market.prices[origin]
+        sell_prices = self.market.prices[destination]
+        stock = self.market.stock[origin]
+        
+        best_commodity = -1
+        best_quantity = 0
+        best_profit = 0
+        gold_limited = False
+        for commodity in self.catalog.port_commodities[origin]:
+            buy_price = buy_prices[commodity]
+            sell_price = sell_prices[commodity]
+            if sell_price <= buy_price:
+                continue
+            # Same supply-curve pricing as the dock menu
+            limit = trading.max_affordable(buy_price, stock[commodity], gold, max_cargo)
+            quantity = trading.best_quantity(buy_price, sell_price, limit)
+            profit = trading.trade_profit(buy_price, sell_price, quantity)
+            if profit > best_profit:
+                best_commodity = commodity
+                best_quantity = quantity
+                best_profit = profit
+                gold_limited = limit < min(stock[commodity], max_cargo)
+        
+        leg = TradeLeg(origin, destination, best_commodity, best_quantity, best_profit,
+                       self.travel_time(origin, destination), gold_limited)
+        self.legs[key] = leg
+        return leg
+    
+    def get_successors(self, origin, max_cargo, gold):
+        """Get the most profitable outgoing legs from a port (memoized)"""
+        if self.leg_limits != (max_cargo, gold):
+            self.invalidate()
+            self.leg_limits = (max_cargo, gold)
+        
+        legs = self.successors.get(origin)
+        if legs is None:
+            # Only the ports paying the most for something sold here are worth a leg
+            destinations = set()
+            for commodity in self.catalog.port_commodities[origin]:
+                destinations.update(self.best_buyers(commodity))
+            destinations.discard(origin)
+            
+            legs = [self.leg(origin, destination, max_cargo, gold) for destination in destinations]
+            legs = [leg for leg in legs if leg.profit > 0]
+            legs.sort(key=lambda leg: leg.profit / max(leg.travel_time, self.time_step), reverse=True)
+            legs = legs[:self.candidates_per_port]
+            self.successors[origin] = legs
+        return legs
+    
+    def leg_on_route(self, leg, traded, gold, max_cargo):
+        """Price a memoized leg for a route that has already traded (None: no longer profitable)
+        
+        traded maps (port, commodity) to the net quantity the route bought
+        there so far (negative: sold). The leg is priced again from the
+        market as the route left it, and with the route's own gold if the
+        memoized leg ran out of gold.
+        """
+        bought = traded.get((leg.origin, leg.commodity), 0)
+        sold = traded.get((leg.destination, leg.commodity), 0)
+        if not bought and not sold and not (leg.gold_limited and gold > self.leg_limits[1]):
+            return leg
+        
+        buy_price = self.market.prices[leg.origin][leg.commodity]
+        sell_price = self.market.prices[leg.destination][leg.commodity]
+        if bought:
+            buy_price = trading.price_after(buy_price, bought)
+        if sold:
+            sell_price = trading.price_after(sell_price, sold)
+        stock = self.market.stock[leg.origin][leg.commodity] - bought
+        limit = trading.max_affordable(buy_price, stock, gold, max_cargo)
+        quantity = trading.best_quantity(buy_price, sell_price, limit)
+        profit = trading.trade_profit(buy_price, sell_price, quantity)
+        if profit <= 0:
+            return None
+        return TradeLeg(leg.origin, leg.destination, leg.commodity, quantity, profit, leg.travel_time,
+                        limit < min(stock, max_cargo))
+    
+    def best_route(self, start, max_cargo=100, gold=500, time_budget=DEFAULT_TIME_BUDGET):
+        """Find the most profitable route from a port within a time budget"""
+        buckets = int(time_budget / self.time_step)
+        states_per_bucket = max(MIN_STATES_PER_BUCKET, STATE_BUDGET // max(1, self.catalog.port_count))
+        
+        # best[t][port] = (profit, previous (t, port), leg, traded) arriving at port at bucket t
+        best = [dict() for _ in range(buckets + 1)]
+        best[0][start] = (0, None, None, {})
+        top = (0, 0, start)
+        
+        for t in range(buckets + 1):
+            states = best[t].items()
+            if len(best[t]) > states_per_bucket:
+                states = sorted(states, key=lambda item: item[1][0], reverse=True)[:states_per_bucket]
+            for port, (profit, _, _, traded) in states:
+                for leg in self.get_successors(port, max_cargo, gold):
+                    arrival = t + max(1, int(math.ceil(leg.travel_time / self.time_step)))
+                    if arrival > buckets:
+                        continue
+                    leg = self.leg_on_route(leg, traded, gold + profit, max_cargo)
+                    if leg is None:
+                        continue
+                    total = profit + leg.profit
+                    current = best[arrival].get(leg.destination)
+                    if current is None or total > current[0]:
+                        moved = dict(traded)
+                        moved[(leg.origin, leg.commodity)] = moved.get((leg.origin, leg.commodity), 0) + leg.quantity
+                        moved[(leg.destination, leg.commodity)] = (moved.get((leg.destination, leg.commodity), 0)
+                                                                   - leg.quantity)
+                        best[arrival][leg.destination] = (total, (t, port), leg, moved)
+                        if total > top[0]:
+                            top = (total, arrival, leg.destination)
+        
+        # Walk the back-pointers from the best state
+        legs = []
+        _, t, port = top
+        while True:
+            _, previous, leg, _ = best[t][port]
+            if previous is None:
+                break
+            legs.append(leg)
+            t, port = previous
+        legs.reverse()
+        return TradeRoute(start, legs)
+
+def random_catalog(port_count, commodity_count, rng, world_size=2000):
+    """Build a synthetic catalog for benchmarking and balance experiments"""
+    commodities = [{"name": f"Good {i}", "base_price": rng.randint(8, 60),
+                    "price_variation": rng.uniform(0.2, 0.6)} for i in range(commodity_count)]
+    ports = []
+    for i in range(port_count):
+        traded = rng.sample(commodities, min(commodity_count, rng.randint(3, 8)))
+        ports.append({"name": f"Port {i}", "x": rng.uniform(0, world_size), "y": rng.uniform(0, world_size),
+                      "commodities": [c["name"] for c in traded]})
+    return Catalog(commodities, ports)
+
+def main():
+    """Batch tool: print the best route from every port"""
+    parser = argparse.ArgumentParser(description="Find the most profitable trade routes")
+    parser.add_argument("--catalog", help="catalog JSON file (default: data/catalog.json)")
+    parser.add_argument("--random-ports", type=int, default=0,
+                        help="use a synthetic catalog with this many ports instead")
+    parser.add_argument("--hours", type=float, default=DEFAULT_TIME_BUDGET, help="time budget in game hours")
+    parser.add_argument("--cargo", type=int, default=100, help="cargo capacity")
+    parser.add_argument("--gold", type=int, default=500, help="starting gold")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for prices")
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    if args.random_ports:
+        catalog = random_catalog(args.random_ports, 40, rng)
+    elif args.catalog:
+        catalog = Catalog.load(args.catalog)
+    else:
+        catalog = Catalog.load()
+    market = Market(catalog, rng)
+    optimizer = TradeRouteOptimizer(catalog, market)
+    
+    for start in range(catalog.port_count):
+        started = time.perf_counter()
+        route = optimizer.best_route(start, args.cargo, args.gold, args.hours)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{catalog.port_names[start]}: {route.profit} gold in {route.travel_time:.1f}h "
+              f"({elapsed:.1f} ms)")
+        for line in route.describe(catalog):
+            print(f"    {line}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Trading Rules
+Quantity-aware pricing and batched, all-or-nothing trade execution
+"""
+
+import math
+
+# Supply curve: every unit bought raises the listed price by a factor of
+# PRICE_STEP and every unit sold lowers it by the same factor, so totals
+# are geometric series with closed forms. The first unit bought costs the
+# listed price and the first unit sold pays one step below it; buying and
+# selling straight back therefore nets nothing (less round-off, which
+# always goes to the market). Listed prices are unrounded floats, so the
+# price after a trade does not depend on how the trade was split up.
+PRICE_STEP = 1.0125  # About +28% after 20 units, +64% after 40
+
+def buy_cost(price, quantity):
+    """Total cost of buying quantity units (unit k costs price * step ** k)"""
+    if quantity <= 0:
+        return 0
+    return math.ceil(price * (PRICE_STEP ** quantity - 1) / (PRICE_STEP - 1) - 1e-6)
+
+def sell_value(price, quantity):
+    """Total gold for selling quantity units (unit k pays price / step ** (k + 1))"""
+    if quantity <= 0:
+        return 0
+    return int(price * (1 - PRICE_STEP ** -quantity) / (PRICE_STEP - 1) + 1e-6)
+
+def price_after(price, quantity):
+    """Listed unit price after buying (quantity > 0) or selling (quantity < 0)
+    
+    Not rounded: rounding every step would stop single-unit trades from
+    moving a cheap good's price at all.
+    """
+    return max(1.0, price * PRICE_STEP ** quantity)
+
+def max_affordable(price, stock, gold, cargo_space):
+    """Largest quantity that fits the hold, the stock and the purse"""
+    limit = min(stock, cargo_space)
+    if limit <= 0 or gold < price:
+        return 0
+    # Invert the buy_cost series, then correct for its rounding
+    quantity = min(limit, int(math.log(1 + gold * (PRICE_STEP - 1) / price, PRICE_STEP)))
+    while quantity > 0 and buy_cost(price, quantity) > gold:
+        quantity -= 1
+    while quantity < limit and buy_cost(price, quantity + 1) <= gold:
+        quantity += 1
+    return quantity
+
+def best_quantity(buy_price, sell_price, limit):
+    """Most profitable quantity to carry between two markets (at most limit)
+    
+    Unit k is worth carrying while sell_price / step ** (k + 1) exceeds
+    buy_price * step ** k, so the count comes straight from a logarithm.
+    """
+    if sell_price <= buy_price or limit <= 0:
+        return 0
+    steps = math.log(sell_price / buy_price, PRICE_STEP)
+    return max(0, min(limit, math.ceil((steps - 1) / 2)))
+
+def trade_profit(buy_price, sell_price, quantity):
+    """Profit from buying quantity units in one market and selling them in another"""
+    return sell_value(sell_price, quantity) - buy_cost(buy_price, quantity)
+
+class TradeResult:
+    """Outcome of a trade batch"""
+    
+    __slots__ = ('ok', 'error', 'bought', 'sold', 'cost', 'value')
+    
+    def __init__(self, ok, error="", bought=None, sold=None, cost=0, value=0):
+        self.ok = ok
+        self.error = error
+        self.bought = bought or []  # (commodity, quantity, cost)
+        self.sold = sold or []      # (commodity, quantity, value)
+        self.cost = cost
+        self.value = value
+
+def execute_trades(market, port, player, buys=(), sells=()):
+    """Execute a batch of buys and sells at one port as a single transaction
+    
+    buys and sells are sequences of (commodity index, quantity). Sales are
+    settled first, so their gold and cargo space can fund the purchases.
+    Orders are validated and priced in sequence against running cargo,
+    stock and prices, so repeating a commodity costs what one larger order
+    would. Everything is validated before anything changes: if any order
+    fails, the player and market are left untouched.
+    """
+    prices = market.prices[port]
+    stock = market.stock[port]
+    
+    # Running state per commodity as the batch would leave it
+    price = {}
+    available = {}
+    held = {}
+    
+    # Validate sales
+    sold = []
+    value = 0
+    freed_space = 0
+    for commodity, quantity in sells:
+        if quantity <= 0:
+            continue
+        on_hand = held.get(commodity, player.cargo[commodity])
+        if on_hand < quantity:
+            return TradeResult(False, "You don't have enough to sell!")
+        current = price.get(commodity, prices[commodity])
+        if current <= 0:
+            return TradeResult(False, "Nobody here buys that!")
+        proceeds = sell_value(current, quantity)
+        sold.append((commodity, quantity, proceeds))
+        value += proceeds
+        freed_space += quantity
+        held[commodity] = on_hand - quantity
+        price[commodity] = price_after(current, -quantity)
+        available[commodity] = available.get(commodity, stock[commodity]) + quantity
+    
+    # Validate purchases
+    bought = []
+    cost = 0
+    space_needed = 0
+    for commodity, quantity in buys:
+        if quantity <= 0:
+            continue
+        in_stock = available.get(commodity, stock[commodity])
+        if in_stock < quantity:
+            return TradeResult(False, "Not enough in stock!")
+        current = price.get(commodity, prices[commodity])
+        paid = buy_cost(current, quantity)
+        bought.append((commodity, quantity, paid))
+        cost += paid
+        space_needed += quantity
+        available[commodity] = in_stock - quantity
+        price[commodity] = price_after(current, quantity)
+    
+    if cost > player.gold + value:
+        return TradeResult(False, "Not enough gold!")
+    if space_needed > player.free_cargo + freed_space:
+        return TradeResult(False, "Not enough cargo space!")
+    
+    # Apply everything at once
+    for commodity, quantity, _ in sold:
+        player.remove_cargo(commodity, quantity)
+    for commodity, quantity, _ in bought:
+        player.add_cargo(commodity, quantity)
+    for commodity, final_price in price.items():
+        market.set_price(port, commodity, final_price)
+    for commodity, quantity in available.items():
+        stock[commodity] = quantity
+    player.gold += value - cost
+    
+    return TradeResult(True, bought=bought, sold=sold, cost=cost, value=value)
+
+def buy_max(market, port, player, commodity):
+    """Buy as much of one commodity as the player can afford and carry"""
+    quantity = max_affordable(market.prices[port][commodity], market.stock[port][commodity],
+                              player.gold, player.free_cargo)
+    if quantity <= 0:
+        return TradeResult(False, "Can't afford or carry any more!")
+    return execute_trades(market, port, player, buys=[(commodity, quantity)])
+
+def sell_all(market, port, player, commodities=None):
+    """Sell the player's whole stock of the given commodities (default: everything)"""
+    if commodities is None:
+        commodities = range(len(player.cargo))
+    sells = [(commodity, player.cargo[commodity]) for commodity in commodities
+             if player.cargo[commodity] > 0 and market.prices[port][commodity] > 0]
+    if not sells:
+        return TradeResult(False, "Nothing to sell here!")
+    return execute_trades(market, port, player, sells=sells)
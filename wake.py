@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Ship Wakes
+Per-ship ring buffers of recent stern positions, drawn as pre-faded stamps
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+import pygame
+
+WAKE_HISTORY = 24         # Points kept per ship
+SAMPLE_INTERVAL = 0.1     # Seconds between samples
+WAKE_LIFETIME = 2.4       # Seconds before a point has faded out
+MIN_SPACING = 3.0         # World units a stern must move before a new point is laid
+STERN_OFFSET = 12.0       # Distance from a ship's center to its stern
+STAMP_LEVELS = 8          # Pre-faded stamp sizes/alphas, from fresh to nearly gone
+
+class WakeTrails:
+    """Wake history for a whole fleet as fixed 2D arrays
+    
+    Row i holds ship i's last WAKE_HISTORY stern positions in a ring buffer
+    (head is the next slot to overwrite) with the time each was laid. The
+    arrays only grow when a ship index beyond the capacity shows up, so
+    sampling and drawing never append to anything. Points fade by age and
+    are drawn with one blits() call from a small set of cached stamps.
+    """
+    
+    def __init__(self, capacity=8, history=WAKE_HISTORY, sample_interval=SAMPLE_INTERVAL,
+                 lifetime=WAKE_LIFETIME):
+        """Initialize empty wakes"""
+        self.history = history
+        self.sample_interval = sample_interval
+        self.lifetime = lifetime
+        self.time = 0.0
+        self.since_sample = 0.0
+        
+        self.x = np.zeros((capacity, history), dtype=np.float32)
+        self.y = np.zeros((capacity, history), dtype=np.float32)
+        self.born = np.full((capacity, history), -np.inf)
+        self.head = np.zeros(capacity, dtype=np.int32)
+        self.age = np.empty((capacity, history))  # Scratch for draw()
+        
+        # Colors
+        self.colors = {
+            'foam': (225, 240, 250)
+        }
+        self.stamps, self.stamp_half = self._build_stamps()
+    
+    def _build_stamps(self):
+        """Pre-render one stamp per fade level: small and bright to wide and faint"""
+        stamps = []
+        half = np.zeros(STAMP_LEVELS, dtype=np.int32)
+        for level in range(STAMP_LEVELS):
+            fade = level / (STAMP_LEVELS - 1)
+            radius = 2 + int(fade * 4)
+            alpha = int(170 * (1.0 - fade) + 20)
+            stamp = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(stamp, self.colors['foam'] + (alpha,), (radius, radius), radius)
+            stamps.append(stamp)
+            half[level] = radius
+        return stamps, half
+    
+    def _reserve(self, ships):
+        """Grow the arrays (doubling) so ships rows fit"""
+        capacity = len(self.head)
+        if ships <= capacity:
+            return
+        
+        new_capacity = max(capacity * 2, ships)
+        for name, fill in (('x', 0.0), ('y', 0.0), ('born', -np.inf), ('head', 0)):
+            old = getattr(self, name)
+            grown = np.full((new_capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            grown[:capacity] = old
+            setattr(self, name, grown)
+        self.age = np.empty((new_capacity, self.history))
+    
+    def clear(self, ship=None):
+        """Drop the wake of one ship (or all ships), e.g. after a teleport or load"""
+        rows = slice(None) if ship is None else ship
+        self.born[rows] = -np.inf
+    
+    def update(self, dt, xs, ys, headings):
+        """Advance time and, once per sample interval, lay a point behind every moving ship
+        
+        xs, ys and headings are per-ship arrays indexed like the wake rows
+        (for the fleet, its own x/y/heading columns).
+        """
+        self.time += dt
+        self.since_sample += dt
+        if self.since_sample < self.sample_interval:
+            return
+        self.since_sample %= self.sample_interval
+        
+        ships = len(xs)
+        self._reserve(ships)
+        radians = np.radians(headings)
+        stern_x = xs - np.sin(radians) * STERN_OFFSET
+        stern_y = ys + np.cos(radians) * STERN_OFFSET
+        
+        # Only ships whose stern moved since their last point lay a new one
+        rows = np.arange(ships)
+        last = (self.head[:ships] - 1) % self.history
+        moved = ((stern_x - self.x[rows, last]) ** 2 + (stern_y - self.y[rows, last]) ** 2
+                 > MIN_SPACING * MIN_SPACING)
+        moved |= np.isinf(self.born[rows, last])
+        rows = rows[moved]
+        
+        slots = self.head[rows]
+        self.x[rows, slots] = stern_x[moved]
+        self.y[rows, slots] = stern_y[moved]
+        self.born[rows, slots] = self.time
+        self.head[rows] = (slots + 1) % self.history
+    
+    def draw(self, screen, offset=(0, 0), view_rect=None, focus=None, fx_range=None):
+        """Draw every live wake point inside the view
+        
+        view_rect is the camera's (left, top, width, height); focus and
+        fx_range apply the culler's FX tier, so distant wakes are skipped.
+        """
+        ships = len(self.head)
+        age = self.age[:ships]
+        np.subtract(self.time, self.born, out=age)
+        visible = age < self.lifetime
+        
+        if view_rect is not None:
+            left, top, width, height = view_rect
+            visible &= (self.x >= left) & (self.x <= left + width)
+            visible &= (self.y >= top) & (self.y <= top + height)
+        if focus is not None and fx_range is not None:
+            dx = self.x - focus[0]
+            dy = self.y - focus[1]
+            visible &= dx * dx + dy * dy <= fx_range * fx_range
+        
+        points = np.nonzero(visible)
+        if not len(points[0]):
+            return
+        levels = (age[points] * (STAMP_LEVELS / self.lifetime)).astype(np.int32)
+        half = self.stamp_half[levels]
+        xs = (self.x[points] + offset[0]).astype(np.int32) - half
+        ys = (self.y[points] + offset[1]).astype(np.int32) - half
+        
+        stamps = self.stamps
+        screen.blits([(stamps[level], position)
+                      for level, position in zip(levels.tolist(), zip(xs.tolist(), ys.tolist()))],
+                     doreturn=False)
+
+def main():
+    """Benchmark: sample and draw wakes for a large number of circling ships"""
+    parser = argparse.ArgumentParser(description="Benchmark ship wakes")
+    parser.add_argument("--ships", type=int, default=300, help="number of ships")
+    parser.add_argument("--frames", type=int, default=600, help="frames to simulate")
+    args = parser.parse_args()
+    
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    rng = np.random.default_rng(0)
+    center_x = rng.uniform(50, 750, args.ships)
+    center_y = rng.uniform(50, 550, args.ships)
+    phase = rng.uniform(0, 2 * math.pi, args.ships)
+    wakes = WakeTrails(args.ships)
+    
+    dt = 1.0 / 60
+    update_time = draw_time = 0.0
+    for frame in range(args.frames):
+        angle = phase + frame * dt
+        xs = center_x + np.cos(angle) * 40
+        ys = center_y + np.sin(angle) * 40
+        headings = np.degrees(angle) + 180.0
+        
+        started = time.perf_counter()
+        wakes.update(dt, xs, ys, headings)
+        update_time += time.perf_counter() - started
+        
+        screen.fill((0, 119, 190))
+        started = time.perf_counter()
+        wakes.draw(screen, view_rect=(0, 0, 800, 600))
+        draw_time += time.perf_counter() - started
+    
+    print(f"{args.ships} ships, {args.ships * WAKE_HISTORY} wake points: "
+          f"update {update_time / args.frames * 1000:.3f} ms, draw {draw_time / args.frames * 1000:.2f} ms per frame")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Weather
+Time of day and a Markov weather cycle that change wind and visibility
+"""
+
+import math
+import random
+
+# Weather states
+CLEAR = 0
+FOG = 1
+RAIN = 2
+STORM = 3
+WEATHER_NAMES = ("Clear", "Fog", "Rain", "Storm")
+
+# Per-state effects, indexed by weather state
+WEATHER_WIND = (1.0, 0.6, 1.25, 2.0)              # Multiplier on the true wind speed
+WEATHER_VISIBILITY = (600.0, 180.0, 380.0, 260.0)  # World units in daylight
+WEATHER_RAIN = (0.0, 0.0, 0.5, 1.0)                # Rain intensity (0-1)
+WEATHER_FOG = (0.0, 0.85, 0.2, 0.35)               # Fog density (0-1)
+WEATHER_GLOOM = (0.0, 0.2, 0.4, 0.8)               # Overcast darkening (0-1)
+
+# Chance of moving from one state (row) to another (column) each game hour
+WEATHER_TRANSITIONS = (
+    (0.92, 0.03, 0.05, 0.00),
+    (0.25, 0.70, 0.05, 0.00),
+    (0.15, 0.02, 0.73, 0.10),
+    (0.00, 0.00, 0.30, 0.70),
+)
+TRANSITION_HOURS = 1.0  # Game hours to blend from one state into the next
+
+# Day and night
+START_HOUR = 8.0        # Hour of day when the game clock reads zero
+NIGHT_VISIBILITY = 0.5  # Fraction of daylight visibility left at night
+
+# Overlay cache keys: continuous values are snapped to this many steps so
+# the renderer only ever builds a handful of overlays
+LIGHT_LEVELS = 9
+FOG_LEVELS = 6
+GLOOM_LEVELS = 5
+
+def daylight(hour):
+    """Light level (0 night - 1 day) for an hour of day, with two-hour twilights around 6 and 18"""
+    sun = math.sin(2 * math.pi * (hour - 6.0) / 24.0)
+    return min(1.0, max(0.0, 0.5 + 2.0 * sun))
+
+class WeatherSystem:
+    """Time of day and weather driven by the game clock
+    
+    The state rolls once per game hour on WEATHER_TRANSITIONS and blends
+    into the new state over TRANSITION_HOURS, so effects never jump. Call
+    update() with the game clock; everything else is read from properties.
+    """
+    
+    def __init__(self, seed=None, state=CLEAR, start_hour=START_HOUR):
+        """Initialize weather"""
+        self.rng = random.Random(seed)
+        self.start_hour = start_hour
+        self.state = state
+        self.previous = state
+        self.changed_at = -TRANSITION_HOURS
+        self.hours = 0.0
+        self.next_roll = 1.0  # Game hour of the next transition roll
+    
+    def update(self, game_hours):
+        """Advance to the game clock, rolling once for every game hour passed"""
+        self.hours = game_hours
+        while game_hours >= self.next_roll:
+            self._roll(self.next_roll)
+            self.next_roll += 1.0
+    
+    def _roll(self, at_hour):
+        """Pick the next state from the transition table"""
+        weights = WEATHER_TRANSITIONS[self.state]
+        state = self.rng.choices(range(len(weights)), weights)[0]
+        if state != self.state:
+            self.previous = self.state
+            self.state = state
+            self.changed_at = at_hour
+    
+    def set_state(self, state):
+        """Force a weather state, starting a blend from the current one"""
+        if state != self.state:
+            self.previous = self.state
+            self.state = state
+            self.changed_at = self.hours
+    
+    @property
+    def blend(self):
+        """Progress (0-1) of the blend from the previous state into the current one"""
+        return min(1.0, (self.hours - self.changed_at) / TRANSITION_HOURS)
+    
+    def _mix(self, table):
+        """Blend a per-state table between the previous and current states"""
+        before = table[self.previous]
+        return before + (table[self.state] - before) * self.blend
+    
+    @property
+    def name(self):
+        return WEATHER_NAMES[self.state]
+    
+    @property
+    def hour_of_day(self):
+        return (self.hours + self.start_hour) % 24.0
+    
+    @property
+    def light(self):
+        """Light level from 0 (night) to 1 (day)"""
+        return daylight(self.hour_of_day)
+    
+    @property
+    def wind_multiplier(self):
+        return self._mix(WEATHER_WIND)
+    
+    @property
+    def visibility(self):
+        """How far ships and islands can be made out, in world units"""
+        night = NIGHT_VISIBILITY + (1.0 - NIGHT_VISIBILITY) * self.light
+        return self._mix(WEATHER_VISIBILITY) * night
+    
+    @property
+    def rain_intensity(self):
+        return self._mix(WEATHER_RAIN)
+    
+    @property
+    def fog_density(self):
+        return self._mix(WEATHER_FOG)
+    
+    @property
+    def gloom(self):
+        return self._mix(WEATHER_GLOOM)
+    
+    def overlay_key(self):
+        """Get the quantized (light, fog, gloom) steps that select a cached overlay"""
+        return (round(self.light * (LIGHT_LEVELS - 1)),
+                round(self.fog_density * (FOG_LEVELS - 1)),
+                round(self.gloom * (GLOOM_LEVELS - 1)))
+    
+    def describe(self):
+        """Get a short line such as 'Rain, 14:30'"""
+        hour = self.hour_of_day
+        return f"{self.name}, {int(hour):02d}:{int(hour % 1 * 60):02d}"
+
+class WeatherWind:
+    """The sailing engine's wind as changed by the weather
+    
+    Stands in for a WindSystem wherever one is read: the speed is scaled by
+    the weather and every other attribute comes from the wrapped system.
+    """
+    
+    def __init__(self, wind_system, weather):
+        """Initialize wrapper"""
+        self.wind_system = wind_system
+        self.weather = weather
+    
+    @property
+    def true_wind_speed(self):
+        return self.wind_system.true_wind_speed * self.weather.wind_multiplier
+    
+    def __getattr__(self, name):
+        return getattr(self.wind_system, name)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - Weather Effects
+Cached day/night grading, fog and batched rain drawn over the world
+"""
+
+from collections import OrderedDict
+import math
+import random
+
+import numpy as np
+import pygame
+
+from weather import STORM, LIGHT_LEVELS, FOG_LEVELS, GLOOM_LEVELS
+from memory_budget import MemoryBudget
+
+RAIN_FALL_SPEED = 520.0  # Pixels per second
+RAIN_DRIFT = 12.0        # Sideways pixels per second per knot of wind
+RAIN_LENGTH = 14         # Streak length in pixels
+LIGHTNING_RATE = 0.08    # Flashes per second at full storm
+LIGHTNING_TIME = 0.12    # Seconds a flash lasts
+FOG_DOWNSCALE = 4        # Fog is computed at 1/4 resolution and smoothscaled up (it has no fine detail)
+
+class RainSystem:
+    """Rain streaks as numpy arrays, drawn with a single blits() call
+    
+    Drops live in fixed arrays and wrap around the screen; intensity only
+    changes how many of them are active. Streaks are one cached surface per
+    slant, so nothing is allocated per drop or per frame. The "rain_drops"
+    memory budget caps how many drops a storm can activate.
+    """
+    
+    def __init__(self, screen_width, screen_height, max_drops=400, seed=None, budget=None):
+        """Initialize rain"""
+        self.budget = budget or MemoryBudget()
+        max_drops = min(max_drops, self.budget.limit("rain_drops") or max_drops)
+        rng = np.random.default_rng(seed)
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.x = rng.uniform(0, screen_width, max_drops)
+        self.y = rng.uniform(0, screen_height, max_drops)
+        self.speed = rng.uniform(0.8, 1.2, max_drops)  # Per-drop speed variation
+        self.active = 0
+        self.density = 1.0  # Share of the drops that can fall (graphics quality)
+        self.drift = 0.0
+        self.color = (190, 200, 230, 140)
+        self.streaks = {}  # Slant in pixels -> streak surface
+    
+    def update(self, dt, intensity, wind_direction=0.0, wind_speed=0.0):
+        """Move the active drops; wind_direction is where the wind blows from"""
+        self.active = int(len(self.x) * intensity * self.density)
+        self.budget.set_count("rain_drops", self.active)
+        if not self.active:
+            return
+        
+        active = slice(0, self.active)
+        self.drift = -math.sin(math.radians(wind_direction)) * wind_speed * RAIN_DRIFT
+        self.x[active] += self.drift * self.speed[active] * dt
+        self.y[active] += RAIN_FALL_SPEED * self.speed[active] * dt
+        np.mod(self.x[active], self.screen_width, out=self.x[active])
+        np.mod(self.y[active], self.screen_height, out=self.y[active])
+    
+    def _streak(self):
+        """Get the cached streak surface for the current slant"""
+        slant = int(round(RAIN_LENGTH * self.drift / RAIN_FALL_SPEED / 2)) * 2
+        streak = self.streaks.get(slant)
+        if streak is None:
+            streak = pygame.Surface((abs(slant) + 1, RAIN_LENGTH), pygame.SRCALPHA)
+            top_x = 0 if slant >= 0 else -slant
+            pygame.draw.line(streak, self.color, (top_x, 0), (top_x + slant, RAIN_LENGTH - 1))
+            self.streaks[slant] = streak
+        return streak
+    
+    def draw(self, screen):
+        """Draw every active drop"""
+        if not self.active:
+            return
+        streak = self._streak()
+        xs = self.x[:self.active].astype(np.int32).tolist()
+        ys = self.y[:self.active].astype(np.int32).tolist()
+        screen.blits([(streak, position) for position in zip(xs, ys)], doreturn=False)
+
+class WeatherRenderer:
+    """Draws time of day and weather over the world layer
+    
+    Lighting is a solid grading surface blitted with a multiply blend (much
+    cheaper than a BLEND_MULT fill), and fog is a radial alpha surface
+    twice the screen size, blitted so its clear middle sits on the player
+    wherever they are on screen. Both are built once per quantized overlay
+    key and cached (fog layers are shared by every key with the same fog
+    level), so a frame costs at most two blits plus the rain. A fog layer
+    is about 8 MB, so the "weather_overlays" memory budget also caps the
+    cache size.
+    """
+    
+    def __init__(self, screen_width, screen_height, max_drops=400, cache_size=24, seed=None, budget=None):
+        """Initialize renderer"""
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.budget = budget or MemoryBudget()
+        self.cache_size = min(cache_size, self.budget.limit("weather_overlays") or cache_size)
+        self.overlays = OrderedDict()  # Overlay key -> (grading surface or None, fog surface or None)
+        self.gradings = {}  # Grading color -> solid surface, shared between overlay keys
+        self.fogs = {}      # Fog step -> fog surface, shared between overlay keys
+        self.rain = RainSystem(screen_width, screen_height, max_drops, seed, self.budget)
+        self.rng = random.Random(seed)
+        self.lightning = 0.0
+        self.storm = False
+        
+        # Colors
+        self.colors = {
+            'day': (255, 255, 255),
+            'night': (45, 60, 120),
+            'twilight': (255, 165, 120),
+            'fog': (200, 205, 210),
+            'lightning': (110, 110, 120)
+        }
+    
+    def update(self, dt, weather, wind_direction=0.0, wind_speed=0.0):
+        """Advance rain and lightning"""
+        self.rain.update(dt, weather.rain_intensity, wind_direction, wind_speed)
+        
+        self.storm = weather.state == STORM
+        self.lightning = max(0.0, self.lightning - dt)
+        if self.storm and self.rng.random() < LIGHTNING_RATE * weather.rain_intensity * dt:
+            self.lightning = LIGHTNING_TIME
+    
+    def _lerp(self, start, end, t):
+        return tuple(int(a + (b - a) * t) for a, b in zip(start, end))
+    
+    def _grading_color(self, light, gloom):
+        """Multiply color for a light level and overcast darkening"""
+        color = self._lerp(self.colors['night'], self.colors['day'], light)
+        warmth = 1.0 - abs(2.0 * light - 1.0)  # Peaks halfway through dawn and dusk
+        color = self._lerp(color, self.colors['twilight'], warmth * 0.6)
+        return self._lerp(color, (0, 0, 0), gloom * 0.45)
+    
+    def _grading_surface(self, color):
+        """Get the solid surface that multiplies the screen by a grading color"""
+        if color == self.colors['day']:
+            return None
+        grading = self.gradings.get(color)
+        if grading is None:
+            grading = pygame.Surface((self.screen_width, self.screen_height))
+            grading.fill(color)
+            self.gradings[color] = grading
+        return grading
+    
+    def _fog_surface(self, density):
+        """Build a fog layer, twice the screen size, that is clear in the middle and thick further out"""
+        full_width, full_height = self.screen_width * 2, self.screen_height * 2
+        width = max(1, full_width // FOG_DOWNSCALE)
+        height = max(1, full_height // FOG_DOWNSCALE)
+        xs = (np.arange(width) + 0.5) * FOG_DOWNSCALE - self.screen_width
+        ys = (np.arange(height) + 0.5) * FOG_DOWNSCALE - self.screen_height
+        distance = np.hypot(xs[:, None], ys[None, :])
+        
+        clear_radius = 60 + (1.0 - density) * 300
+        thickness = np.clip((distance - clear_radius) / 200.0, 0.0, 1.0)
+        alpha = (thickness * density * 230 + density * 40).clip(0, 255)
+        
+        fog = pygame.Surface((width, height), pygame.SRCALPHA)
+        fog.fill(self.colors['fog'])
+        pixels = pygame.surfarray.pixels_alpha(fog)
+        pixels[:] = alpha.astype(np.uint8)
+        del pixels  # Unlock the surface
+        return pygame.transform.smoothscale(fog, (full_width, full_height))
+    
+    def get_overlay(self, key):
+        """Get the (grading, fog) surfaces for an overlay key, building them on first use"""
+        overlay = self.overlays.get(key)
+        if overlay is not None:
+            self.overlays.move_to_end(key)
+            return overlay
+        
+        light_step, fog_step, gloom_step = key
+        color = self._grading_color(light_step / (LIGHT_LEVELS - 1), gloom_step / (GLOOM_LEVELS - 1))
+        fog = None
+        if fog_step:
+            fog = self.fogs.get(fog_step)
+            if fog is None:
+                fog = self._fog_surface(fog_step / (FOG_LEVELS - 1))
+                self.fogs[fog_step] = fog
+        overlay = (self._grading_surface(color), fog)
+        
+        self.overlays[key] = overlay
+        if len(self.overlays) > self.cache_size:
+            self.overlays.popitem(last=False)
+            live = {id(grading) for grading, _ in self.overlays.values()}
+            self.gradings = {color: grading for color, grading in self.gradings.items() if id(grading) in live}
+            live = {id(fog) for _, fog in self.overlays.values()}
+            self.fogs = {step: fog for step, fog in self.fogs.items() if id(fog) in live}
+        self.budget.set_surfaces("weather_overlays", list(self.gradings.values()) + list(self.fogs.values()))
+        self.budget.set_count("weather_overlays", len(self.overlays))
+        return overlay
+    
+    def prewarm(self, weather):
+        """Build the overlay for the current conditions ahead of the first frame"""
+        self.get_overlay(weather.overlay_key())
+    
+    def draw(self, screen, weather, focus=None):
+        """Draw fog and rain over the world already on screen, then grade it all for the light
+        
+        focus is the player's screen position, where the fog clears
+        (default: the middle of the screen).
+        """
+        grading, fog = self.get_overlay(weather.overlay_key())
+        if fog is not None:
+            focus_x, focus_y = focus or (self.screen_width // 2, self.screen_height // 2)
+            screen.blit(fog, (int(focus_x) - self.screen_width, int(focus_y) - self.screen_height))
+        self.rain.draw(screen)
+        if grading is not None:
+            screen.blit(grading, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+        if self.lightning > 0:
+            screen.fill(self.colors['lightning'], special_flags=pygame.BLEND_RGB_ADD)
@@ -7,11 +7,18 @@ Visual wind and water feedback for realistic sailing
 import pygame
 import math
 import random
+from collections import OrderedDict
+from fonts import LazyFont
+from memory_budget import MemoryBudget
+from screen_overlay import ScreenOverlays, OVERLAY_STALL
+
+ALPHA_STEP = 16   # Cached particle stamps are quantized to this many alpha levels
+VANE_ANGLE_STEP = 5  # Degrees between cached vane rotations
 
 class WindParticle:
     """Individual wind particle for visual effect"""
     
-    def __init__(self, x, y, wind_direction, wind_speed):
+    def __init__(self, x, y, wind_direction, wind_speed, lifetime_scale=1.0):
         """Initialize wind particle"""
         self.x = x
         self.y = y
@@ -28,7 +35,7 @@ class WindParticle:
         # Visual properties
         self.size = random.randint(2, 4)
         self.alpha = random.randint(100, 200)
-        self.lifetime = random.uniform(3.0, 6.0)
+        self.lifetime = random.uniform(3.0, 6.0) * lifetime_scale
         self.age = 0.0
         
     def update(self, dt):
@@ -43,13 +50,18 @@ class WindParticle:
         
         return self.age < self.lifetime
     
-    def draw(self, screen):
-        """Draw the wind particle"""
+    def draw(self, screen, stamps=None):
+        """Draw the wind particle; stamps caches one surface per (size, alpha level)"""
         if self.alpha > 0:
-            # Create surface for alpha blending
-            particle_surface = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            color = (255, 255, 255, self.alpha)
-            pygame.draw.circle(particle_surface, color, (self.size, self.size), self.size)
+            alpha = self.alpha - self.alpha % ALPHA_STEP if stamps is not None else self.alpha
+            particle_surface = stamps.get((self.size, alpha)) if stamps is not None else None
+            if particle_surface is None:
+                # Create surface for alpha blending
+                particle_surface = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
+                color = (255, 255, 255, alpha)
+                pygame.draw.circle(particle_surface, color, (self.size, self.size), self.size)
+                if stamps is not None:
+                    stamps[(self.size, alpha)] = particle_surface
             screen.blit(particle_surface, (int(self.x - self.size), int(self.y - self.size)))
 
 class WaveEffect:
@@ -107,10 +119,11 @@ class CompassDisplay:
         }
         
         # Font
-        self.font = pygame.font.Font(None, 16)
+        self.font = LazyFont(16)
+        self.dial = None  # Background, ticks and labels, drawn once
         
-    def draw(self, screen, navigation_data):
-        """Draw compass with ship heading and wind direction"""
+    def build_dial(self):
+        """Draw the static part of the compass"""
         # Create compass surface
         compass_size = (self.radius + 30) * 2
         compass_surface = pygame.Surface((compass_size, compass_size), pygame.SRCALPHA)
@@ -151,29 +164,37 @@ class CompassDisplay:
             text_rect.center = (outer_x + offset_x, outer_y + offset_y)
             
             compass_surface.blit(text, text_rect)
+        return compass_surface
+    
+    def draw(self, screen, navigation_data):
+        """Draw compass with ship heading and wind direction"""
+        if self.dial is None:
+            self.dial = self.build_dial()
+        compass_size = self.dial.get_width()
+        screen.blit(self.dial, (self.x - compass_size // 2, self.y - compass_size // 2))
+        
+        # Needles go straight onto the screen around the compass center
+        center_x, center_y = self.x, self.y
         
         # Draw wind direction needle (cyan)
         wind_rad = math.radians(navigation_data.wind_direction - 90)
-        wind_end_x = center + int(self.radius * 0.8 * math.cos(wind_rad))
-        wind_end_y = center + int(self.radius * 0.8 * math.sin(wind_rad))
+        wind_end_x = center_x + int(self.radius * 0.8 * math.cos(wind_rad))
+        wind_end_y = center_y + int(self.radius * 0.8 * math.sin(wind_rad))
         
-        pygame.draw.line(compass_surface, self.colors['wind_needle'], 
-                        (center, center), (wind_end_x, wind_end_y), 3)
+        pygame.draw.line(screen, self.colors['wind_needle'], 
+                        (center_x, center_y), (wind_end_x, wind_end_y), 3)
         
         # Draw ship heading needle (red)
         heading_rad = math.radians(navigation_data.ship_heading - 90)
-        heading_end_x = center + int(self.radius * 0.6 * math.cos(heading_rad))
-        heading_end_y = center + int(self.radius * 0.6 * math.sin(heading_rad))
+        heading_end_x = center_x + int(self.radius * 0.6 * math.cos(heading_rad))
+        heading_end_y = center_y + int(self.radius * 0.6 * math.sin(heading_rad))
         
-        pygame.draw.line(compass_surface, self.colors['ship_needle'], 
-                        (center, center), (heading_end_x, heading_end_y), 4)
+        pygame.draw.line(screen, self.colors['ship_needle'], 
+                        (center_x, center_y), (heading_end_x, heading_end_y), 4)
         
         # Draw center dot
-        pygame.draw.circle(compass_surface, self.colors['ship_needle'], 
-                          (center, center), 4)
-        
-        # Blit to main screen
-        screen.blit(compass_surface, (self.x - compass_size // 2, self.y - compass_size // 2))
+        pygame.draw.circle(screen, self.colors['ship_needle'], 
+                          (center_x, center_y), 4)
         
         # Draw compass info below
         info_y = self.y + self.radius + 20
@@ -190,6 +211,122 @@ class CompassDisplay:
         wind_rect = wind_surface.get_rect(center=(self.x, info_y + 15))
         screen.blit(wind_surface, wind_rect)
 
+class Minimap:
+    """Overview map with cached terrain and live ship markers
+    
+    Terrain is drawn once into a surface at world-map resolution and only
+    touched again when new terrain loads (add_terrain). The minimap is a
+    smoothscaled copy of that cache, rebuilt only after terrain changes, and
+    the full-screen world map blits the cache itself. Per frame only the
+    markers are drawn.
+    """
+    
+    def __init__(self, x, y, width, height, world_width, world_height, map_width=760, map_height=520):
+        """Initialize minimap in the rectangle at (x, y)"""
+        self.rect = pygame.Rect(x, y, width, height)
+        self.world_width = world_width
+        self.world_height = world_height
+        self.full_map = False
+        
+        # Colors
+        self.colors = {
+            'sea': (10, 50, 90),
+            'land': (60, 150, 60),
+            'border': (255, 255, 255),
+            'backdrop': (0, 0, 0),
+            'player': (255, 255, 255),
+            'escort': (255, 200, 80),
+            'enemy': (255, 60, 60),
+            'trader': (220, 190, 120),
+            'patrol': (140, 140, 170),
+            'view': (200, 200, 200),
+            'text': (255, 255, 255)
+        }
+        
+        # Terrain cache at world-map resolution
+        self.map_scale = min(map_width / world_width, map_height / world_height)
+        self.terrain = pygame.Surface((max(1, int(world_width * self.map_scale)),
+                                       max(1, int(world_height * self.map_scale))))
+        self.terrain.fill(self.colors['sea'])
+        
+        # Downscaled copy for the minimap, refreshed when the terrain changes
+        self.mini_scale = min(width / world_width, height / world_height)
+        self.mini_size = (max(1, int(world_width * self.mini_scale)), max(1, int(world_height * self.mini_scale)))
+        self.mini_terrain = None
+        
+        # Font
+        self.font = LazyFont(24)
+    
+    def add_terrain(self, entities):
+        """Draw newly loaded terrain (anything with get_bounds) into the cache"""
+        for entity in entities:
+            left, top, width, height = entity.get_bounds()
+            rect = pygame.Rect(int(left * self.map_scale), int(top * self.map_scale),
+                               max(1, int(width * self.map_scale)), max(1, int(height * self.map_scale)))
+            pygame.draw.rect(self.terrain, self.colors['land'], rect)
+        self.mini_terrain = None
+    
+    def toggle_full_map(self):
+        """Switch between the corner minimap and the full-screen world map"""
+        self.full_map = not self.full_map
+    
+    def markers_from_grid(self, grid, kind):
+        """Get (x, y, kind) markers for every entity in a spatial grid inside the world"""
+        markers = []
+        for entity in grid.query_rect(0, 0, self.world_width, self.world_height):
+            left, top, width, height = entity.get_bounds()
+            markers.append((left + width / 2, top + height / 2, kind))
+        return markers
+    
+    def _draw_markers(self, screen, origin, scale, markers, size):
+        """Draw (x, y, kind) markers scaled from world to map coordinates"""
+        for x, y, kind in markers:
+            position = (int(origin[0] + x * scale), int(origin[1] + y * scale))
+            radius = size + 1 if kind == 'player' else size
+            pygame.draw.circle(screen, self.colors[kind], position, radius)
+    
+    def draw(self, screen, markers, view_rect=None):
+        """Draw the minimap (or the world map when open) with markers over the terrain
+        
+        markers are (world x, world y, kind) with kind one of 'player',
+        'escort', 'enemy', 'trader' or 'patrol'; view_rect outlines the
+        camera's view.
+        """
+        if self.full_map:
+            self.draw_world_map(screen, markers, view_rect)
+            return
+        
+        if self.mini_terrain is None:
+            self.mini_terrain = pygame.transform.smoothscale(self.terrain, self.mini_size)
+        screen.blit(self.mini_terrain, self.rect.topleft)
+        self._draw_markers(screen, self.rect.topleft, self.mini_scale, markers, 2)
+        if view_rect is not None:
+            self._draw_view(screen, self.rect.topleft, self.mini_scale, view_rect)
+        pygame.draw.rect(screen, self.colors['border'], (self.rect.topleft, self.mini_size), 1)
+    
+    def _draw_view(self, screen, origin, scale, view_rect):
+        """Outline the camera view on the map"""
+        left, top, width, height = view_rect
+        outline = pygame.Rect(int(origin[0] + left * scale), int(origin[1] + top * scale),
+                              int(width * scale), int(height * scale))
+        if outline.width < self.world_width * scale or outline.height < self.world_height * scale:
+            pygame.draw.rect(screen, self.colors['view'], outline, 1)
+    
+    def draw_world_map(self, screen, markers, view_rect=None):
+        """Draw the full-screen world map from the same terrain cache"""
+        screen_width, screen_height = screen.get_size()
+        screen.fill(self.colors['backdrop'])
+        origin = ((screen_width - self.terrain.get_width()) // 2,
+                  (screen_height - self.terrain.get_height()) // 2 + 10)
+        screen.blit(self.terrain, origin)
+        self._draw_markers(screen, origin, self.map_scale, markers, 4)
+        if view_rect is not None:
+            self._draw_view(screen, origin, self.map_scale, view_rect)
+        pygame.draw.rect(screen, self.colors['border'], (origin, self.terrain.get_size()), 2)
+        
+        title = self.font.render("World Map (M to close)", True, self.colors['text'])
+        screen.blit(title, title.get_rect(center=(screen_width // 2, origin[1] - 20)))
+
 class SpeedDisplay:
     """Ship speed and sailing information display"""
     
@@ -197,8 +334,8 @@ class SpeedDisplay:
         """Initialize speed display"""
         self.x = x
         self.y = y
-        self.font = pygame.font.Font(None, 24)
-        self.small_font = pygame.font.Font(None, 18)
+        self.font = LazyFont(24)
+        self.small_font = LazyFont(18)
         
     def draw(self, screen, navigation_data):
         """Draw speed and sailing information"""
@@ -225,20 +362,34 @@ class SpeedDisplay:
         screen.blit(apparent_surface, (self.x, self.y + 70))
 
 class WindParticleSystem:
-    """Manages wind particle effects"""
+    """Manages wind particle effects
     
-    def __init__(self, screen_width, screen_height):
+    The particle count is capped by the "wind_particles" memory budget:
+    spawns shrink as it fills and new particles live shorter, and the
+    particle surfaces are a small shared set of cached stamps.
+    """
+    
+    def __init__(self, screen_width, screen_height, budget=None):
         """Initialize particle system"""
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.particles = []
         self.spawn_timer = 0.0
         self.spawn_interval = 0.5  # Spawn particles every 0.5 seconds
+        self.budget = budget or MemoryBudget()
+        self.stamps = {}  # (size, alpha) -> particle surface
         
     def update(self, dt, wind_direction, wind_speed):
         """Update particle system"""
-        # Update existing particles
-        self.particles = [p for p in self.particles if p.update(dt)]
+        # Update existing particles, compacting the list in place
+        particles = self.particles
+        alive = 0
+        for particle in particles:
+            if particle.update(dt):
+                particles[alive] = particle
+                alive += 1
+        del particles[alive:]
+        self.budget.set_count("wind_particles", alive)
         
         # Spawn new particles
         self.spawn_timer += dt
@@ -265,32 +416,41 @@ class WindParticleSystem:
             spawn_x = random.randint(0, self.screen_width)
             spawn_y = self.screen_height + 10
         
-        # Create 2-4 particles per spawn
-        for _ in range(random.randint(2, 4)):
+        # Create 2-4 particles per spawn, fewer and shorter-lived near the budget
+        lifetime_scale = self.budget.lifetime_scale("wind_particles")
+        for _ in range(self.budget.allow("wind_particles", random.randint(2, 4))):
             particle = WindParticle(
                 spawn_x + random.randint(-20, 20),
                 spawn_y + random.randint(-20, 20),
                 wind_direction,
-                wind_speed
+                wind_speed,
+                lifetime_scale
             )
             self.particles.append(particle)
+        self.budget.set_count("wind_particles", len(self.particles))
     
     def draw(self, screen):
         """Draw all wind particles"""
+        stamps = self.stamps
+        cached = len(stamps)
+        if cached >= (self.budget.limit("particle_stamps") or cached + 1):
+            stamps = None  # Cache full: fall back to temporary surfaces
         for particle in self.particles:
-            particle.draw(screen)
+            particle.draw(screen, stamps)
+        if len(self.stamps) != cached:
+            self.budget.set_surfaces("particle_stamps", self.stamps.values())
 
 class WindVane:
     """Individual wind vane indicator"""
     
-    def __init__(self, x, y, wind_direction, wind_speed):
+    def __init__(self, x, y, wind_direction, wind_speed, lifetime_scale=1.0):
         """Initialize wind vane"""
         self.x = x
         self.y = y
         self.wind_direction = wind_direction
         self.wind_speed = wind_speed
         self.drift_speed = wind_speed * 0.1  # Gentle drift
-        self.lifetime = random.uniform(8.0, 12.0)
+        self.lifetime = random.uniform(8.0, 12.0) * lifetime_scale
         self.age = 0.0
         
         # Visual properties based on wind strength
@@ -322,8 +482,8 @@ class WindVane:
         
         return self.age < self.lifetime
     
-    def draw(self, screen):
-        """Draw the wind vane"""
+    def draw(self, screen, sprites=None):
+        """Draw the wind vane; sprites caches rotated vanes by (type, angle)"""
         if self.age >= self.lifetime:
             return
         
@@ -334,6 +494,25 @@ class WindVane:
         if alpha <= 0:
             return
         
+        if sprites is None:
+            rotated_vane = self.render(alpha, -self.wind_direction + 90)
+        else:
+            # Full-opacity sprite per rotation step, faded with surface alpha at blit time
+            angle = int(round(self.wind_direction / VANE_ANGLE_STEP)) * VANE_ANGLE_STEP % 360
+            key = (self.vane_type, angle)
+            rotated_vane = sprites.get(key)
+            if rotated_vane is None:
+                rotated_vane = sprites[key] = self.render(255, -angle + 90)
+            else:
+                sprites.move_to_end(key)
+            rotated_vane.set_alpha(alpha)
+        
+        # Blit to screen
+        vane_rect = rotated_vane.get_rect(center=(int(self.x), int(self.y)))
+        screen.blit(rotated_vane, vane_rect)
+    
+    def render(self, alpha, rotation):
+        """Draw the vane on a new surface, rotated by rotation degrees counterclockwise"""
         # Create vane surface for rotation
         vane_surface = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
         
@@ -366,29 +545,55 @@ class WindVane:
         pygame.draw.polygon(vane_surface, shaft_color, arrow_points)
         
         # Rotate vane to match wind direction
-        rotated_vane = pygame.transform.rotate(vane_surface, -self.wind_direction + 90)
-        
-        # Blit to screen
-        vane_rect = rotated_vane.get_rect(center=(int(self.x), int(self.y)))
-        screen.blit(rotated_vane, vane_rect)
+        return pygame.transform.rotate(vane_surface, rotation)
 
 class WindVaneSystem:
-    """Manages wind vane indicators for strong winds"""
+    """Manages wind vane indicators for strong winds
     
-    def __init__(self, screen_width, screen_height):
+    With an interest_radius, vanes only live in the area around the focus
+    (the player's ship on screen): they spawn inside the radius and retire
+    once they drift more than interest_margin beyond it, instead of being
+    kept and updated across the whole screen.
+    
+    Vane count and the cache of rotated vane sprites are capped by the
+    "wind_vanes" and "vane_sprites" memory budgets; near the vane budget,
+    fewer vanes spawn and they fade out sooner.
+    """
+    
+    def __init__(self, screen_width, screen_height, interest_radius=None, interest_margin=50, budget=None):
         """Initialize wind vane system"""
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.wind_vanes = []
         self.spawn_timer = 0.0
         self.spawn_interval = 2.0  # Spawn vanes every 2 seconds during strong wind
+        self.spawn_count = (2, 4)  # Vanes per spawn (min, max)
         self.strong_wind_threshold = 15.0
-        
-    def update(self, dt, wind_direction, wind_speed):
-        """Update wind vane system"""
-        # Update existing vanes
-        self.wind_vanes = [vane for vane in self.wind_vanes 
-                          if vane.update(dt, wind_direction, wind_speed)]
+        self.interest_radius = interest_radius  # None: vanes anywhere on screen
+        self.interest_margin = interest_margin
+        self.focus = None
+        self.budget = budget or MemoryBudget()
+        self.sprites = OrderedDict()  # (vane type, angle) -> rotated vane surface
+        
+    def in_interest(self, vane):
+        """Check whether a vane is still inside the area of interest"""
+        if self.interest_radius is None or self.focus is None:
+            return True
+        limit = self.interest_radius + self.interest_margin
+        return (vane.x - self.focus[0]) ** 2 + (vane.y - self.focus[1]) ** 2 <= limit * limit
+    
+    def update(self, dt, wind_direction, wind_speed, focus=None):
+        """Update wind vane system; focus is the screen position vanes gather around"""
+        self.focus = focus
+        
+        # Update existing vanes, compacting the list in place
+        vanes = self.wind_vanes
+        alive = 0
+        for vane in vanes:
+            if vane.update(dt, wind_direction, wind_speed) and self.in_interest(vane):
+                vanes[alive] = vane
+                alive += 1
+        del vanes[alive:]
         
         # Spawn new vanes if wind is strong enough
         if wind_speed > self.strong_wind_threshold:
@@ -398,17 +603,26 @@ class WindVaneSystem:
                 self.spawn_wind_vanes(wind_direction, wind_speed)
         else:
             # Remove vanes if wind drops
-            self.wind_vanes = []
+            self.wind_vanes.clear()
+        self.budget.set_count("wind_vanes", len(self.wind_vanes))
     
     def spawn_wind_vanes(self, wind_direction, wind_speed):
         """Spawn new wind vanes across the screen"""
-        # Spawn 2-4 vanes randomly across screen
-        num_vanes = random.randint(2, 4)
+        # Spawn spawn_count vanes randomly across screen, fewer and shorter-lived near the budget
+        self.budget.set_count("wind_vanes", len(self.wind_vanes))
+        num_vanes = self.budget.allow("wind_vanes", random.randint(*self.spawn_count))
+        lifetime_scale = self.budget.lifetime_scale("wind_vanes")
         
         for _ in range(num_vanes):
-            # Random position avoiding UI areas
-            x = random.randint(100, self.screen_width - 100)
-            y = random.randint(100, self.screen_height - 100)
+            # Random position avoiding UI areas, inside the area of interest if there is one
+            if self.interest_radius is not None and self.focus is not None:
+                angle = random.uniform(0, 2 * math.pi)
+                distance = self.interest_radius * math.sqrt(random.random())
+                x = int(max(100, min(self.screen_width - 100, self.focus[0] + math.cos(angle) * distance)))
+                y = int(max(100, min(self.screen_height - 100, self.focus[1] + math.sin(angle) * distance)))
+            else:
+                x = random.randint(100, self.screen_width - 100)
+                y = random.randint(100, self.screen_height - 100)
             
             # Avoid overlapping with existing vanes
             too_close = False
@@ -419,13 +633,21 @@ class WindVaneSystem:
                     break
             
             if not too_close:
-                vane = WindVane(x, y, wind_direction, wind_speed)
+                vane = WindVane(x, y, wind_direction, wind_speed, lifetime_scale)
                 self.wind_vanes.append(vane)
     
     def draw(self, screen):
         """Draw all wind vanes"""
+        sprites = self.sprites
+        cached = len(sprites)
         for vane in self.wind_vanes:
-            vane.draw(screen)
+            vane.draw(screen, sprites)
+        if len(sprites) != cached:
+            # Drop the least recently used rotations beyond the budget
+            limit = self.budget.limit("vane_sprites")
+            while limit is not None and len(sprites) > limit:
+                sprites.popitem(last=False)
+            self.budget.set_surfaces("vane_sprites", sprites.values())
 
 class EnhancedWaveEffect:
     """Enhanced wave effect that responds to wind direction and strength"""
@@ -438,6 +660,8 @@ class EnhancedWaveEffect:
         self.wave_offset_y = 0.0
         self.wave_amplitude = 5
         self.wave_frequency = 0.02
+        self.wave_surface = None  # Reused overlay, cleared every frame
+        self.wave_spacing = 30  # Pixels between wave grid points (graphics quality)
         
     def update(self, dt, wind_direction, wind_speed):
         """Update wave animation based on wind"""
@@ -470,8 +694,11 @@ class EnhancedWaveEffect:
     
     def draw(self, screen):
         """Draw enhanced wave overlay"""
-        # Create wave surface
-        wave_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+        # Clear the wave surface (created once rather than every frame)
+        if self.wave_surface is None:
+            self.wave_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+        wave_surface = self.wave_surface
+        wave_surface.fill((0, 0, 0, 0))
         
         # Wave colors based on amplitude (wind strength)
         if self.wave_amplitude <= 2:
@@ -481,13 +708,19 @@ class EnhancedWaveEffect:
         else:
             wave_color = (0, 120, 180, 50)  # Strong waves
         
-        # Draw wave pattern
-        wave_spacing = 30
-        for y in range(-wave_spacing, self.screen_height + wave_spacing, wave_spacing):
-            for x in range(-wave_spacing, self.screen_width + wave_spacing, wave_spacing):
+        # Draw wave pattern, visiting only grid rows and columns that can land
+        # on screen (sine distortion moves lines at most wave_amplitude sideways)
+        wave_spacing = self.wave_spacing
+        offset_x = int(self.wave_offset_x)
+        offset_y = int(self.wave_offset_y)
+        rows = self._visible_grid_range(offset_y, 0, self.screen_height, wave_spacing)
+        columns = self._visible_grid_range(offset_x, -self.wave_amplitude,
+                                           self.screen_width + self.wave_amplitude, wave_spacing)
+        for y in rows:
+            for x in columns:
                 # Calculate wave position with offset
-                wave_x = x + int(self.wave_offset_x)
-                wave_y = y + int(self.wave_offset_y)
+                wave_x = x + offset_x
+                wave_y = y + offset_y
                 
                 # Add sine wave distortion
                 wave_distort = math.sin((wave_x + wave_y) * self.wave_frequency) * self.wave_amplitude
@@ -501,33 +734,56 @@ class EnhancedWaveEffect:
                                    (final_x, final_y), (end_x, final_y), 2)
         
         screen.blit(wave_surface, (0, 0))
+    
+    def _visible_grid_range(self, offset, lower, upper, spacing):
+        """Get grid positions g (from -spacing in steps of spacing) with lower <= g + offset < upper"""
+        origin = -spacing
+        first_step = max(0, -((origin + offset - lower) // spacing))
+        end = min(upper - offset, upper + spacing)
+        return range(origin + first_step * spacing, end, spacing)
 
 class StallWarning:
-    """Visual warning when ship is stalled"""
+    """Visual warning when ship is stalled
     
-    def __init__(self):
+    The red flash is the "stall" layer of a ScreenOverlays. Given a shared
+    one, update() sets the flash and the game composites it with its other
+    overlays; without one, draw() keeps its own and blits it.
+    """
+    
+    def __init__(self, overlays=None):
         """Initialize stall warning"""
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.font = LazyFont(36)
+        self.small_font = LazyFont(24)
         self.flash_timer = 0.0
+        self.overlay = True  # Full-screen red flash (graphics quality); the text always shows
+        self.overlays = overlays
+        self.owns_overlays = overlays is None
         
-    def update(self, dt):
-        """Update warning animation"""
+    def update(self, dt, navigation_data=None):
+        """Update warning animation (and the shared flash layer, given navigation data)"""
         self.flash_timer += dt
+        if navigation_data is not None and not self.owns_overlays:
+            self.set_flash(navigation_data)
+    
+    def set_flash(self, navigation_data):
+        """Set the stall layer's alpha for this frame"""
+        if navigation_data.is_stalled and self.overlay:
+            flash_alpha = int(128 + 127 * math.sin(self.flash_timer * 4))
+            self.overlays.set(OVERLAY_STALL, flash_alpha // 4)
+        else:
+            self.overlays.set(OVERLAY_STALL, 0)
     
     def draw(self, screen, navigation_data, screen_width, screen_height):
         """Draw stall warning if ship is stalled"""
         if not navigation_data.is_stalled:
             return
         
-        # Flash effect
-        flash_alpha = int(128 + 127 * math.sin(self.flash_timer * 4))
-        
-        # Warning overlay
-        warning_surface = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
-        warning_color = (255, 0, 0, flash_alpha // 4)
-        warning_surface.fill(warning_color)
-        screen.blit(warning_surface, (0, 0))
+        # Warning overlay, unless the game composites it with its other overlays
+        if self.owns_overlays:
+            if self.overlays is None:
+                self.overlays = ScreenOverlays(screen_width, screen_height)
+            self.set_flash(navigation_data)
+            self.overlays.draw(screen)
         
         # Warning text
         warning_text = "STALLED - IN NO-GO ZONE"
@@ -555,8 +811,8 @@ class EnhancedWindDisplay:
         """Initialize enhanced wind display"""
         self.x = x
         self.y = y
-        self.font = pygame.font.Font(None, 24)
-        self.small_font = pygame.font.Font(None, 18)
+        self.font = LazyFont(24)
+        self.small_font = LazyFont(18)
     
     def draw(self, screen, navigation_data):
         """Draw enhanced wind information"""
@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - World
+Size of the single-player sea, shared by the games and the headless tools (no pygame)
+"""
+
+WORLD_WIDTH = 800    # The sea is one logical screen (display.SCREEN_WIDTH x SCREEN_HEIGHT) for now
+WORLD_HEIGHT = 600
+EDGE_MARGIN = 50     # Ships stay this far inside the world edges
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Privateers Legacy - World Simulation
+Coarse hourly simulation of distant traders, patrols and port markets on a worker thread
+"""
+
+import argparse
+import math
+import queue
+import random
+import threading
+import time
+
+import numpy as np
+
+from catalog import Market
+from trade_routes import DEFAULT_SAIL_SPEED, random_catalog
+import trading
+
+STEP_HOURS = 1.0                   # The world advances one game hour at a time
+TRADER_SPEED = DEFAULT_SAIL_SPEED  # World units per game hour
+PATROL_SPEED = 120.0
+PORT_HOURS = 1.0                   # Time a trader spends in port between legs
+MIN_LEG_HOURS = 0.1                # Every leg takes some time, so an hour always ends
+TRADER_CARGO = 20                  # Units a trader buys at each stop
+PATROL_RADIUS = 120.0              # Patrols circle their port at this distance
+PATROL_WAYPOINTS = 6
+PRICE_RECOVERY = 0.1               # Fraction of the way back to the normal price per hour
+MIN_PRICE_CHANGE = 0.01            # Smaller recoveries are skipped (the price is already normal)
+STOCK_RECOVERY = 1                 # Units restocked per commodity per hour
+MAX_STOCK = 50
+
+# Ship kinds
+KIND_TRADER = 0
+KIND_PATROL = 1
+KIND_NAMES = ('trader', 'patrol')
+
+class WorldUpdate:
+    """One finished step handed from the worker to the main thread
+    
+    Holds every ship's current leg, so positions_at() can place the ships
+    at any moment until the next update, and the market changes made
+    during the step as (port, commodity, price change, stock change).
+    """
+    
+    __slots__ = ('hour', 'kind', 'from_x', 'from_y', 'to_x', 'to_y', 'depart', 'arrive', 'changes')
+    
+    def __init__(self, hour, kind, from_x, from_y, to_x, to_y, depart, arrive, changes):
+        self.hour = hour
+        self.kind = kind
+        self.from_x = from_x
+        self.from_y = from_y
+        self.to_x = to_x
+        self.to_y = to_y
+        self.depart = depart
+        self.arrive = arrive
+        self.changes = changes
+    
+    def positions_at(self, hour):
+        """Get (x, y, heading) arrays for every ship at a game hour"""
+        # Ships that have not been stepped yet sit on zero-length legs
+        duration = np.maximum(self.arrive - self.depart, MIN_LEG_HOURS)
+        progress = np.clip((hour - self.depart) / duration, 0.0, 1.0)
+        dx = self.to_x - self.from_x
+        dy = self.to_y - self.from_y
+        heading = np.degrees(np.arctan2(dx, -dy)) % 360.0
+        return self.from_x + dx * progress, self.from_y + dy * progress, heading
+    
+    def apply(self, market):
+        """Apply the step's price and stock changes to the live market (main thread only)"""
+        for port, commodity, price_change, stock_change in self.changes:
+            market.set_price(port, commodity, max(1, market.prices[port][commodity] + price_change))
+            market.stock[port][commodity] = max(0, market.stock[port][commodity] + stock_change)
+
+class WorldSimulation:
+    """Traders and patrols on straight legs, plus port markets, advanced an hour at a time
+    
+    Every ship is always on one leg (from, to, depart, arrive), so where it
+    is at any moment is a linear interpolation and an hour only costs work
+    for the ships that reached the end of a leg. Traders sail between
+    ports, selling their cargo and buying whatever pays best elsewhere;
+    patrols circle a port on a cached loop of waypoints. Markets drift back
+    toward their normal prices and restock. The simulation trades on its
+    own copy of the market and reports only the changes, so nothing but
+    the main thread ever writes to the live one.
+    """
+    
+    def __init__(self, catalog, traders=6, patrols=3, seed=None, start_hour=0.0):
+        """Initialize ships in port and on patrol"""
+        self.catalog = catalog
+        self.rng = random.Random(seed)
+        self.market = Market(catalog, self.rng)
+        self.hour = float(start_hour)
+        
+        count = traders + patrols
+        self.kind = np.array([KIND_TRADER] * traders + [KIND_PATROL] * patrols, dtype=np.int8)
+        self.from_x = np.zeros(count)
+        self.from_y = np.zeros(count)
+        self.to_x = np.zeros(count)
+        self.to_y = np.zeros(count)
+        self.depart = np.full(count, self.hour)
+        self.arrive = np.full(count, self.hour)
+        self.destination = [0] * count  # Port (traders) or waypoint (patrols) of the current leg
+        self.cargo = [None] * count     # Traders: (commodity, quantity) on board
+        self.waypoints = {}             # Patrols: cached loop of (x, y)
+        
+        positions = catalog.port_positions
+        for ship in range(count):
+            if self.kind[ship] == KIND_TRADER:
+                port = self.rng.randrange(catalog.port_count)
+                self.destination[ship] = port
+                x, y = positions[port]
+            else:
+                center_x, center_y = positions[ship % catalog.port_count]
+                start = self.rng.uniform(0, 2 * math.pi)
+                self.waypoints[ship] = [(center_x + math.cos(start + i * 2 * math.pi / PATROL_WAYPOINTS) * PATROL_RADIUS,
+                                         center_y + math.sin(start + i * 2 * math.pi / PATROL_WAYPOINTS) * PATROL_RADIUS)
+                                        for i in range(PATROL_WAYPOINTS)]
+                x, y = self.waypoints[ship][0]
+            # Zero-length first leg: every ship picks its real course on the first step
+            self.from_x[ship] = self.to_x[ship] = x
+            self.from_y[ship] = self.to_y[ship] = y
+    
+    def _start_leg(self, ship, x, y, speed, wait=0.0):
+        """Sail on from the end of the current leg toward (x, y)"""
+        self.from_x[ship] = self.to_x[ship]
+        self.from_y[ship] = self.to_y[ship]
+        self.to_x[ship] = x
+        self.to_y[ship] = y
+        self.depart[ship] = self.arrive[ship] + wait
+        distance = math.hypot(x - self.from_x[ship], y - self.from_y[ship])
+        self.arrive[ship] = self.depart[ship] + max(MIN_LEG_HOURS, distance / speed)
+    
+    def _trader_arrived(self, ship):
+        """Sell the cargo, buy the best-paying good here and head to where it sells"""
+        market = self.market
+        port = self.destination[ship]
+        if self.cargo[ship] is not None:
+            commodity, quantity = self.cargo[ship]
+            if commodity in self.catalog.port_commodities[port]:
+                market.set_price(port, commodity, trading.price_after(market.prices[port][commodity], -quantity))
+                market.stock[port][commodity] += quantity
+            self.cargo[ship] = None
+        
+        best = market.best_buy_here(port)
+        if best is not None and best[2] != port:
+            commodity, _, next_port = best
+            quantity = min(TRADER_CARGO, market.stock[port][commodity])
+            market.set_price(port, commodity, trading.price_after(market.prices[port][commodity], quantity))
+            market.stock[port][commodity] -= quantity
+            self.cargo[ship] = (commodity, quantity)
+        elif self.catalog.port_count > 1:
+            next_port = self.rng.choice([other for other in range(self.catalog.port_count) if other != port])
+        else:
+            next_port = port
+        
+        self.destination[ship] = next_port
+        x, y = self.catalog.port_positions[next_port]
+        self._start_leg(ship, x, y, TRADER_SPEED, PORT_HOURS)
+    
+    def _patrol_arrived(self, ship):
+        """Sail on to the next waypoint of the loop"""
+        waypoints = self.waypoints[ship]
+        self.destination[ship] = (self.destination[ship] + 1) % len(waypoints)
+        x, y = waypoints[self.destination[ship]]
+        self._start_leg(ship, x, y, PATROL_SPEED)
+    
+    def _recover_markets(self):
+        """Move prices back toward normal and restock a little"""
+        market = self.market
+        catalog = self.catalog
+        for port, available in enumerate(catalog.port_commodities):
+            prices = market.prices[port]
+            stock = market.stock[port]
+            modifiers = catalog.price_modifiers[port]
+            for commodity in available:
+                normal = catalog.base_prices[commodity] * modifiers[commodity]
+                price = prices[commodity]
+                recovered = max(1.0, price + (normal - price) * PRICE_RECOVERY)
+                if abs(recovered - price) >= MIN_PRICE_CHANGE:
+                    market.set_price(port, commodity, recovered)
+                if stock[commodity] < MAX_STOCK:
+                    stock[commodity] = min(MAX_STOCK, stock[commodity] + STOCK_RECOVERY)
+    
+    def step(self):
+        """Advance the world by one step"""
+        self.hour += STEP_HOURS
+        for ship in np.flatnonzero(self.arrive <= self.hour).tolist():
+            handler = self._trader_arrived if self.kind[ship] == KIND_TRADER else self._patrol_arrived
+            while self.arrive[ship] <= self.hour:
+                handler(ship)
+        self._recover_markets()
+    
+    def sync_market(self, prices, stock):
+        """Start from the main thread's prices and stock (player trades included)"""
+        market = self.market
+        for port in range(self.catalog.port_count):
+            market.prices[port][:] = prices[port]
+            market.stock[port][:] = stock[port]
+        for commodity in range(self.catalog.commodity_count):
+            market.rebuild_best(commodity)
+    
+    def advance_to(self, hour, prices=None, stock=None):
+        """Step until the given game hour; returns a WorldUpdate with the changes made"""
+        if prices is not None:
+            self.sync_market(prices, stock)
+        before_prices = np.array(self.market.prices)
+        before_stock = np.array(self.market.stock)
+        
+        while self.hour + STEP_HOURS <= hour:
+            self.step()
+        
+        price_change = np.array(self.market.prices) - before_prices
+        stock_change = np.array(self.market.stock) - before_stock
+        ports, commodities = np.nonzero((price_change != 0) | (stock_change != 0))
+        changes = [(port, commodity, float(price_change[port, commodity]), int(stock_change[port, commodity]))
+                   for port, commodity in zip(ports.tolist(), commodities.tolist())]
+        return WorldUpdate(self.hour, self.kind.copy(), self.from_x.copy(), self.from_y.copy(),
+                           self.to_x.copy(), self.to_y.copy(), self.depart.copy(), self.arrive.copy(), changes)
+
+class WorldSimulator:
+    """Runs a WorldSimulation on a daemon worker thread
+    
+    The main loop calls request() when the game hour turns over, which
+    copies the market (a few small arrays) and returns at once, and calls
+    poll() every frame to collect finished WorldUpdates without blocking.
+    If requests pile up, the worker skips straight to the newest one.
+    """
+    
+    def __init__(self, simulation):
+        """Initialize simulator (call start() to launch the thread)"""
+        self.simulation = simulation
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="world-sim", daemon=True)
+    
+    def start(self):
+        self.thread.start()
+    
+    def stop(self, timeout=1.0):
+        """Ask the worker to finish and wait briefly for it"""
+        if self.thread.is_alive():
+            self.requests.put(None)
+            self.thread.join(timeout)
+    
+    def request(self, hour, market):
+        """Ask for the world to be advanced to a game hour, starting from the live market"""
+        prices = [port_prices[:] for port_prices in market.prices]
+        stock = [port_stock[:] for port_stock in market.stock]
+        self.requests.put((hour, prices, stock))
+    
+    def poll(self):
+        """Get the updates finished since the last poll (oldest first); never blocks"""
+        updates = []
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                return updates
+            if isinstance(result, Exception):
+                raise result
+            updates.append(result)
+    
+    def _run(self):
+        while True:
+            job = self.requests.get()
+            # Catch up in one go if the main loop got ahead of us
+            while job is not None and not self.requests.empty():
+                job = self.requests.get()
+            if job is None:
+                return
+            try:
+                self.results.put(self.simulation.advance_to(*job))
+            except Exception as error:
+                self.results.put(error)
+                return
+
+def main():
+    """Benchmark: a day of world simulation on a large random map"""
+    parser = argparse.ArgumentParser(description="Benchmark the coarse world simulation")
+    parser.add_argument("--ports", type=int, default=300, help="number of ports")
+    parser.add_argument("--commodities", type=int, default=40, help="number of commodities")
+    parser.add_argument("--traders", type=int, default=2000, help="number of traders")
+    parser.add_argument("--patrols", type=int, default=500, help="number of patrols")
+    parser.add_argument("--hours", type=int, default=24, help="game hours to simulate")
+    args = parser.parse_args()
+    
+    catalog = random_catalog(args.ports, args.commodities, random.Random(0))
+    simulation = WorldSimulation(catalog, args.traders, args.patrols, seed=0)
+    started = time.perf_counter()
+    update = simulation.advance_to(args.hours)
+    elapsed = time.perf_counter() - started
+    print(f"{args.traders} traders and {args.patrols} patrols over {args.ports} ports: "
+          f"{elapsed / args.hours * 1000:.2f} ms per game hour, {len(update.changes)} market entries changed")
+
+if __name__ == "__main__":
+    main()